@@ -0,0 +1,65 @@
+"""
+Replays a recorded client session (cassette) offline, measuring the client-side cost of every call.
+
+A session of status polls, property updates, log sends and searches is first recorded against a local fake
+Opereto center, then replayed --repeat times without network. Use --latency=1 to replay with the recorded latencies.
+
+Usage:
+  python benchmarks/cassette_replay_benchmark.py [--calls=1000] [--repeat=5] [--latency=0] [--transport=requests]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, '.')
+from pyopereto.client import OperetoClient
+from pyopereto.testing import FakeOperetoServer
+from pyopereto.transport import find_transport
+from pyopereto.cassette import CassetteTransport
+
+
+def session(client, pid, calls):
+    for i in range(calls):
+        if i % 4 == 0:
+            client.send_process_log(pid, [{'text': 'replayed log entry %d' % i}])
+        elif i % 4 == 1:
+            client.get_process_status(pid)
+        elif i % 4 == 2:
+            client.modify_process_property('counter', i, pid=pid)
+        else:
+            client.search_services(filter={'generic': 'fake'})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0, help='Factor applied to the recorded latencies')
+    parser.add_argument('--transport', default='requests')
+    args = parser.parse_args()
+
+    cassette = os.path.join(tempfile.mkdtemp(), 'session.cassette')
+    with FakeOperetoServer(process_states=['in_process']) as server:
+        host = server.url
+        pid = server.add_process('replayed_service')
+        client = server.client(cassette=cassette, cassette_mode='record', transport=args.transport)
+        start = time.time()
+        session(client, pid, args.calls)
+        recorded = time.time() - start
+    print('recorded %d calls: %.2f s, %.0f calls/s' % (args.calls, recorded, args.calls / recorded))
+
+    for run in range(args.repeat):
+        client = OperetoClient(opereto_host=host, opereto_auth_token=server.auth_token, cassette=cassette,
+                               cassette_mode='replay', cassette_latency=args.latency, transport=args.transport)
+        start = time.time()
+        session(client, pid, args.calls)
+        elapsed = time.time() - start
+        played = find_transport(client.transport, CassetteTransport).played
+        print('replay %d: %.3f s, %.0f calls/s, %d requests replayed' % (run + 1, elapsed, args.calls / elapsed, played))
+
+
+if __name__ == '__main__':
+    main()
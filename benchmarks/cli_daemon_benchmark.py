@@ -0,0 +1,64 @@
+"""
+Latency of opereto CLI commands run locally and forwarded to the CLI daemon.
+
+Creates a temporary home directory with an opereto.yaml pointing at a local fake Opereto center, runs
+"opereto process <pid> --info" --runs times in fresh CLI processes, then starts the daemon and runs the same
+command through it (the daemon keeps the client, its connections and caches warm between commands).
+Use --latency to add server latency per request, as a remote Opereto center would.
+
+Usage:
+  python benchmarks/cli_daemon_benchmark.py [--runs=10] [--latency=0.05]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, '.')
+from pyopereto.testing import FakeOperetoServer
+
+
+def run_cli(home, *args):
+    env = dict(os.environ, HOME=home, PYTHONPATH=os.path.abspath('.'))
+    start = time.time()
+    subprocess.check_output([sys.executable, '-m', 'pyopereto.command_line'] + list(args), cwd=home, env=env,
+                            stderr=subprocess.PIPE)
+    return time.time() - start
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05, help='Server latency per request (seconds)')
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp()
+    with FakeOperetoServer(latency=args.latency) as server:
+        with open(os.path.join(home, 'opereto.yaml'), 'w') as f:
+            f.write('opereto_host: %s\nopereto_user: admin\nopereto_password: admin\n' % server.url)
+        with open(os.path.join(home, '.pyopereto.latest'), 'w') as f:
+            f.write('0.0.1')
+        pid = server.add_process('cli_service')
+
+        local = [run_cli(home, 'process', pid, '--info') for i in range(args.runs)]
+        run_cli(home, 'daemon', 'start')
+        try:
+            forwarded = [run_cli(home, 'process', pid, '--info') for i in range(args.runs)]
+        finally:
+            run_cli(home, 'daemon', 'stop')
+
+    print('local:     median %.1f ms per command' % (median(local) * 1000))
+    print('forwarded: median %.1f ms per command (%.1fx faster)' % (median(forwarded) * 1000,
+                                                                  median(local) / median(forwarded)))
+
+
+if __name__ == '__main__':
+    main()
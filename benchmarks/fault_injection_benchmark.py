@@ -0,0 +1,67 @@
+"""
+Throughput degradation and retry amplification of a client under injected faults, against a local fake Opereto center.
+
+For each fault rate, threads poll process statuses and send process logs through one client whose requests fail
+with 502 errors, connection resets and timeouts at that rate (split evenly), with a log-normal added latency.
+Reports calls per second, HTTP requests sent per call (retry amplification) and failed calls.
+
+Usage:
+  python benchmarks/fault_injection_benchmark.py [--threads=10] [--calls=100] [--rates=0,0.05,0.2] [--latency=0.005]
+"""
+
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, '.')
+from pyopereto.testing import FakeOperetoServer
+from pyopereto.faults import FaultInjector, Fault, lognormal
+
+
+def worker(client, pid, calls, errors):
+    for i in range(calls):
+        try:
+            if i % 2 == 0:
+                client.get_process_status(pid)
+            else:
+                client.send_process_log(pid, [{'text': 'fault injection log entry %d' % i}])
+        except Exception as e:
+            errors.append(e)
+
+
+def run(server, pid, rate, args):
+    faults = [Fault(kind, probability=rate / 3.0) for kind in ('error', 'reset', 'timeout')]
+    injector = FaultInjector(faults=faults, latency=lognormal(args.latency, 0.5) if args.latency else None, seed=1)
+    client = server.client(faults=injector, metrics=True, pool_maxsize=args.threads)
+    client.retry.sleep = lambda seconds: time.sleep(min(seconds, 0.01))
+    errors = []
+    workers = [threading.Thread(target=worker, args=(client, pid, args.calls, errors)) for i in range(args.threads)]
+    start = time.time()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.time() - start
+    calls = args.threads * args.calls
+    requests = sum(endpoint['requests'] for endpoint in client.metrics().values())
+    print('fault rate %.2f: %.2f s, %.0f calls/s, %.2f requests per call, %d failed calls, injected %s' %
+          (rate, elapsed, calls / elapsed, float(requests) / calls, len(errors), client.fault_stats['injected']))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=10)
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--rates', default='0,0.05,0.2', help='Comma separated fault rates')
+    parser.add_argument('--latency', type=float, default=0.005, help='Median added latency (seconds)')
+    args = parser.parse_args()
+
+    with FakeOperetoServer(process_states=['in_process']) as server:
+        pid = server.add_process('faulty_service')
+        for rate in [float(rate) for rate in args.rates.split(',')]:
+            run(server, pid, rate, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Import time of pyopereto.client, as paid by every short-lived microservice process.
+
+Runs fresh interpreters importing the module and reports the median import time above an empty interpreter
+start. The run fails if the median exceeds the budget, or if the import loads a dependency that must only
+be loaded on first use (yaml, jwt, requests_toolbelt, the optional transport modules). The default budget is
+about 10% above the measured import time (about 210 ms), so that import regressions fail the run.
+DEFERRED_MODULES is also checked by tests/import_tests.py.
+
+Usage:
+  python benchmarks/import_time_benchmark.py [--runs=15] [--budget-ms=230] [--module=pyopereto.client]
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+
+DEFERRED_MODULES = ['yaml', 'jwt', 'requests_toolbelt', 'concurrent.futures', 'pyopereto.batch', 'pyopereto.metrics',
+                    'pyopereto.compression', 'pyopereto.priority', 'pyopereto.hedging', 'pyopereto.faults',
+                    'pyopereto.cassette', 'pyopereto.disk_cache', 'pyopereto.ratelimit', 'pyopereto.concurrency',
+                    'pyopereto.singleflight', 'pyopereto.cli_daemon']
+
+
+def run(code):
+    start = time.time()
+    output = subprocess.check_output([sys.executable, '-c', code], cwd='.')
+    return time.time() - start, output.decode('utf-8').strip()
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=230)
+    parser.add_argument('--module', default='pyopereto.client')
+    args = parser.parse_args()
+
+    check = 'import sys; import %s; print(",".join(m for m in %r if m in sys.modules))' % (args.module, DEFERRED_MODULES)
+    baseline = median([run('import sys')[0] for i in range(args.runs)])
+    timings = []
+    loaded = ''
+    for i in range(args.runs):
+        elapsed, loaded = run(check)
+        timings.append(elapsed)
+    import_ms = (median(timings) - baseline) * 1000
+    print('import %s: %.1f ms (median of %d runs, interpreter start %.1f ms), budget %.0f ms' %
+          (args.module, import_ms, args.runs, baseline * 1000, args.budget_ms))
+    if loaded:
+        print('modules that should be loaded on first use: %s' % loaded)
+    if loaded or import_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
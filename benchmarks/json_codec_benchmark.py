@@ -0,0 +1,81 @@
+"""
+Per-call CPU cost of decoding a large search response (default 10 MB).
+
+Compares the former path (requests Response.json() plus an eagerly formatted debug line) with the client codec
+path (decoding the raw bytes with the stdlib json and orjson codecs, with lazy debug rendering).
+
+Usage:
+  python benchmarks/json_codec_benchmark.py [--size-mb=10] [--runs=5]
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import requests
+
+sys.path.insert(0, '.')
+from pyopereto.codec import JsonCodec, OrjsonCodec, orjson
+
+logger = logging.getLogger('pyopereto.benchmark')
+logger.setLevel(logging.INFO)
+
+
+def make_response(size_mb):
+    services = []
+    content = b''
+    while len(content) < size_mb * 1024 * 1024:
+        services += [{'id': 'service_%d' % i, 'type': 'action', 'versions': ['default', '1.0.%d' % i],
+                      'description': 'Benchmark service number %d' % i, 'audit': [{'user': 'admin', 'action': 'upload'}]}
+                     for i in range(len(services), len(services) + 10000)]
+        content = json.dumps({'status': 'success', 'data': services}).encode('utf-8')
+    r = requests.models.Response()
+    r.status_code = 200
+    r.headers['Content-Type'] = 'application/json'
+    r._content = content
+    return r
+
+
+def former_path(r):
+    r.encoding = None
+    response_json = r.json()
+    logger.debug('Response: [{}] {}'.format(r.status_code, response_json))
+    return response_json
+
+
+def codec_path(codec):
+    def decode(r):
+        response_json = codec.loads(r.content)
+        logger.debug('Response: [%s] %s', r.status_code, response_json)
+        return response_json
+    return decode
+
+
+def measure(decode, r, runs):
+    timings = []
+    for i in range(runs):
+        start = time.process_time()
+        decode(r)
+        timings.append(time.process_time() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=float, default=10)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    r = make_response(args.size_mb)
+    print('Response size: %.1f MB, %d runs' % (len(r.content) / 1024.0 / 1024.0, args.runs))
+    paths = [('requests r.json() + eager debug', former_path), ('json codec + lazy debug', codec_path(JsonCodec()))]
+    if orjson is not None:
+        paths.append(('orjson codec + lazy debug', codec_path(OrjsonCodec())))
+    for name, decode in paths:
+        best, mean = measure(decode, r, args.runs)
+        print('%-35s best %8.1f ms   mean %8.1f ms CPU per call' % (name, best * 1000, mean * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Stress test of a single client shared by many threads, against a local fake Opereto center.
+
+Every thread mixes status polls, property updates and log sends on one client. The run fails if any call
+raises, if the client logs in more than once (basic auth), or if two log entries get the same timestamp.
+Optionally forks worker processes that keep using the client created by the parent.
+
+Usage:
+  python benchmarks/thread_stress_benchmark.py [--threads=50] [--calls=200] [--basic-auth] [--transport=requests]
+                                                [--processes=0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, '.')
+from pyopereto.testing import FakeOperetoServer
+
+
+def worker(client, pid, calls, errors):
+    for i in range(calls):
+        try:
+            if i % 3 == 0:
+                client.send_process_log(pid, [{'text': 'stress log entry %d' % i}])
+            elif i % 3 == 1:
+                client.get_process_status(pid)
+            else:
+                client.modify_process_property('counter', i, pid=pid)
+        except Exception as e:
+            errors.append(e)
+
+
+def run_threads(client, pid, threads, calls):
+    errors = []
+    workers = [threading.Thread(target=worker, args=(client, pid, calls, errors)) for i in range(threads)]
+    start = time.time()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.time() - start, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--basic-auth', action='store_true')
+    parser.add_argument('--transport', default='requests')
+    parser.add_argument('--processes', type=int, default=0, help='Forked processes reusing the parent client')
+    args = parser.parse_args()
+
+    with FakeOperetoServer(process_states=['in_process']) as server:
+        client = server.client(basic_auth=args.basic_auth, transport=args.transport, pool_maxsize=args.threads)
+        pids = [server.add_process('stress_service') for i in range(args.processes + 1)]
+        client.hello()
+
+        children = []
+        for child_pid in pids[1:]:
+            child = os.fork()
+            if child == 0:
+                elapsed, errors = run_threads(client, child_pid, args.threads, args.calls)
+                os._exit(1 if errors else 0)
+            children.append(child)
+
+        elapsed, errors = run_threads(client, pids[0], args.threads, args.calls)
+        failed_children = 0
+        for child in children:
+            status = os.waitpid(child, 0)[1]
+            if not os.WIFEXITED(status) or os.WEXITSTATUS(status) != 0:
+                failed_children += 1
+
+        total = args.threads * args.calls
+        timestamps = [entry['timestamp'] for entry in server.processes[pids[0]]['log']]
+        logins = server.requests.count(('POST', '/login'))
+        print('%d threads x %d calls (%s transport%s): %.2f s, %.0f calls/s' %
+              (args.threads, args.calls, args.transport, ', basic auth' if args.basic_auth else '', elapsed, total / elapsed))
+        print('errors: %d, logins: %d, log entries: %d, duplicate log timestamps: %d, failed child processes: %d' %
+              (len(errors), logins, len(timestamps), len(timestamps) - len(set(timestamps)), failed_children))
+        if errors:
+            print('first error: %s' % errors[0])
+        if errors or logins > 1 or len(timestamps) != len(set(timestamps)) or failed_children:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
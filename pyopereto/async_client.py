@@ -0,0 +1,148 @@
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pyopereto.forksafe import register_after_fork
+from pyopereto.client import OperetoClient, OperetoClientBasicAuth, OperetoClientError, process_result_statuses
+from pyopereto.endpoints import ENDPOINTS
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+# asyncio.get_running_loop is not available before Python 3.7
+_get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncOperetoClient(object):
+    """
+    AsyncOperetoClient exposes every OperetoClient method as a coroutine.
+
+    | Calls are dispatched to a worker pool whose size matches the client connection pool, so any number of
+    | coroutines may be gathered on a single event loop while at most *max_concurrency* requests are in flight.
+    | Waiting methods (wait_for, wait_to_start, wait_to_end, is_success, etc.) poll natively with asyncio.sleep
+    | and do not hold a worker while sleeping.
+    | Credentials and auth modes are the same as OperetoClient, and errors are raised as OperetoClientError.
+
+    :Parameters:
+    * *max_concurrency* (`int`) -- Maximum number of concurrent requests. Default is 20
+
+    :Example:
+    .. code-block:: python
+
+       async def main():
+           async with AsyncOperetoClient(max_concurrency=50) as opereto_client:
+               statuses = await asyncio.gather(*[opereto_client.get_process_status(pid) for pid in pids])
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, **kwargs):
+        kwargs.setdefault('pool_maxsize', max_concurrency)
+        self.client = OperetoClient(**kwargs)
+        self.input = self.client.input
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        register_after_fork(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.client.close()
+
+    def reset_after_fork(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+    async def _run(self, method, *args, **kwargs):
+        loop = _get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+    def metrics(self, format='dict'):
+        return self.client.metrics(format=format)
+
+    @property
+    def get_current_opereto_token(self):
+        return self.client.get_current_opereto_token
+
+    async def _wait_for_pid(self, pid, status_list, end=None):
+        interval = 1
+        while True:
+            remaining = end - time.time() if end is not None else None
+            if remaining is not None and remaining <= 0:
+                raise OperetoClientError(message='Deadline exceeded while calling wait_for', code=408)
+            stat = await self.get_process_status(pid, deadline=remaining)
+            if stat in status_list:
+                return stat
+            remaining = end - time.time() if end is not None else None
+            await asyncio.sleep(interval if remaining is None else max(0, min(interval, remaining)))
+            if interval < 5:
+                interval += 1
+
+    async def wait_for(self, pids=[], status_list=process_result_statuses, deadline=None):
+        """
+        wait_for(pids=[], status_list=process_result_statuses, deadline=None)
+
+        | Waits concurrently for all the given processes to reach one of the given statuses.
+
+        :Parameters:
+        * *deadline* (`float`) -- optional - Maximum number of seconds to wait. An OperetoClientError (code 408) is raised when exceeded
+
+        :return: dict of pid to status
+        """
+        pids = self.client._get_pids(pids)
+        end = time.time() + deadline if deadline is not None else None
+        statuses = await asyncio.gather(*[self._wait_for_pid(pid, status_list, end) for pid in pids])
+        return dict(zip(pids, statuses))
+
+    async def wait_to_start(self, pids=[], deadline=None):
+        return await self.wait_for(pids=self.client._get_pids(pids), status_list=process_result_statuses + ['in_process'],
+                                   deadline=deadline)
+
+    async def wait_to_end(self, pids=[], deadline=None):
+        return await self.wait_for(pids=self.client._get_pids(pids), status_list=process_result_statuses, deadline=deadline)
+
+    async def _status_ok(self, status, pids=[]):
+        pids = self.client._get_pids(pids)
+        self.client.logger.info('Waiting that the following processes %s will end with status [%s]..' % (str(pids), status))
+        statuses = await self.wait_for(pids)
+        if not statuses:
+            return False
+        for pid, stat in list(statuses.items()):
+            if stat != status:
+                self.client.logger.error('But it ended with status [%s]' % stat)
+                return False
+        return True
+
+    async def is_success(self, pids=[]):
+        return await self._status_ok('success', pids)
+
+    async def is_failure(self, pids):
+        return await self._status_ok('failure', pids)
+
+    async def is_error(self, pids):
+        return await self._status_ok('error', pids)
+
+    async def is_timeout(self, pids):
+        return await self._status_ok('timeout', pids)
+
+    async def is_warning(self, pids):
+        return await self._status_ok('warning', pids)
+
+    async def is_terminated(self, pids):
+        return await self._status_ok('terminate', pids)
+
+
+def _async_method(name, method):
+
+    async def call(self, *args, **kwargs):
+        return await self._run(getattr(self.client, name), *args, **kwargs)
+
+    call.__name__ = name
+    call.__doc__ = method.__doc__
+    return call
+
+
+for _name in list(ENDPOINTS) + ['get_process_property', 'logout']:
+    if _name not in vars(AsyncOperetoClient):
+        setattr(AsyncOperetoClient, _name, _async_method(_name, getattr(OperetoClientBasicAuth, _name)))
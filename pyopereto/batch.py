@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pyopereto.endpoints import ENDPOINTS
+
+
+def _call_arguments(call):
+    if isinstance(call, tuple):
+        return list(call), {}
+    if isinstance(call, dict):
+        return [], dict(call)
+    return [call], {}
+
+
+class OperetoBatch(object):
+    """
+    Calls an API method of a client with many sets of arguments concurrently, over the client connection pool.
+
+    | OperetoBatch has a method for each endpoint of pyopereto.endpoints.ENDPOINTS. It takes a list of calls, each one
+    | being a tuple of positional arguments, a dict of keyword arguments or a single argument, and returns their results
+    | in the same order. Every call runs through the client policies (retries, cache, rate limits, priorities).
+
+    :Parameters:
+    * *client* (`OperetoClient`) -- Client making the calls
+    * *max_workers* (`int`) -- Maximum number of calls in flight. Default is 10
+
+    :Example:
+    .. code-block:: python
+
+       batch = opereto_client.batch(max_workers=20)
+       statuses = batch.get_process_status(pids)
+       batch.modify_process_property([('counter', 1, pid) for pid in pids], deadline=30)
+       results = batch.get_process_info(pids, return_exceptions=True)
+    """
+
+    def __init__(self, client, max_workers=10):
+        self.client = client
+        self.max_workers = max_workers
+
+    def call(self, name, calls, return_exceptions=False, deadline=None):
+        """
+        Calls the client method *name* with each of the given calls concurrently and returns their results in order.
+
+        | The first error is raised once all the calls are done, unless *return_exceptions* is True: errors are then
+        | returned in place of the results. A *deadline* (seconds) bounds the whole batch.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+        method = getattr(self.client, name)
+        end = time.time() + deadline if deadline is not None else None
+
+        def run(call):
+            args, kwargs = _call_arguments(call)
+            if end is not None:
+                kwargs['deadline'] = end - time.time()
+            return method(*args, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            futures = [executor.submit(run, call) for call in calls]
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is not None and not return_exceptions:
+                raise error
+            results.append(error if error is not None else future.result())
+        return results
+
+
+def _batch_method(name):
+
+    def call(self, calls, return_exceptions=False, deadline=None):
+        return self.call(name, calls, return_exceptions=return_exceptions, deadline=deadline)
+
+    call.__name__ = name
+    call.__doc__ = 'Calls %s with each of the given calls concurrently and returns their results in order.' % name
+    return call
+
+
+for _name in ENDPOINTS:
+    setattr(OperetoBatch, _name, _batch_method(_name))
@@ -0,0 +1,211 @@
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps as _wraps
+from pyopereto.codec import get_codec
+
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+class ResponseCache(object):
+    """
+    In-memory LRU cache of the results of read-mostly client methods, bounded by the size of the cached results.
+
+    | Results are stored encoded, so every hit returns a new object that the caller may modify freely.
+    | Entries are tagged with the entity they describe (e.g. a service) and dropped when the same client modifies it.
+    | A result read while the entity was modified is not cached.
+
+    :Parameters:
+    * *ttl* (`float`) -- Seconds a result is cached. Default is 60
+    * *endpoint_ttls* (`dict`) -- Seconds a result is cached by client method name (e.g. {'get_service_version': 600})
+    * *max_bytes* (`int`) -- Maximum total size of the cached (JSON encoded) results. Default is 16MB
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(response_cache=ResponseCache(ttl=30, endpoint_ttls={'get_dimension': 3600}))
+       opereto_client.get_service_version('my_service')
+       print(opereto_client.cache_stats)
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, endpoint_ttls=None, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.max_bytes = max_bytes
+        self.codec = get_codec()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _key(self, endpoint, args, kwargs):
+        kwargs = dict((key, value) for key, value in kwargs.items() if key != 'deadline')
+        try:
+            return self.codec.dumps([endpoint, args, sorted(kwargs.items())])
+        except TypeError:
+            return None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= len(entry[1])
+
+    def get(self, endpoint, args, kwargs):
+        """
+        Returns (True, result) for a cached result of the given call, or (False, None).
+        """
+        key = self._key(endpoint, args, kwargs)
+        if key is None:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries[key] = self._entries.pop(key)
+            self.hits += 1
+        return True, self.codec.loads(entry[1])
+
+    def _generation(self, tag):
+        # invalidations of the whole cache, of all the entities of the type, and of the entity
+        return (self._generations.get(None, 0), self._generations.get((tag[0], None), 0),
+                self._generations.get(tuple(tag), 0))
+
+    def generation(self, tag):
+        """
+        Returns the invalidation generation of an entity tag, to be passed to set() by a call reading the entity.
+        """
+        with self._lock:
+            return self._generation(tag)
+
+    def set(self, endpoint, args, kwargs, tag, result, generation=None):
+        """
+        Caches the result of a call. The result is dropped if the entity was invalidated since *generation*.
+        """
+        ttl = self.endpoint_ttls.get(endpoint, self.ttl)
+        if not ttl:
+            return
+        key = self._key(endpoint, args, kwargs)
+        if key is None:
+            return
+        content = self.codec.dumps(result)
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation(tag):
+                # read before a modification of the entity completed
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + ttl, content, tag)
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, entity, entity_id=None):
+        """
+        Drops the cached results of an entity (e.g. 'service', 'my_service_id'), or of all the entities of a type.
+        """
+        with self._lock:
+            generation_key = (entity, entity_id)
+            self._generations[generation_key] = self._generations.get(generation_key, 0) + 1
+            for key, entry in list(self._entries.items()):
+                if entry[2][0] == entity and (entity_id is None or entry[2][1] == entity_id):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generations[None] = self._generations.get(None, 0) + 1
+            self._entries.clear()
+            self.size = 0
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+def create_cache(response_cache=None):
+    """
+    Returns the response cache of a client: None (disabled), True (default cache) or a ResponseCache instance.
+    """
+    if response_cache is True:
+        return ResponseCache()
+    return response_cache or None
+
+
+def _entity_id(f, id_arg, args, kwargs):
+    if id_arg is None:
+        return None
+    if id_arg in kwargs:
+        return kwargs[id_arg]
+    try:
+        position = f.__code__.co_varnames.index(id_arg) - 1
+    except ValueError:
+        return None
+    return args[position] if position < len(args) else None
+
+
+def cached(entity, id_arg=None):
+    """
+    Caches the results of a client method in the client response cache, tagged with the entity given by
+    the *id_arg* argument. Cache hits skip the API call entirely (including retries).
+    """
+    def decorator(f):
+        target = getattr(f, '__wrapped__', f)
+
+        @_wraps(f)
+        def f_call(self, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return f(self, *args, **kwargs)
+            hit, result = cache.get(f.__name__, args, kwargs)
+            if hit:
+                return result
+            tag = (entity, _entity_id(target, id_arg, args, kwargs))
+            generation = cache.generation(tag)
+            result = f(self, *args, **kwargs)
+            cache.set(f.__name__, args, kwargs, tag, result, generation=generation)
+            return result
+        return f_call
+    return decorator
+
+
+def invalidates(entity, id_arg=None):
+    """
+    Drops the cached results of the entity given by the *id_arg* argument once the decorated client method
+    returns or fails (a failed write may still have been applied). All the entities of the type are dropped
+    when the argument is not given.
+    """
+    def decorator(f):
+        target = getattr(f, '__wrapped__', f)
+
+        @_wraps(f)
+        def f_call(self, *args, **kwargs):
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                cache = getattr(self, 'cache', None)
+                if cache is not None:
+                    cache.invalidate(entity, _entity_id(target, id_arg, args, kwargs))
+        return f_call
+    return decorator
@@ -0,0 +1,186 @@
+import io
+import os
+import gzip
+import json
+import time
+import base64
+import hashlib
+import threading
+from requests.structures import CaseInsensitiveDict
+from pyopereto.transport import OperetoTransportWrapper, OperetoResponse
+from pyopereto.exceptions import OperetoClientError
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+CASSETTE_MODES = ['record', 'replay', 'once']
+
+_redacted_headers = ['set-cookie']
+_skipped_headers = ['content-encoding', 'content-length', 'transfer-encoding', 'connection']
+_stream_chunk_size = 64 * 1024
+
+
+def _request_path(url):
+    parts = urlsplit(url)
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+
+def _body_fingerprint(data, files):
+    """
+    Returns a stable fingerprint of a request body. Streamed bodies (multipart uploads) are identified by
+    their size only, as the multipart boundary changes on every upload.
+    """
+    if files:
+        return 'files:' + ','.join(sorted(files))
+    if data is None:
+        return None
+    if hasattr(data, 'read'):
+        return 'stream:%s' % getattr(data, 'len', '')
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+    return hashlib.sha1(data).hexdigest()
+
+
+def _drain(data):
+    # reads a streamed body as the wire transport would, running the upload progress callbacks
+    while data.read(_stream_chunk_size):
+        pass
+
+
+def _encode_content(content):
+    try:
+        return {'body': content.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'body_base64': base64.b64encode(content).decode('ascii')}
+
+
+def _decode_content(interaction):
+    if 'body_base64' in interaction:
+        return base64.b64decode(interaction['body_base64'])
+    return interaction.get('body', '').encode('utf-8')
+
+
+class CassetteTransport(OperetoTransportWrapper):
+    """
+    Records the HTTP interactions of a client session in a cassette file, or replays them without any network.
+
+    | Each interaction (method, path and query, request body fingerprint, response status, headers and body,
+    | latency) is appended to the cassette as a JSON line. The opereto host is not recorded, so a cassette may be
+    | replayed against any host. Replayed requests are matched by method, path and body fingerprint, and fall back
+    | to method and path when the body differs (e.g. timestamps); successive identical requests (e.g. status polls)
+    | get the successive recorded responses. Multipart uploads are matched by size and their stream is read, so
+    | upload progress callbacks run as usual. The basic auth login is replayed like any other request: session
+    | cookie values and Authorization headers are never written to the cassette.
+    | Replay raises an OperetoClientError (code 404) for requests missing from the cassette.
+
+    :Parameters:
+    * *path* (`string`) -- Cassette file path
+    * *mode* (`string`) -- 'record' (send the requests and overwrite the cassette), 'replay' (no network) or 'once' (replay if the cassette exists, otherwise record). Default is 'once'
+    * *latency* (`float`) -- Factor applied to the recorded latencies on replay: 0 replays at full speed, 1 with the recorded latencies. Default is 0
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(cassette='deploy.cassette', cassette_mode='record')
+       # then, offline:
+       opereto_client = OperetoClient(cassette='deploy.cassette', cassette_mode='replay', cassette_latency=1)
+    """
+
+    def __init__(self, inner, path, mode='once', latency=0):
+        super(CassetteTransport, self).__init__(inner)
+        if mode not in CASSETTE_MODES:
+            raise ValueError('Unknown cassette mode [%s], must be one of %s' % (mode, CASSETTE_MODES))
+        if mode == 'once':
+            mode = 'replay' if os.path.exists(path) else 'record'
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.played = 0
+        self._lock = threading.Lock()
+        self._interactions = {}
+        self._cursors = {}
+        if mode == 'record':
+            directory = os.path.dirname(os.path.abspath(path))
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            open(path, 'w').close()
+        else:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise OperetoClientError('Cassette %s does not exist.' % self.path, code=404)
+        with open(self.path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                key = (interaction['method'], interaction['path'])
+                self._interactions.setdefault(key + (interaction.get('fingerprint'),), []).append(interaction)
+                self._interactions.setdefault(key, []).append(interaction)
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        method = method.upper()
+        path = _request_path(url)
+        fingerprint = _body_fingerprint(data, files)
+        if self.mode == 'record':
+            return self._record(method, url, path, fingerprint, headers, data, files, timeout)
+        return self._replay(method, path, fingerprint, data)
+
+    def _record(self, method, url, path, fingerprint, headers, data, files, timeout):
+        start = time.time()
+        r = self.inner.request(method.lower(), url, headers=headers, data=data, files=files, timeout=timeout)
+        interaction = {
+            'method': method,
+            'path': path,
+            'fingerprint': fingerprint,
+            'status_code': r.status_code,
+            'reason': r.reason,
+            'headers': dict((key, 'recorded' if key.lower() in _redacted_headers else value)
+                            for key, value in r.headers.items() if key.lower() not in _skipped_headers),
+            'latency': round(time.time() - start, 6)
+        }
+        interaction.update(_encode_content(r.content or b''))
+        line = json.dumps(interaction, separators=(',', ':')) + '\n'
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+        return r
+
+    def _unplayed(self, key):
+        interactions = self._interactions.get(key, [])
+        cursor = self._cursors.get(key, 0)
+        while cursor < len(interactions) and interactions[cursor].get('played'):
+            cursor += 1
+        self._cursors[key] = cursor
+        return interactions[cursor] if cursor < len(interactions) else None
+
+    def _match(self, method, path, fingerprint):
+        # the next unplayed response of the same request, else of the same path, else the last response again
+        interaction = self._unplayed((method, path, fingerprint)) or self._unplayed((method, path))
+        if interaction is None:
+            interactions = self._interactions.get((method, path, fingerprint)) or self._interactions.get((method, path))
+            interaction = interactions[-1] if interactions else None
+        return interaction
+
+    def _replay(self, method, path, fingerprint, data):
+        with self._lock:
+            interaction = self._match(method, path, fingerprint)
+            if interaction is None:
+                raise OperetoClientError('No recorded response for [%s %s] in cassette %s' % (method, path, self.path), code=404)
+            interaction['played'] = True
+            self.played += 1
+        if hasattr(data, 'read'):
+            _drain(data)
+        if self.latency:
+            time.sleep(interaction.get('latency', 0) * self.latency)
+        return OperetoResponse(interaction['status_code'], interaction.get('reason'),
+                               CaseInsensitiveDict(interaction.get('headers') or {}), _decode_content(interaction))
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        super(CassetteTransport, self).reset_after_fork()
@@ -0,0 +1,374 @@
+"""
+Background daemon of the opereto CLI tool.
+
+The daemon listens on a local Unix socket (~/.pyopereto/daemon.sock, or the opereto_daemon_socket environment
+variable) and runs the CLI commands forwarded by thin "opereto" invocations in a single long-lived process, so
+that the client, its pooled connections, auth session and response caches stay warm across commands.
+
+The protocol is one JSON line per message: the CLI sends {"argv": [...], "cwd": "...", "env": {...}} (or
+{"command": "stop"} / {"command": "status"}), the daemon streams back {"out": text} and {"err": text} messages as
+the command prints, and ends with {"exit": code}. The daemon answers {"fallback": reason} instead when the
+invocation's opereto environment variables differ from its own: the command is then run by the invoking process.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+import subprocess
+from os.path import expanduser
+
+logger = logging.getLogger('OperetoCliTool')
+
+DEFAULT_SOCKET = os.path.join(expanduser('~'), '.pyopereto', 'daemon.sock')
+
+
+# environment variables selecting the daemon, not configuring the commands
+DAEMON_VARIABLES = ['opereto_daemon_socket', 'opereto_no_daemon']
+
+
+def socket_path():
+    return os.environ.get('opereto_daemon_socket') or DEFAULT_SOCKET
+
+
+def opereto_environment(environ=None):
+    """
+    Returns the opereto environment variables configuring the client and the commands (e.g. opereto_trace_file).
+    """
+    environ = os.environ if environ is None else environ
+    return dict((name, value) for name, value in environ.items()
+                if name.lower().startswith('opereto_') and name not in DAEMON_VARIABLES)
+
+
+def _connect(path):
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except socket.error:
+        # a stale socket file left by a daemon that did not exit cleanly
+        sock.close()
+        return None
+    return sock
+
+
+def _send(f, message):
+    f.write((json.dumps(message) + '\n').encode('utf-8'))
+    f.flush()
+
+
+def _request(path, message, out=None, err=None):
+    """
+    Sends a message to the daemon and relays the streamed output. Returns the final message, or None if no
+    daemon is listening on the socket.
+    """
+    sock = _connect(path)
+    if sock is None:
+        return None
+    f = sock.makefile('rwb')
+    try:
+        _send(f, message)
+        for line in f:
+            reply = json.loads(line.decode('utf-8'))
+            if 'out' in reply:
+                (out or sys.stdout).write(reply['out'])
+            elif 'err' in reply:
+                (err or sys.stderr).write(reply['err'])
+            else:
+                return reply
+    finally:
+        f.close()
+        sock.close()
+    return {'exit': 1, 'error': 'The opereto daemon closed the connection'}
+
+
+def forward(argv, path=None):
+    """
+    Runs a CLI command in the daemon. Returns the command exit code, or None if no daemon is running
+    (the command is then run by the invoking process).
+    """
+    try:
+        reply = _request(path or socket_path(), {'argv': list(argv), 'cwd': os.getcwd(), 'env': opereto_environment()})
+    except KeyboardInterrupt:
+        # closing the connection aborts the command in the daemon (and stops the process it runs)
+        sys.stderr.write('\nYou pressed Ctrl-C. Aborting..\n')
+        return 130
+    if reply is None:
+        return None
+    if reply.get('fallback'):
+        logger.debug('Not forwarding the command to the opereto daemon: %s', reply['fallback'])
+        return None
+    if reply.get('error'):
+        sys.stderr.write(reply['error'] + '\n')
+    sys.stdout.flush()
+    return reply['exit']
+
+
+def daemon_status(path=None):
+    """
+    Returns the status of the running daemon (pid, uptime, commands served), or None if no daemon is running.
+    """
+    reply = _request(path or socket_path(), {'command': 'status'})
+    return reply and reply.get('status')
+
+
+def stop_daemon(path=None, wait=10):
+    """
+    Stops the running daemon, and waits until it stops accepting commands (the commands it runs complete).
+    Returns False if no daemon is running.
+    """
+    path = path or socket_path()
+    if _request(path, {'command': 'stop'}) is None:
+        return False
+    deadline = time.time() + wait
+    while os.path.exists(path) and time.time() < deadline:
+        time.sleep(0.05)
+    return True
+
+
+def start_daemon(path=None, idle_timeout=3600, wait=10):
+    """
+    Starts the daemon in a detached background process and waits until it accepts commands.
+    Returns the daemon status.
+    """
+    path = path or socket_path()
+    status = daemon_status(path)
+    if status:
+        return status
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError('The opereto daemon requires Unix domain sockets')
+    code = 'from pyopereto.cli_daemon import serve; serve(%r, idle_timeout=%r)' % (path, idle_timeout)
+    detach = {'start_new_session': True} if sys.version_info[0] >= 3 else {'preexec_fn': getattr(os, 'setsid', None)}
+    with open(os.devnull, 'w') as devnull:
+        subprocess.Popen([sys.executable, '-c', code], stdin=devnull, stdout=devnull, stderr=devnull,
+                         close_fds=True, **detach)
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        status = daemon_status(path)
+        if status:
+            return status
+        time.sleep(0.05)
+    raise OSError('The opereto daemon did not start within %s seconds' % wait)
+
+
+class _StreamWriter(object):
+    """
+    File-like object that sends what a command prints to its CLI invocation, as out/err messages.
+    """
+
+    def __init__(self, f, name):
+        self.f = f
+        self.name = name
+        self.encoding = 'utf-8'
+        self.disconnected = False
+
+    def write(self, text):
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', 'replace')
+        if text:
+            try:
+                _send(self.f, {self.name: text})
+            except (IOError, OSError, socket.error):
+                self.disconnected = True
+                raise
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+_writers = threading.local()
+
+
+class _ThreadStream(object):
+    """
+    sys.stdout or sys.stderr of the daemon: writes to the CLI invocation of the command running in the current
+    thread, or to the daemon's own stream outside commands.
+    """
+
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default
+
+    def current(self):
+        return getattr(_writers, self.name, None) or self.default
+
+    def write(self, text):
+        self.current().write(text)
+
+    def writelines(self, lines):
+        self.current().writelines(lines)
+
+    def flush(self):
+        self.current().flush()
+
+    def isatty(self):
+        return False
+
+    @property
+    def encoding(self):
+        return getattr(self.current(), 'encoding', 'utf-8')
+
+
+class CliDaemon(object):
+    """
+    | Runs the forwarded CLI commands in the daemon process, each connection in its own thread.
+
+    | The commands share the working directory of the process: commands of the same directory run at once,
+    | and a command of another directory waits until the running ones end.
+
+    :Parameters:
+    * *path* (`string`) -- Unix socket path
+    * *idle_timeout* (`float`) -- Exit after this number of seconds without commands. Default is 3600
+    """
+
+    def __init__(self, path, idle_timeout=3600):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.environment = opereto_environment()
+        self.started = time.time()
+        self.last_activity = self.started
+        self.commands = 0
+        self.connections = 0
+        self.running = False
+        self.cwd = os.getcwd()
+        self.in_directory = 0
+        self._cond = threading.Condition()
+
+    def status(self):
+        with self._cond:
+            return {'pid': os.getpid(), 'socket': self.path, 'uptime': round(time.time() - self.started, 3),
+                    'commands': self.commands, 'running': self.in_directory}
+
+    def serve_forever(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # the socket runs commands with the user credentials: it is only accessible to the user
+        umask = os.umask(0o077)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(umask)
+        server.listen(16)
+        server.settimeout(0.5)
+        stdout, stderr = sys.stdout, sys.stderr
+        handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging.StreamHandler)]
+        streams = [h.stream for h in handlers]
+        sys.stdout, sys.stderr = _ThreadStream('out', stdout), _ThreadStream('err', stderr)
+        for handler in handlers:
+            handler.stream = sys.stderr
+        self.running = True
+        try:
+            while self.running:
+                try:
+                    conn, address = server.accept()
+                except socket.timeout:
+                    with self._cond:
+                        if not self.connections and time.time() - self.last_activity >= self.idle_timeout:
+                            break
+                    continue
+                conn.settimeout(None)
+                with self._cond:
+                    self.connections += 1
+                thread = threading.Thread(target=self._serve_connection, args=(conn,))
+                thread.daemon = True
+                thread.start()
+        finally:
+            server.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            # new invocations run locally, the running commands complete
+            with self._cond:
+                while self.connections:
+                    self._cond.wait()
+            sys.stdout, sys.stderr = stdout, stderr
+            for handler, stream in zip(handlers, streams):
+                handler.stream = stream
+
+    def _serve_connection(self, conn):
+        try:
+            self.handle(conn)
+        except Exception as e:
+            logger.debug('opereto daemon request failed: %s', e)
+        finally:
+            conn.close()
+            with self._cond:
+                self.connections -= 1
+                self.last_activity = time.time()
+                self._cond.notify_all()
+
+    def handle(self, conn):
+        f = conn.makefile('rwb')
+        try:
+            request = json.loads(f.readline().decode('utf-8'))
+            command = request.get('command')
+            if command == 'stop':
+                self.running = False
+                _send(f, {'exit': 0})
+            elif command == 'status':
+                _send(f, {'exit': 0, 'status': self.status()})
+            elif request.get('env', {}) != self.environment:
+                _send(f, {'fallback': 'the opereto environment variables differ from the daemon ones'})
+            else:
+                with self._cond:
+                    self.commands += 1
+                _send(f, {'exit': self.run(request['argv'], request.get('cwd'), f)})
+        finally:
+            f.close()
+
+    def _enter_directory(self, cwd):
+        with self._cond:
+            while self.in_directory and cwd != self.cwd:
+                self._cond.wait()
+            if cwd != self.cwd:
+                os.chdir(cwd)
+                self.cwd = cwd
+            self.in_directory += 1
+
+    def _leave_directory(self):
+        with self._cond:
+            self.in_directory -= 1
+            self._cond.notify_all()
+
+    def run(self, argv, cwd, f):
+        from pyopereto import command_line
+        out, err = _StreamWriter(f, 'out'), _StreamWriter(f, 'err')
+        _writers.out, _writers.err = out, err
+        self._enter_directory(cwd if cwd and os.path.isdir(cwd) else self.cwd)
+        try:
+            return command_line.execute(argv)
+        finally:
+            self._leave_directory()
+            _writers.out = _writers.err = None
+            running_process = command_line._command.running_process
+            if (out.disconnected or err.disconnected) and running_process:
+                # the invoking CLI was interrupted while waiting for the process it started
+                command_line.get_opereto_client().stop_process(running_process, status='terminated')
+
+
+def serve(path=None, idle_timeout=3600):
+    """
+    Entry point of the daemon process.
+    """
+    from pyopereto.command_line import _configure_logging, get_opereto_client
+    _configure_logging()
+    try:
+        # create the client (and for basic auth, its session) before the first command
+        get_opereto_client().hello()
+    except Exception as e:
+        logger.debug('opereto daemon could not warm up the client: %s', e)
+    CliDaemon(path or socket_path(), idle_timeout=idle_timeout).serve_forever()
@@ -0,0 +1,2094 @@
+import os,sys
+from datetime import datetime
+import requests
+import json
+import time
+import threading
+from pyopereto.exceptions import OperetoClientError
+from pyopereto.transport import create_transport, pop_transport_options, find_transport
+from pyopereto.hostpool import parse_hosts
+from pyopereto.trace import create_tracer
+from pyopereto.cache import create_cache
+from pyopereto.codec import get_codec
+from pyopereto.retry import apicall, RetryController, pop_retry_options, parse_retry_after
+from pyopereto.timeouts import Timeouts, pop_timeout_options
+from pyopereto.context import check_deadline, remaining_time, record_request
+from pyopereto.forksafe import register_after_fork
+from pyopereto.endpoints import ENDPOINTS, endpoint
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+try:
+    requests.packages.urllib3.disable_warnings()
+except AttributeError:
+    pass
+try:
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+except:
+    pass
+
+import logging
+logger = logging.getLogger('pyopereto')
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler(sys.stdout)
+handler.setLevel(logging.INFO)
+if os.environ.get('opereto_debug_mode'):
+    handler.setLevel(logging.DEBUG)
+handler.setFormatter(logging.Formatter('%(asctime)s: [%(name)s] [%(levelname)s] %(message)s'))
+logger.addHandler(handler)
+
+process_result_statuses = ['success', 'failure', 'error', 'timeout', 'terminated', 'warning']
+process_running_statuses = ['in_process', 'registered']
+process_statuses = process_result_statuses + process_running_statuses
+
+
+class OperetoClientBase(object):
+    """
+    OperetoClientBase holds the API methods shared by the OAuth2 (token) and basic auth clients.
+
+    | Each API method is described by its entry in pyopereto.endpoints.ENDPOINTS (HTTP method, path, error message,
+    | retry, cache and priority policies). Subclasses provide the credentials and the authorization headers.
+    """
+
+    SUCCESS = 0
+    ERROR = 1
+    FAILURE = 2
+    WARNING = 3
+
+    credential_keys = ['opereto_host']
+
+    def __init__(self, **kwargs):
+        transport_options = pop_transport_options(kwargs)
+        self.codec = get_codec(kwargs.pop('json_codec', None))
+        self.tracer = create_tracer(kwargs.pop('trace', None))
+        self.retry = RetryController(tracer=self.tracer, **pop_retry_options(kwargs))
+        self.timeouts = Timeouts(**pop_timeout_options(kwargs))
+        self.cache = create_cache(kwargs.pop('response_cache', None))
+        self.input=kwargs
+        work_dir = os.getcwd()
+        home_dir = os.path.expanduser("~")
+        self.last_log_ts = int(int((datetime.utcnow() - datetime(1970, 1, 1)).total_seconds())) * 1000
+        self._log_ts_lock = threading.Lock()
+        def get_credentials(file):
+            try:
+                with open(file, 'r') as f:
+                    if file.endswith('.json'):
+                        self.input = json.loads(f.read())
+                    else:
+                        import yaml
+                        self.input = yaml.load(f.read(), Loader=yaml.FullLoader)
+            except Exception as e:
+                raise OperetoClientError('Failed to parse %s: %s'%(file, str(e)))
+
+        if not set(self.credential_keys) <= set(self.input):
+            if os.path.exists(os.path.join(work_dir,'arguments.json')):
+                get_credentials(os.path.join(work_dir,'arguments.json'))
+            elif os.path.exists(os.path.join(work_dir,'arguments.yaml')):
+                get_credentials(os.path.join(work_dir,'arguments.yaml'))
+            elif os.path.exists(os.path.join(home_dir,'opereto.yaml')):
+                get_credentials(os.path.join(home_dir,'opereto.yaml'))
+
+        ## TEMP: fix in agent
+        for item in list(self.input.keys()):
+            try:
+                if self.input[item]=='null':
+                    self.input[item]=None
+                else:
+                    value = json.loads(self.input[item])
+                    if isinstance(value, dict):
+                        self.input[item]=value
+            except:
+                pass
+
+        self.logger = logger
+        if not set(self.credential_keys) <= set(self.input):
+            raise OperetoClientError('Missing one or more credentials required to connect to opereto center.')
+
+        self.hosts = parse_hosts(self.input['opereto_host'])
+        self.input['opereto_host'] = self.hosts[0]
+        self.headers = self._auth_headers()
+        self.transport = create_transport(host=self.input['opereto_host'], hosts=self.hosts, **transport_options)
+        register_after_fork(self)
+
+    def _auth_headers(self):
+        return {'content-type': 'application/json'}
+
+    def reset_after_fork(self):
+        """
+        Reinitializes the client locks and transport (connections, limiters) in a child process after os.fork().
+        Called automatically, so a client created before forking may be used by the child processes.
+        """
+        self._log_ts_lock = threading.Lock()
+        self.retry.reset_after_fork()
+        if self.cache:
+            self.cache.reset_after_fork()
+        self.transport.reset_after_fork()
+
+    def close(self):
+        """
+        Closes the client transport: pooled connections, hedging workers and the health checks of several hosts.
+        Clients created per task should be closed, or used as context managers:
+
+        :Example:
+        .. code-block:: python
+
+           with OperetoClient() as opereto_client:
+               opereto_client.hello()
+        """
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def compression_stats(self):
+        """
+        Raw and on-the-wire request and response byte counters, available when the compress_threshold option is set.
+        """
+        from pyopereto.compression import GzipTransport
+        compression = find_transport(self.transport, GzipTransport)
+        if compression:
+            return compression.stats.as_dict()
+
+    @property
+    def rate_limit_stats(self):
+        """
+        Request count and wait-time statistics of each rate limit, available when the rate_limits option is set.
+        """
+        from pyopereto.ratelimit import RateLimitedTransport
+        rate_limited = find_transport(self.transport, RateLimitedTransport)
+        if rate_limited:
+            return rate_limited.limiter.stats()
+
+    @property
+    def concurrency_stats(self):
+        """
+        Current limit of requests in flight and its adjustments, available when the adaptive_concurrency option is set.
+        """
+        from pyopereto.concurrency import AdaptiveConcurrencyTransport
+        adaptive = find_transport(self.transport, AdaptiveConcurrencyTransport)
+        if adaptive:
+            return adaptive.limiter.as_dict()
+
+    @property
+    def coalescing_stats(self):
+        """
+        Number of GET requests sent and of calls coalesced into them, available when the coalesce_requests option is set.
+        """
+        from pyopereto.singleflight import SingleFlightTransport
+        single_flight = find_transport(self.transport, SingleFlightTransport)
+        if single_flight:
+            return single_flight.as_dict()
+
+    @property
+    def hedging_stats(self):
+        """
+        Number of hedged requests, hedges won and current hedging delays, available when the hedge_requests option is set.
+        """
+        from pyopereto.hedging import HedgingTransport
+        hedging = find_transport(self.transport, HedgingTransport)
+        if hedging:
+            return hedging.as_dict()
+
+    @property
+    def priority_stats(self):
+        """
+        Requests in flight, waiting and queue wait times by priority class, available when the priority_dispatcher option is set.
+        """
+        from pyopereto.priority import PriorityTransport
+        priority = find_transport(self.transport, PriorityTransport)
+        if priority:
+            return priority.dispatcher.as_dict()
+
+    @property
+    def fault_stats(self):
+        """
+        Number of requests, injected faults by kind and added latency, available when the faults option is set.
+        """
+        from pyopereto.faults import FaultInjectionTransport
+        faults = find_transport(self.transport, FaultInjectionTransport)
+        if faults:
+            return faults.injector.stats
+
+    @property
+    def host_stats(self):
+        """
+        Requests, failures, ejections and latency of each host, available when opereto_host is a list of hosts.
+        """
+        from pyopereto.hostpool import HostPoolTransport
+        host_pool = find_transport(self.transport, HostPoolTransport)
+        if host_pool:
+            return host_pool.as_dict()
+
+    @property
+    def cache_stats(self):
+        """
+        Hit, miss and size statistics of the response cache, available when the response_cache option is set.
+        """
+        if self.cache:
+            return self.cache.stats()
+
+    def metrics(self, format='dict'):
+        """
+        metrics(format='dict')
+
+        | Per endpoint request metrics: latency and queue wait histograms, request and response bytes, retries, errors by status code and requests in flight.
+        | Available when the metrics (or metrics_callback) option is set.
+
+        :Parameters:
+        * *format* (`string`) -- dict, or prometheus for the Prometheus text exposition format. Default is dict
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client = OperetoClient(metrics=True)
+           print(opereto_client.metrics()['get_process_status']['latency']['p95'])
+        """
+        from pyopereto.metrics import MetricsTransport
+        collector = find_transport(self.transport, MetricsTransport)
+        if collector:
+            if format == 'prometheus':
+                return collector.metrics.prometheus()
+            return collector.metrics.as_dict()
+
+    def _get_client_releases(self):
+        response = requests.get('https://pypi.org/pypi/pyopereto/json')
+        if response.status_code<299:
+            return response.json()['releases'].keys()
+
+
+    def _get_pids(self, pids=[]):
+        if isinstance(pids, str):
+            pids = [self._get_pid(pids)]
+        if not pids:
+            raise OperetoClientError('Process identifier(s) must be provided.')
+        return pids
+
+
+    def _get_pid(self, pid=None):
+        actual_pid = pid or self.input.get('pid')
+        if not actual_pid:
+            raise OperetoClientError('Process identifier must be provided.')
+        return actual_pid
+
+
+    def _connect(self):
+        pass
+
+
+    def _process_response(self, r, error=None):
+
+        try:
+            response_json = self.codec.loads(r.content)
+        except:
+            response_json={'status': 'failure', 'message': r.reason}
+
+        self.logger.debug('Response: [%s] %s', r.status_code, response_json)
+
+        if response_json:
+            if response_json['status']!='success':
+                response_message = response_json.get('message') or ''
+                if error:
+                    response_message = error + ':\n' + response_message
+                if response_json.get('errors'):
+                    response_message += response_json['errors']
+                raise OperetoClientError(message=response_message, code=r.status_code,
+                                         retry_after=parse_retry_after(r.headers.get('Retry-After')), remote=True)
+            elif 'data' in response_json:
+                return response_json['data']
+
+
+    def _call_rest_api(self, method, url, data={}, error=None, **kwargs):
+
+        self.logger.debug('Request: [%s]: %s', method, url)
+        if data:
+            self.logger.debug('Request Data: %s', data)
+
+        if method not in ['get', 'put', 'post', 'delete']:
+            raise OperetoClientError(message='Invalid request method.', code=500)
+
+        self._connect()
+        body = None
+        if method in ['put', 'post'] and not kwargs.get('files'):
+            body = self.codec.dumps(data)
+        r = self.transport.request(method, self.input['opereto_host']+url, headers=self.headers, data=body, files=kwargs.get('files'),
+                                   timeout=self.timeouts.for_current_call())
+        record_request(len(body) if body else 0, len(r.content or b''), r.status_code)
+        return self._process_response(r, error=error)
+
+
+    def _call_endpoint(self, name, data={}, query=None, **params):
+        """
+        Calls the REST API endpoint of the given ENDPOINTS entry, with the path and error message formatted with *params*.
+        """
+        spec = ENDPOINTS[name]
+        return self._call_rest_api(spec.method, spec.url(query=query, **params), data=data, error=spec.error_message(**params))
+
+
+    def _upload_endpoint(self, name, file_path, query=None, url_suffix='', **params):
+        spec = ENDPOINTS[name]
+        file_size = os.stat(file_path).st_size
+        from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+        files = {'service_file': open(file_path,'rb')}
+        def my_callback(monitor):
+            read_bytes = monitor.bytes_read
+            percentage = int(float(read_bytes)/float(file_size)*100)
+            if percentage>95:
+                percentage=95
+            check_deadline()
+            sys.stdout.write('\r{}% Uploaded out of {} Bytes'.format(percentage, file_size))
+            sys.stdout.flush()
+
+        e = MultipartEncoder(
+            fields=files
+        )
+        m = MultipartEncoderMonitor(e, my_callback)
+        self._connect()
+        url = spec.url(**params) + url_suffix
+        if query:
+            url += '?' + urlencode(query)
+        r = self.transport.request(spec.method, self.input['opereto_host']+url, headers=self.headers, data=m, timeout=self.timeouts.for_current_call())
+        record_request(m.len, len(r.content or b''), r.status_code)
+        sys.stdout.write('\r100% Uploaded out of {} Bytes\n'.format(file_size))
+        sys.stdout.flush()
+        return self._process_response(r, error=spec.error_message(**params))
+
+
+    def batch(self, max_workers=10):
+        """
+        batch(max_workers=10)
+
+        | Returns an OperetoBatch calling the API methods of the client with many sets of arguments concurrently.
+
+        :Parameters:
+        * *max_workers* (`int`) -- Maximum number of calls in flight. Default is 10
+
+        :Example:
+        .. code-block:: python
+
+           statuses = opereto_client.batch().get_process_status(pids)
+           opereto_client.batch(max_workers=20).modify_process_property([('counter', 1, pid) for pid in pids])
+        """
+        from pyopereto.batch import OperetoBatch
+        return OperetoBatch(self, max_workers=max_workers)
+
+
+    def iterate(self, name, page_size=100, **kwargs):
+        """
+        iterate(name, page_size=100, **kwargs)
+
+        | Iterates over all the results of a paged API method (e.g. search_services, get_process_log), fetching them page by page.
+
+        :Parameters:
+        * *name* (`string`) -- Name of a method whose endpoint has the offset paging style
+        * *page_size* (`int`) -- Number of entities fetched per call. Default is 100
+        * *kwargs* -- Other arguments of the method (e.g. filter)
+
+        :Example:
+        .. code-block:: python
+
+           for service in opereto_client.iterate('search_services', filter={'generic': 'testing_'}):
+               print(service['id'])
+        """
+        if ENDPOINTS[name].paging != 'offset':
+            raise OperetoClientError('Method [%s] is not paged' % name)
+        start = kwargs.pop('start', 0)
+        method = getattr(self, name)
+        while True:
+            page = method(start=start, limit=page_size, **kwargs) or []
+            for item in page:
+                yield item
+            if len(page) < page_size:
+                return
+            start += len(page)
+
+
+    #### GENERAL ####
+    @endpoint
+    def hello(self):
+        """
+        hello(self)
+
+        | Checks if Opereto Server is up and running.
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client = OperetoClient()
+           opereto_client.hello()
+        """
+        return self._call_endpoint('hello')
+
+
+    #### MICROSERVICES & VERSIONS ####
+    @endpoint
+    def search_services(self, start=0, limit=100, filter={}):
+        """
+        search_services(start=0, limit=100, filter={}, **kwargs)
+
+        | Search for Opereto services, in Services data and properties
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- Maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- Free text search pattern (checks in service data and properties)
+
+        :return: List of search results
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'testing_'}
+           search_result = opereto_client.search_services(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_services', data=request_data)
+
+
+    @endpoint
+    def get_service(self, service_id):
+        """
+        get_service(service_id)
+
+        | Get a service meta data (id, audit log, type, etc.) information.
+
+        :Parameters:
+        * *service_id* (`string`) -- Identifier of an existing service
+        :return: Service meta data
+
+        :Example:
+        .. code-block:: python
+
+            service_meta_data = opereto_client.get_service(serviceId)
+
+        """
+        return self._call_endpoint('get_service', service_id=service_id)
+
+    @endpoint
+    def get_service_version(self, service_id, mode='production', version='default'):
+        """
+        get_service_version(service_id, mode='production', version='default')
+
+        | Get a specific version details of a given service. Opereto will try to fetch the requested service version. If not found, it will return the default production version. The "actual_version" field of the returned JSON indicates what version of the service is returned. If the actual version is null, it means that this service does not have any version at all. To make it operational, you will have to import or upload a default version.
+
+        :Parameters:
+        * *service_id* (`string`) -- Identifier of an existing service
+        * *mode* (`string`) -- development/production. Default is production
+        * *version* (`string`) -- version of the service ("default" is the default.
+
+        :return: json service version details
+
+        :Example:
+        .. code-block:: python
+
+           service_version = opereto_client.get_service_version(serviceId, mode='development', version='111')
+        """
+        return self._call_endpoint('get_service_version', service_id=service_id, mode=mode, version=version)
+
+
+    @endpoint
+    def verify_service(self, service_id, specification=None, description=None, agent_mapping=None):
+        """
+        verify_service(service_id, specification=None, description=None, agent_mapping=None)
+
+        | Verifies validity of service yaml
+
+        :Parameters:
+        * *service_id* (`string`) -- Identifier of an existing service
+        * *specification* (`string`) -- service specification yaml
+        * *description* (`string`) -- service description written in text or markdown style
+        * *agent_mapping* (`string`) -- agents mapping specification
+
+        :return: json service version details
+
+        :Example:
+        .. code-block:: python
+
+           spec = {
+               "type": "action",
+               "cmd": "python -u run.py",
+               "timeout": 600,
+               "item_properties": [
+                    {"key": "key1", "type": "text", "value": "value1", "direction": "input"},
+                    {"key": "key2", "type": "boolean", "value": True, "direction": "input"}
+                 ]
+              }
+           if opereto_client.verify_service ('hello_world', specification=spec)['errors'] == []:
+              result = True
+
+        """
+        request_data = {'id': service_id}
+        if specification:
+            request_data['spec']=specification
+        if description:
+            request_data['description']=description
+        if agent_mapping:
+            request_data['agents']=agent_mapping
+        return self._call_endpoint('verify_service', data=request_data, service_id=service_id)
+
+
+    
+    @endpoint
+    def modify_service(self, service_id, type):
+        """
+        modify_service(service_id, type)
+
+        | Modifies a service type (action, container, etc.)
+
+        :Parameters:
+        * *service_id* (`string`) -- Identifier of an existing service
+        * *type* (`string`) -- service type
+
+        :return: Service modification metadata (service id, type, modified date, versions
+
+        :Example:
+        .. code-block:: python
+
+           service_modification_metadata = opereto_client.modify_service ('myService', 'container')
+           if service_modification_metadata['type'] == 'container'
+              print 'service type of {} changed to container'.format('myService')
+
+        """
+        request_data = {'id': service_id, 'type': type}
+        return self._call_endpoint('modify_service', data=request_data, service_id=service_id)
+
+
+    @endpoint
+    def upload_service_version(self, service_zip_file, mode='production', service_version='default', service_id=None, **kwargs):
+        """
+        upload_service_version(service_zip_file, mode='production', service_version='default', service_id=None, **kwargs)
+
+        Upload a service version to Opereto
+
+        :Parameters:
+        * *service_zip_file* (`string`) -- zip file location containing service and service specification
+        * *mode* (`string`) -- production/development (default is production)
+        * *service_version* (`string`) -- Service version
+        * *service_id* (`string`) -- Service Identifier
+
+        :Keywords args:
+        * *comment* (`string`) -- comment
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client.upload_service_version(service_zip_file=zip_action_file+'.zip', mode='production', service_version='111')
+
+        """
+        url_suffix = ''
+        if mode=='production':
+            url_suffix+='/'+service_version
+        if service_id:
+            url_suffix+='/'+service_id
+        return self._upload_endpoint('upload_service_version', service_zip_file, query=kwargs, url_suffix=url_suffix, mode=mode)
+
+
+    @endpoint
+    def import_service_version(self, repository_json, mode='production', service_version='default', service_id=None, **kwargs):
+        """
+        import_service_version(repository_json, mode='production', service_version='default', service_id=None, **kwargs)
+
+        Imports a service version into Opereto from a remote repository (GIT, SVN, AWS S3, any HTTPS repository)
+
+        :Parameters:
+        * *repository_json* (`object`) -- repository_json
+        :Example of repository JSON:
+            .. code-block:: json
+
+                #GIT source control
+                {
+                    "repo_type": "git",
+                    "url": "git@bitbucket.org:my_account_name/my_project.git",
+                    "branch": "master",
+                    "ot_dir": "mydir"
+                }
+
+                #SVN
+                {
+                    "repo_type": "svn",
+                    "url": "svn://myhost/myrepo",
+                    "username": "OPTIONAL_USERNAME",
+                    "password": "OPTIONAL_PASSWORD",
+                    "ot_dir": "my_service_dir"
+                }
+
+                # Any HTTP based remote storage
+
+                {
+                    "repo_type": "http",
+                    "url": "https://www.dropbox.com/s/1234567890/MyFile.zip?dl=0",
+                    "username": "OPTIONAL_PASSWORD",
+                    "ot_dir": "my_service_dir"
+                }
+
+                # AWS S3 Storage
+
+                {
+                    "repo_type": "s3",
+                    "bucket": "my_bucket/my_service.zip",
+                    "access_key": "MY_ACCESS_KEY",
+                    "secret_key": "MY_SECRET_KEY",
+                    "ot_dir": "my_service_dir"
+                }
+
+        * *mode* (`string`) -- production/development (default is production)
+        * *service_version* (`string`) -- Service version
+        * *service_id* (`string`) -- Service version
+
+
+        :return: status - success/failure
+
+        :Example:
+        .. code-block:: python
+
+            # for GIT
+           repository_json = {
+                "branch": "master",
+                "ot_dir": "microservices/hello_world",
+                "repo_type": "git",
+                "url": "https://github.com/myCompany/my_services.git"
+            }
+
+            opereto_client.import_service_version(repository_json, mode='production', service_version='default', service_id=self.my_service2)
+
+        """
+        request_data = {'repository': repository_json, 'mode': mode, 'service_version': service_version, 'id': service_id}
+        return self._call_endpoint('import_service_version', data=request_data, query=kwargs)
+
+    
+    @endpoint
+    def delete_service(self, service_id):
+        """
+        delete_service(service_id)
+
+        Deletes a Service from Opereto
+
+        :Parameters:
+        * *service_id* (`string`) -- Service Identifier
+
+        :return: status: success/failure
+
+         :Example:
+        .. code-block:: python
+
+           opereto_client.delete_service('my_service_id')
+
+        """
+
+        return self._call_endpoint('delete_service', service_id=service_id)
+
+
+
+    @endpoint
+    def delete_service_version(self, service_id , service_version='default', mode='production'):
+        """
+        delete_service(service_id, service_version='default', mode='production')
+
+        Deletes a Service version from Opereto
+
+        :Parameters:
+        * *service_id* (`string`) -- Service identifier
+        * *service_version* (`string`) -- Service version. Default is 'default'
+        * *mode* (`string`) -- development/production. Default is production
+
+        :return: success/failure
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client.delete_service('my_service_id')
+
+        """
+        return self._call_endpoint('delete_service_version', service_id=service_id, mode=mode, service_version=service_version)
+
+
+    @endpoint
+    def list_development_sandbox(self):
+        """
+        list_development_sandbox(self)
+
+        List all services in the current user's development sandbox
+
+        :return: List of sandbox services ids. e.g: ['testing_hello_world', 'pytest_execution']
+
+        """
+        return self._call_endpoint('list_development_sandbox')
+
+
+    
+    @endpoint
+    def purge_development_sandbox(self):
+        """
+        purge_development_sandbox(self)
+
+        Deletes all services from the current user's development sandbox.
+
+        :return: success/failure
+
+        """
+        return self._call_endpoint('purge_development_sandbox')
+
+
+
+    #### ENVIRONMENTS ####
+    @endpoint
+    def search_environments(self, start=0, limit=100, filter={}):
+        """
+        search_environments(start=0, limit=100, filter={}, **kwargs)
+
+        Search environments
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in environment data and properties)
+
+        :return: List of search results or empty list
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_environments', data=request_data)
+
+
+    @endpoint
+    def get_environment(self, environment_id):
+        """
+        get_environment(environment_id)
+
+        Get environment general info.
+
+
+        :param String environment_id: Identifier of an existing environment
+        :return: environment data
+
+        """
+        return self._call_endpoint('get_environment', environment_id=environment_id)
+
+    @endpoint
+    def verify_environment_scheme(self, environment_type, environment_topology):
+        """
+        verify_environment_scheme(environment_type, environment_topology)
+
+        Verifies json scheme of an environment
+
+        :Parameters:
+
+        * *environment_type* (`string`) -- Topology identifier
+        * *environment_topology* (`object`) -- Environment json to validate
+
+        :return: Success or errors in case the verification failed
+
+        :Return Example:
+        .. code-block:: json
+
+            # verification failure
+            {'errors': ['Topology key cluster_name is missing in environment specification'], 'agents': {}, 'success': False, 'warnings': []}
+
+            # verification success
+            {'errors': [], 'agents': {}, 'success': True, 'warnings': []}
+
+        :Example:
+        .. code-block:: python
+
+            environment_topology =
+            {
+                  "cluster_name": "k8s-clusbbe9",
+                  "config_file": {
+                    "contexts": [
+                      {
+                        "name": "my-context"
+                      }
+                    ],
+                    "clusters": [
+                      {
+                        "name": "k8s-clusbbe9"
+                      }
+                    ]
+                  }
+            }
+            environment = opereto_client.verify_environment_scheme(environment_type = 'myTopology', environment_topology = environment_topology)
+
+        """
+        request_data = {'topology_name': environment_type, 'topology': environment_topology}
+        return self._call_endpoint('verify_environment_scheme', data=request_data)
+
+    @endpoint
+    def verify_environment(self, environment_id):
+        """
+        verify_environment(environment_id)
+
+        Verifies validity of an existing environment
+
+        :Parameters:
+
+        * *environment_id* (`string`) -- Environment identifier
+
+        :return: Success or errors in case the verification failed
+
+        :Return Example:
+        .. code-block:: json
+
+            # verification failure
+            {'errors': ['Topology key cluster_name is missing in environment specification'], 'agents': {}, 'success': False, 'warnings': []}
+
+            # verification success
+            {'errors': [], 'agents': {}, 'success': True, 'warnings': []}
+
+        """
+        request_data = {'id': environment_id}
+        return self._call_endpoint('verify_environment', data=request_data)
+
+    
+    @endpoint
+    def create_environment(self, topology_name, topology={}, id=None, **kwargs):
+        """
+        create_environment(topology_name, topology={}, id=None, **kwargs)
+
+        Create a new environment
+
+        :Parameters:
+
+        * *topology_name* (`string`) -- The topology identifier. Must be provided to create an environment.
+        * *topology* (`object`) -- Topology data (must match the topology json schema)
+        * *id* (`object`) -- The environment identifier. If none provided when creating environment, Opereto will automatically assign a unique identifier.
+
+        :return: id of the created environment
+
+        """
+        request_data = {'topology_name': topology_name,'id': id, 'topology':topology, 'add_only':True}
+        request_data.update(**kwargs)
+        return self._call_endpoint('create_environment', data=request_data)
+
+    
+    @endpoint
+    def modify_environment(self, environment_id, **kwargs):
+        """
+        modify_environment(environment_id, **kwargs)
+
+        Modifies an existing environment
+
+        :Parameters:
+        * *environment_id* (`string`) -- The environment identifier
+
+        Keywords args:
+        The variables to change in the environment
+
+        :return: id of the created environment
+
+        """
+        request_data = {'id': environment_id}
+        request_data.update(**kwargs)
+        return self._call_endpoint('modify_environment', data=request_data)
+
+    
+    @endpoint
+    def delete_environment(self, environment_id):
+        """
+        delete_environment(environment_id)
+
+        Delete an existing environment
+
+        :Parameters:
+        * *environment_id* (`string`) -- The environment identifier to delete
+
+        """
+        return self._call_endpoint('delete_environment', environment_id=environment_id)
+
+
+    #### AGENTS ####
+
+    @endpoint
+    def search_agents(self, start=0, limit=100, filter={}):
+        """
+        search_agents(start=0, limit=100, filter={}, **kwargs)
+
+        Search agents
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in agent data and properties)
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my Agent'}
+           search_result = opereto_client.search_agents(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_agents', data=request_data)
+
+    @endpoint
+    def get_agents(self, agent_id):
+        """
+        get_agents(agent_id)
+
+        Get agent general details
+
+        :Parameters:
+        * *agent_id* (`string`) -- Agent identifier
+
+        :return: Agent general details
+
+        """
+        return self._call_endpoint('get_agents', agent_id=agent_id)
+
+
+    @endpoint
+    def get_agent_properties(self, agent_id):
+        """
+        get_agent_properties(agent_id)
+
+        Get agent properties separated to custom properties defined by the user and built-in properties provided by Opereto.
+
+        :Parameters:
+        * *agent_id* (`string`) -- Agent identifier
+
+        :return: Agent general details
+
+        :Example:
+        .. code-block:: python
+
+            >>> my_agent_properties = opereto_client.get_agent_properties('my_agent_id')
+            >>> print (my_agent_properties)
+
+            {'builtin':
+                {'system.arch': 'amd64', 'agent.user': 'Ariel', 'network': '{lo=[/127.0.0.1/8 [/127.255.255.255], /0:0:0:0:0:0:0:1/128 [null]], net6=[], net5=[], net7=[], eth11=[], eth10=[], eth13=[], net0=[], wlan1=[/da:0:0:0:29dc:fe33:4234:30bd%19/64 [null]], eth12=[], wlan0=[/10.100.222.423/24 [/10.100.222.423], /fa:0:0:0:29dc:fe33:4234:30bd%19/64 [null]], eth15=[], net2=[], eth14=[], net1=[], net4=[], net3=[], wlan6=[], wlan7=[], wlan8=[], wlan9=[], wlan2=[/fe80:0:0:0:455d:390b:c559:f259%20/64 [null]], wlan3=[], wlan4=[], wlan5=[], eth9=[], eth3=[], eth4=[], eth1=[], eth2=[], eth7=[], eth8=[], eth5=[/fe80:0:0:0:2807:b110:c4fb:835b%11/64 [null]], eth6=[], eth0=[], wlan12=[], wlan11=[], wlan10=[], ppp0=[], wlan15=[], wlan14=[], wlan13=[]}', 'agent.user.home': 'C:\\Users\\myuser', 'opereto_agent_version': '1.1.44', 'hostname': 'DESKTOP-', 'total.space': '237.9 GiB', 'agent.home': 'C:\\Users\\myuser\\opereto-agent\\target', 'available.processors': '4', 'free.space': '140.3 GiB', 'os.name': 'windows 8.1', 'system.version': '6.3'},
+                'custom': {'agent_current_env': 'env1'}}
+
+
+        """
+        return self._call_endpoint('get_agent_properties', agent_id=agent_id)
+
+    @endpoint
+    def get_all_agents(self):
+        """
+        get_all_agents()
+
+        Get all agents
+
+        :return: list of existing agents
+
+        """
+        return self._call_endpoint('get_all_agents')
+
+
+    
+    @endpoint
+    def modify_agent_property(self, agent_id, key, value):
+        """
+        modify_agent_property(agent_id, key, value)
+
+        Modifies a single single property of an agent. If the property does not exists then it is created as a custom property.
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+        * *key* (`string`) -- Key of a property to change
+        * *value* (`string`) -- New Value of the property to change
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client.modify_agent_property('my_agent_id', 'agent_new_property', 'agent value')
+
+        """
+        return self._call_endpoint('modify_agent_property', data={key: value}, agent_id=agent_id, key=key)
+
+
+    
+    @endpoint
+    def modify_agent_properties(self, agent_id, key_value_map={}):
+        """
+        modify_agent_properties(agent_id, key_value_map={})
+
+        Modify properties of an agent. If properties do not exists, they will be created
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+        * *key_value_map* (`object`) -- Key value map of properties to change
+        * *value* (`string`) -- New Value of the property to change
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client.modify_agent_properties('my_agent_id', {"mykey": "myvalue", "mykey2": "myvalue2"})
+
+        """
+        return self._call_endpoint('modify_agent_properties', data=key_value_map, agent_id=agent_id)
+
+
+    
+    @endpoint
+    def create_agent(self, agent_id=None, **kwargs):
+        """
+        create_agent(agent_id=None, **kwargs)
+
+        | Creates an agent based on the identifier provided. \
+        | The agent will become online when a real agent will connect using this identifier. \
+        | However, in most cases, the agent entity is created automatically when a new agent connects to opereto. \
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+        :Keywords args:
+        * *name* (`string`) -- Display name to show in the UI
+        * *description* (`string`) -- A textual description of the agent
+        * *permissions* (`object`) -- Permissions on the agent
+            * *owners* (`array`) -- List of Opereto usernames that may modify and delete the agent
+            * *owners* (`array`) -- List of Opereto usernames that may run services on the agent
+        :return: id of the generated agent
+
+        :Example:
+        .. code-block:: python
+
+           opereto_client = OperetoClient()
+           opereto_client.create_agent(agent_id='xAgent', name='My new agent', description='A new created agent to be called from X machines')
+        """
+        request_data = {'id': agent_id, 'add_only':True}
+        request_data.update(**kwargs)
+        return self._call_endpoint('create_agent', data=request_data)
+
+
+    
+    @endpoint
+    def modify_agent(self, agent_id, **kwargs):
+        """
+        modify_agent(agent_id, **kwargs)
+
+        | Modifies agent information (like name)
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+
+         :Example:
+        .. code-block:: python
+
+           opereto_client = OperetoClient()
+           opereto_client.modify_agent('agentId', name='my new name')
+        """
+        request_data = {'id': agent_id}
+        request_data.update(**kwargs)
+        return self._call_endpoint('modify_agent', data=request_data, agent_id=agent_id)
+
+
+    @endpoint
+    def get_agent(self, agent_id):
+        """
+        get_agent(agent_id)
+
+        Get agent general details
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+
+         :Example:
+        .. code-block:: python
+
+            >>> agent_is_online = opereto_client.get_agent('my_agent_id')['online']
+            >>> print (my_agent_properties)
+
+            # example of return value
+            False
+
+        """
+        return self._call_endpoint('get_agent', agent_id=agent_id)
+
+    @endpoint
+    def get_agent_status(self, agent_id):
+        """
+        get_agent_status(agent_id)
+
+        Get agent status. Returns the agent information with the 'online' property (true or false)
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+
+        :Example:
+        .. code-block:: python
+
+            my_agent_status = opereto_client.get_agent_status('my_agent_id')['online']
+
+        """
+        return self._call_endpoint('get_agent_status', agent_id=agent_id)
+
+    
+    @endpoint
+    def delete_agent(self, agent_id):
+        """
+        delete_agent(agent_id)
+
+        Deletes an agent
+
+        :Parameters:
+        * *agent_id* (`string`) -- Identifier of an existing agent
+
+        """
+
+        return self._call_endpoint('delete_agent', agent_id=agent_id)
+
+    #### PROCESSES ####
+
+    @endpoint
+    def create_process(self, service, agent=None, title=None, mode=None, service_version=None, **kwargs):
+        """
+        create_process(service, agent=None, title=None, mode=None, service_version=None, **kwargs)
+
+        Registers a new process or processes
+
+        :Parameters:
+        * *service* (`string`) -- Service which process will be started
+        * *agent* (`string`) -- a valid value may be one of the following: agent identifier, agent identifiers (list) : ["agent_1", "agent_2"..], "all", "any"
+        * *title* (`string`) -- Title for the process
+        * *mode* (`string`) -- production/development
+        * *service_version* (`string`) -- Version of the service to execute
+
+        :Keywords args:
+        Json value map containing the process input properties
+
+        :return: process id
+
+        :Example:
+        .. code-block:: python
+
+           process_properties = {"my_input_param" : "1"}
+           pid = opereto_client.create_process(service='simple_shell_command', title='Test simple shell command service', agent=opereto_client.input['opereto_agent'], **process_properties)
+
+        """
+        self.logger.debug('Creating a new process..')
+        if not agent:
+            agent = self.input.get('opereto_agent')
+
+        if not mode:
+            mode=self.input.get('opereto_execution_mode') or 'production'
+        if not service_version:
+            service_version=self.input.get('opereto_service_version')
+
+        request_data = {'service_id': service, 'agents': agent, 'mode': mode, 's_version':service_version}
+        if title:
+            request_data['name']=title
+
+        if self.input.get('pid'):
+            request_data['pflow_id']=self.input.get('pid')
+
+        request_data.update(**kwargs)
+        ret_data= self._call_endpoint('create_process', data=request_data)
+
+        if not isinstance(ret_data, list):
+            raise OperetoClientError(str(ret_data))
+
+        pid = ret_data[0]
+        message = 'New process created for service [%s] [pid = %s] '%(service, pid)
+        if agent:
+            message += ' [agent = %s]'%agent
+        self.logger.info(message)
+
+        return str(pid)
+
+
+    
+    @endpoint
+    def rerun_process(self, pid, title=None, agent=None):
+        """
+        rerun_process(pid, title=None, agent=None)
+
+        Reruns a process
+
+        :Parameters:
+        * *pid* (`string`) -- Process id to rerun
+        * *title* (`string`) -- Title for the process
+        * *agent* (`string`) -- a valid value may be one of the following: agent identifier, agent identifiers (list) : ["agent_1", "agent_2"..], "all", "any"
+
+        :return: process id
+
+        """
+        request_data = {}
+        if title:
+            request_data['name']=title
+        if agent:
+            request_data['agents']=agent
+
+        if self.input.get('pid'):
+            request_data['pflow_id']=self.input.get('pid')
+
+        ret_data= self._call_endpoint('rerun_process', data=request_data, pid=pid)
+
+        if not isinstance(ret_data, list):
+            raise OperetoClientError(str(ret_data))
+
+        new_pid = ret_data[0]
+        message = 'Re-executing process [%s] [new process pid = %s] '%(pid, new_pid)
+        self.logger.info(message)
+        return str(new_pid)
+
+
+    @endpoint
+    def modify_process_properties(self, key_value_map={}, pid=None):
+        """
+        modify_process_properties(key_value_map={}, pid=None)
+
+        Modify process output properties.
+        Please note that process property key provided must be declared as an output property in the relevant service specification.
+
+        :Parameters:
+        * *key_value_map* (`object`) -- key value map with process properties to modify
+        * *pid* (`string`) -- Identifier of an existing process
+
+        :Example:
+        .. code-block:: python
+
+           process_output_properties = {"my_output_param" : "1"}
+           pid = opereto_client.create_process(service='simple_shell_command', title='Test simple shell command service')
+           opereto_client.modify_process_properties(process_output_properties, pid)
+
+        """
+        pid = self._get_pid(pid)
+        request_data={"properties": key_value_map}
+        return self._call_endpoint('modify_process_properties', data=request_data, pid=pid)
+
+    
+    @endpoint
+    def modify_process_property(self, key, value, pid=None):
+        """
+        modify_process_property(key, value, pid=None)
+
+        Modify process output property.
+        Please note that the process property key provided must be declared as an output property in the relevant service specification.
+
+        :Parameters:
+        * *key* (`String`) -- key of property to modify
+        * *key* (`value`) -- value of property to modify
+        * *pid* (`string`) -- Identifier of an existing process
+
+        :Example:
+        .. code-block:: python
+
+           pid = opereto_client.create_process(service='simple_shell_command', title='Test simple shell command service')
+           opereto_client.modify_process_property("my_output_param", "1" , pid)
+
+        """
+        pid = self._get_pid(pid)
+        request_data={"key" : key, "value": value}
+        return self._call_endpoint('modify_process_property', data=request_data, pid=pid, key=key)
+
+    
+    @endpoint
+    def modify_process_summary(self, pid=None, text='', append=False):
+        """
+        modify_process_summary(pid=None, text='')
+
+        Modifies the summary text of the process execution
+
+        :Parameters:
+        * *key* (`pid`) -- Identifier of an existing process
+        * *key* (`text`) -- summary text
+        * *append* (`boolean`) -- True to append to summary. False to override it.
+
+        """
+        pid = self._get_pid(pid)
+
+        if append:
+            current_summary =  self.get_process_info(pid).get('summary') or ''
+            modified_text = current_summary + '\n' + text
+            text = modified_text
+
+        request_data = {"id": pid, "data": str(text)}
+        return self._call_endpoint('modify_process_summary', data=request_data, pid=pid)
+
+
+    
+    @endpoint
+    def stop_process(self, pids=[], status='success', message=''):
+        """
+        stop_process(pids, status='success')
+
+        Stops a running process
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+        * *result* (`string`) -- the value the process will be terminated with. Any of the following possible values:  success , failure , error , warning , terminated
+
+        """
+        if status not in process_result_statuses:
+            raise OperetoClientError('Invalid process result [%s]'%status)
+        pids = self._get_pids(pids)
+        for pid in pids:
+            request_data = {"termination_message": str(message)}
+            self._call_endpoint('stop_process', data=request_data, pid=pid, status=status)
+
+
+    @endpoint
+    def get_process_status(self, pid=None):
+        """
+        get_process_status(pid=None)
+
+        Get current status of a process
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+
+        """
+        pid = self._get_pid(pid)
+        return self._call_endpoint('get_process_status', pid=pid)
+
+
+    @endpoint
+    def get_process_flow(self, pid=None):
+        """
+        get_process_flow(pid=None)
+
+        Get process in flow context. The response returns a sub-tree of the whole flow containing the requested process, its direct children processes, and all ancestors.
+        You can navigate within the flow backword and forward by running this call on the children or ancestors of a given process.
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+
+        """
+        pid = self._get_pid(pid)
+        return self._call_endpoint('get_process_flow', pid=pid)
+
+
+    @endpoint
+    def get_process_rca(self, pid=None):
+        """
+        get_process_rca(pid=None)
+
+        Get the RCA tree of a given failed process. The RCA tree contains all failed child processes that caused the failure of the given process.
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+
+        """
+        pid = self._get_pid(pid)
+        return self._call_endpoint('get_process_rca', pid=pid)
+
+
+    @endpoint
+    def get_process_info(self, pid=None):
+        """
+        get_process_info(pid=None)
+
+        Get process general information.
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+
+        """
+
+        pid = self._get_pid(pid)
+        return self._call_endpoint('get_process_info', pid=pid)
+
+    @endpoint
+    def get_process_log(self, pid=None, start=0, limit=1000):
+        """
+        get_process_log(pid=None, start=0, limit=1000
+
+        Get process logs
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+        * *start* (`string`) -- start index to retrieve logs from
+        * *limit* (`string`) -- maximum number of entities to retrieve
+
+        :return: Process log entries
+
+        """
+        pid = self._get_pid(pid)
+        data = self._call_endpoint('get_process_log', query={'start': start, 'limit': limit}, pid=pid)
+        return data['list']
+
+    @endpoint
+    def send_process_log(self, pid, log_entries=[]):
+        """
+        send_process_log(pid=None, log_entries=[{'text'='This is my log', level=''}])
+
+        Send process logs
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+        * *log_entries* (`list`) -- start index to retrieve logs from
+
+        :return: Process log entries
+
+        """
+        log_data = []
+        timestamp = int(int((datetime.utcnow() - datetime(1970, 1, 1)).total_seconds())) * 1000
+        with self._log_ts_lock:
+            if self.last_log_ts <= timestamp:
+                self.last_log_ts = timestamp + 1
+            else:
+                self.last_log_ts += 1
+            log_ts = self.last_log_ts
+        for entry in log_entries:
+            if not entry.get('level'):
+                entry['level'] = 'INFO'
+            entry['timestamp'] = log_ts
+            log_data.append(entry)
+
+        request_data = {'id': pid, 'data': log_data}
+        res = self._call_endpoint('send_process_log', data=request_data, pid=pid)
+        return res
+
+
+    @endpoint
+    def search_process_log(self, pid, filter={}, start=0, limit=1000):
+        """
+        search_process_log(pid, filter={}, start=0, limit=1000)
+
+        Search in process logs
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in process log data)
+
+        :return: Count of records found and list of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my product param'}
+           search_result = opereto_client.search_globals(filter=filter)
+           if len(search_result) > 0:
+              print(search_result)
+        """
+        pid = self._get_pid(pid)
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_process_log', data=request_data, pid=pid)
+
+    ## deprecated
+    def get_process_property(self, pid=None, name=None):
+        pid = self._get_pid(pid)
+        return self.get_process_properties(pid, name)
+
+
+    @endpoint
+    def get_process_properties(self, pid=None, name=None, verbose=False):
+        """
+        get_process_properties(pid=None, name=None)
+
+        Get process properties (both input and output properties)
+
+        :Parameters:
+        * *pid* (`string`) -- Identifier of an existing process
+        * *name* (`string`) -- optional - Property name
+
+        """
+        pid = self._get_pid(pid)
+        res = self._call_endpoint('get_process_properties', query={'verbose': 'true'} if verbose else None, pid=pid)
+        if name:
+            try:
+                return res[name]
+            except KeyError as e:
+                raise OperetoClientError(message='Invalid property [%s]'%name, code=404)
+        else:
+            return res
+
+
+    @apicall
+    def wait_for(self, pids=[], status_list=process_result_statuses):
+        """
+        wait_for(pids=[], status_list=process_result_statuses)
+
+        Waits for a process to finish
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes waiting to be finished
+        * *status_list* (`list`) -- optional - List of statuses to wait for processes to finish with
+        * *deadline* (`float`) -- optional - Maximum number of seconds to wait. An OperetoClientError (code 408) is raised when exceeded
+
+        :Example:
+        .. code-block:: python
+
+           pid = opereto_client.create_process(service='simple_shell_command', title='Test simple shell command service')
+           opereto_client.wait_for([pid], ['failure', 'error'])
+           opereto_client.rerun_process(pid)
+
+        """
+        results={}
+        pids = self._get_pids(pids)
+        for pid in pids:
+            interval=1
+            while(True):
+                try:
+                    stat = self._call_endpoint('get_process_status', pid=pid)
+                    if stat in status_list:
+                        results[pid]=stat
+                        break
+                    remaining = remaining_time()
+                    time.sleep(interval if remaining is None else max(0, min(interval, remaining)))
+                    check_deadline()
+                    if interval<5:
+                        interval+=1
+                except requests.exceptions.RequestException as e:
+                    raise e
+        return results
+
+
+    def _status_ok(self, status, pids=[]):
+        pids = self._get_pids(pids)
+        self.logger.info('Waiting that the following processes %s will end with status [%s]..'%(str(pids), status))
+        statuses = self.wait_for(pids)
+        if not statuses:
+            return False
+        for pid,stat in list(statuses.items()):
+            if stat!=status:
+                self.logger.error('But it ended with status [%s]'%stat)
+                return False
+        return True
+
+
+    def wait_to_start(self, pids=[], deadline=None):
+        """
+        wait_to_start(pids=[], deadline=None)
+
+        Wait for processes to start
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to start
+        * *deadline* (`float`) -- optional - Maximum number of seconds to wait
+
+        """
+        actual_pids = self._get_pids(pids)
+        return self.wait_for(pids=actual_pids, status_list=process_result_statuses+['in_process'], deadline=deadline)
+
+
+    def wait_to_end(self, pids=[], deadline=None):
+        """
+        wait_to_end(pids=[], deadline=None)
+
+        Wait for processes to finish
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+        * *deadline* (`float`) -- optional - Maximum number of seconds to wait
+
+        """
+        actual_pids = self._get_pids(pids)
+        return self.wait_for(pids=actual_pids, status_list=process_result_statuses, deadline=deadline)
+
+
+    def is_success(self, pids=[]):
+        """
+        is_success(pids)
+
+        Waits for a process to end and check if it status is 'success'
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+
+        """
+        return self._status_ok('success', pids)
+
+
+    def is_failure(self, pids):
+        """
+        is_failure(pids)
+
+        Waits for a process to end and check if it status is 'failure'
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+
+        """
+        return self._status_ok('failure', pids)
+
+
+    def is_error(self, pids):
+        """
+        is_error(pids)
+
+        Waits for a process to end and check if it status is 'error'
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+        * *deadline* (`float`) -- optional - Maximum number of seconds to wait
+        """
+        return self._status_ok('error', pids)
+
+
+    def is_timeout(self, pids):
+        """
+        is_timeout(pids)
+
+        Waits for a process to end and check if it status is 'timeout'
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+        """
+        return self._status_ok('timeout', pids)
+
+
+    def is_warning(self, pids):
+        """
+        is_warning(pids)
+
+        Waits for a process to end and check if it status is 'warning'
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+        """
+        return self._status_ok('warning', pids)
+
+
+    def is_terminated(self, pids):
+        """
+        is_terminated(pids)
+
+        Waits for a process to end and check if it status is 'terminated'
+
+        :Parameters:
+        * *pids* (`list`) -- list of processes to wait to finish
+        """
+        return self._status_ok('terminate', pids)
+
+
+    @endpoint
+    def get_process_runtime_cache(self, key, pid=None):
+        """
+        get_process_runtime_cache(key, pid=None)
+
+        Get a pre-defined run time parameter value
+
+        :Parameters:
+        * *key* (`string`) -- Identifier of the runtime cache
+        * *pid* (`string`) -- Identifier of an existing process
+
+        """
+        value = None
+        pid = self._get_pid(pid)
+        value = self._call_endpoint('get_process_runtime_cache', query={'key': key}, pid=pid)
+        return value
+
+
+    
+    @endpoint
+    def set_process_runtime_cache(self, key, value, pid=None):
+        """
+        set_process_runtime_cache(key, value, pid=None)
+
+        Set a process run time parameter
+
+        :Parameters:
+        * *key* (`string`) -- parameter key
+        * *key* (`value`) -- parameter value
+        * *key* (`pid`) -- optional - Identifier of an existing process
+
+        """
+        pid = self._get_pid(pid)
+        self._call_endpoint('set_process_runtime_cache', data={'key': key, 'value': value}, pid=pid)
+
+
+    #### GLOBAL PARAMETERS ####
+    @endpoint
+    def search_globals(self, start=0, limit=100, filter={}):
+        """
+        search_globals(start=0, limit=100, filter={}, **kwargs)
+
+        Search for global parameters
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in global parameters data)
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my product param'}
+           search_result = opereto_client.search_globals(filter=filter)
+
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_globals', data=request_data)
+
+
+    #### KPI ####
+    @endpoint
+    def search_kpi(self, start=0, limit=100, filter={}):
+        """
+        search_kpi(start=0, limit=100, filter={}, **kwargs)
+
+        Search KPI
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in kpi data)
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my kpi param'}
+           search_result = opereto_client.search_kpi(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_kpi', data=request_data)
+
+
+    
+    @endpoint
+    def modify_kpi(self, kpi_id, product_id, measures=[], append=False, feature_id=None, name=None, summary=None, validator={}):
+        """
+        modify_kpi(kpi_id, product_id, measures=[], append=False, feature_id=None, validator={}, **kwargs)
+
+        Creates a new kpi or modifies existing one.
+
+      :Parameters:
+        * *kpi_id* (`string`) -- The KPI identifier (unique per product)
+        * *product_id* (`string`) -- The product (release candidate) identifierier
+        * *measures* (`list`) -- List of numeric (integers or floats) measures
+        * *append* (`boolean`) -- True to append new measures to existing ones for this API. False to override previous measures
+        * *feature_id* (`string`) -- Feature identifier to attach this KPI to a given feature (optional)
+        * *name* (`string`) -- headline for the KPI (optional)
+        * *summary* (`string`) -- A short text of html summary (optional)
+        * *validator* (`object`) -- a map of treshhold constains for this measure. The following keys are allowed: gt, gte, lt, lte (optional)
+
+        :Example:
+        .. code-block:: python
+
+           # average meature value must be grater or equal to 0 and less or equal to 10.0
+           validator = {'gte': 0, 'lte': 10.0}
+
+           client.modify_kpi('general_latency', client.input['opereto_product_id'], measures=[2.2], append=False, feature_id=None, validator=validator)
+
+        """
+        if not isinstance(measures, list):
+            measures = [measures]
+        request_data = {'kpi_id': kpi_id, 'product_id': product_id, 'measures': measures, 'append': append, 'feature_id': feature_id, 'name': name, 'summary': summary, 'validator': validator}
+        return self._call_endpoint('modify_kpi', data=request_data)
+
+
+    
+    @endpoint
+    def delete_kpi(self, kpi_id, product_id):
+        """
+        delete_kpi(kpi_id, product_id)
+
+        Delete a key performance indicator (KPI)
+
+      :Parameters:
+      * *kpi_id* (`string`) -- The KPI identifier (unique per product)
+
+        """
+        return self._call_endpoint('delete_kpi', kpi_id=kpi_id, product_id=product_id)
+
+
+    @endpoint
+    def get_kpi(self, kpi_id, product_id):
+        """
+        get_kpi(kpi_id, product_id)
+
+        Get KPI information
+
+      :Parameters:
+      * *kpi_id* (`string`) -- The KPI identifier (unique per product)
+      * *product_id* (`string`) -- The product identifier
+
+      """
+        return self._call_endpoint('get_kpi', kpi_id=kpi_id, product_id=product_id)
+
+
+    #### Features ####
+
+    @endpoint
+    def search_features(self, start=0, limit=100, filter={}):
+        """
+        search_features(start=0, limit=100, filter={}, **kwargs)
+
+        Search Features
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'modify database'}
+           search_result = opereto_client.search_features(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_features', data=request_data)
+
+
+    @endpoint
+    def create_feature(self, feature_id, product_id, exec_status, feature_data=None, feature_set=[], pid=None, **kwargs):
+        """
+        create_feature('my_feature', 'my_product', 'succeess', feature_data='', feature_set=['feature1', 'feature2'])
+
+        Creates a new feature entry. Return the new feature entry identifier in database (feature_uuid)
+
+      :Parameters:
+        * *feature_id* (`string`) -- The KPI identifier (unique per product)
+        * *product_id* (`string`) -- The product (release candidate) identifier
+        * *exec_status* (`list`) -- Execution status. Any of the following: 'success', 'failure', 'error', 'timeout', 'terminated', 'warning'
+        * *feature_data* (`string`) -- Any text value associated with this feature
+        * *feature_set* (`list`) -- list of features associated with above feature id (optional)
+        * *pid* (`string`) -- Identifier of an existing process (optional, if not provided, current process id will be used)
+        """
+
+        pid = self._get_pid(pid)
+        request_data = {'feature_id': feature_id, 'product_id': product_id, 'exec_status': exec_status, 'feature_data': feature_data, 'feature_set':feature_set, 'process_id': pid}
+        return self._call_endpoint('create_feature', data=request_data)
+
+
+    #### Dimensions ####
+
+    @endpoint
+    def search_dimensions(self, start=0, limit=100, filter={}):
+        """
+        search_dimensions(start=0, limit=100, filter={}, **kwargs)
+
+        Search Dimensions
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my dimention'}
+           search_result = opereto_client.search_dimensions(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_dimensions', data=request_data)
+
+
+    @endpoint
+    def modify_dimension(self, dimension_id, name=None, description=None, dimention_tree={}, **kwargs):
+        """
+        modify_dimension(dimension_id, name=None, description=None, dimention_tree={}, **kwargs)
+
+        Create a new dimension
+
+        :Parameters:
+
+        * *dimension_id* (`string`) -- The dimension identifier
+        * *name* (`string`) -- dimension display name (optional)
+        * *description* (`string`) -- dimension description (optional)
+        * *dimention_tree* (`object`) -- A json representing the dimention features tree
+
+        :return: id of the created feature
+
+        """
+
+        request_data = {'id': dimension_id, 'name': name, 'description': description, 'tree': dimention_tree}
+        request_data.update(**kwargs)
+        return self._call_endpoint('modify_dimension', data=request_data)
+
+
+    @endpoint
+    def delete_dimension(self, dimension_id):
+        """
+        delete_dimension(dimension_id)
+
+        Delete a dimension
+
+        :Parameters:
+        * *dimension_id* (`string`) -- The dimension identifier
+
+        """
+        return self._call_endpoint('delete_dimension', dimension_id=dimension_id)
+
+    @endpoint
+    def get_dimension(self, dimension_id):
+        """
+        get_dimension(dimension_id)
+
+        Get a given dimension information
+
+        :Parameters:
+        * *dimension_id* (`string`) -- The dimension identifier
+
+        """
+        return self._call_endpoint('get_dimension', dimension_id=dimension_id)
+
+
+
+    #### TESTS ####
+    @endpoint
+    def search_tests(self, start=0, limit=100, filter={}):
+        """
+        search_tests(start=0, limit=100, filter={})
+
+        Search tests
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in tests data)
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my test param'}
+           search_result = opereto_client.search_tests(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_tests', data=request_data)
+
+
+
+    @endpoint
+    def get_test(self, test_id):
+        """
+        get_test(test_id)
+
+        Get test information.
+
+        :Parameters:
+        * *test_id* (`string`) -- The Test identifier
+
+        """
+        return self._call_endpoint('get_test', test_id=test_id)
+
+
+    #### QUALITY CRITERIA ####
+    @endpoint
+    def search_qc(self, start=0, limit=100, filter={}):
+        """
+        search_qc(start=0, limit=100, filter={})
+
+        Search Quality criteria
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in QC data)
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my qc'}
+           search_result = opereto_client.search_qc(filter=filter)
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_qc', data=request_data)
+
+    @endpoint
+    def get_qc(self, qc_id):
+        """
+        get_qc(qc_id)
+
+        Get criteria information.
+
+        :Parameters:
+        * *qc_id* (`string`) -- The QC identifier
+
+        """
+        return self._call_endpoint('get_qc', qc_id=qc_id)
+
+    @endpoint
+    def create_qc(self, product_id=None, expected_result='', actual_result='', weight=100, status='success', **kwargs):
+        """
+        create_qc(product_id=None, expected_result='', actual_result='', weight=100, status='success', **kwargs)
+
+        Create Quality Criteria
+
+        :Parameters:
+        * *product_id* (`string`) -- The product (release candidate) identifier
+        * *expected_result* (`string`) -- Text describing the expected result of this criteria
+        * *actual_result* (`string`) --  Text describing the actual result of this criteria
+        * *weight* (`integer`) -- Overall weight of this criteria (integer between 0-100)
+        * *status* (`string`) -- pass/fail/norun
+
+        """
+        request_data = {'product_id': product_id, 'expected': expected_result, 'actual': actual_result,'weight': weight, 'exec_status': status}
+        request_data.update(**kwargs)
+        return self._call_endpoint('create_qc', data=request_data)
+
+    
+    @endpoint
+    def modify_qc(self, qc_id=None, **kwargs):
+        """
+        modify_qc(qc_id=None, **kwargs)
+
+        Modify a Quality Criteria
+
+        :Parameters:
+        * *qc_id* (`string`) -- The Quality criteria identifier
+
+        """
+        if qc_id:
+            request_data = {'id': qc_id}
+            request_data.update(**kwargs)
+            return self._call_endpoint('modify_qc', data=request_data)
+        else:
+            return self.create_qc(**kwargs)
+
+
+    
+    @endpoint
+    def delete_qc(self, qc_id):
+        """
+        delete_qc(qc_id)
+
+        Delete a quality criteria.
+
+        :Parameters:
+        * *qc_id* (`string`) -- The Quality criteria identifier
+
+        """
+        return self._call_endpoint('delete_qc', qc_id=qc_id)
+
+
+
+    #### USERS ####
+    @endpoint
+    def search_users(self, start=0, limit=100, filter={}):
+        """
+        search_users(start=0, limit=100, filter={})
+
+        Search users
+
+        :Parameters:
+        * *start* (`int`) -- start index to retrieve from. Default is 0
+        * *limit* (`int`) -- maximum number of entities to retrieve. Default is 100
+        * *filter* (`object`) -- free text search pattern (checks in Users data)
+
+        :return: List of search results or empty list
+
+        :Example:
+        .. code-block:: python
+
+           filter = {'generic': 'my user'}
+           search_result = opereto_client.search_users(filter=filter)
+
+        """
+        request_data = {'start': start, 'limit': limit, 'filter': filter}
+        return self._call_endpoint('search_users', data=request_data)
+
+
+    @endpoint
+    def upload_datastore(self, pid, datastore_id, zip_file, **kwargs):
+        return self._upload_endpoint('upload_datastore', zip_file, pid=pid, datastore_id=datastore_id)
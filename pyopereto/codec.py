@@ -0,0 +1,62 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec(object):
+    """
+    Encodes request data and decodes response bodies using the standard library json module.
+    Responses are decoded directly from their raw bytes, skipping requests charset detection.
+    """
+
+    name = 'json'
+
+    def dumps(self, data):
+        return json.dumps(data)
+
+    def loads(self, content):
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return json.loads(content)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec based on orjson, used by default when orjson is installed.
+    """
+
+    name = 'orjson'
+
+    def dumps(self, data):
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, content):
+        return orjson.loads(content)
+
+
+CODECS = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec
+}
+
+
+def get_codec(codec=None):
+    """
+    Returns the JSON codec to be used by a client.
+
+    :Parameters:
+    * *codec* -- A codec name ('json' or 'orjson') or a JsonCodec instance. Default is orjson if installed, otherwise json
+    """
+    if codec is None:
+        codec = 'orjson' if orjson is not None else 'json'
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec == 'orjson' and orjson is None:
+        raise ValueError('The orjson codec requires the orjson package to be installed')
+    try:
+        return CODECS[codec]()
+    except KeyError:
+        raise ValueError('Unknown json codec [%s], must be one of %s' % (codec, sorted(CODECS)))
@@ -13,17 +13,21 @@ Usage:
   opereto services deploy <service-directory> [--service-version=VERSION] [--service-name=NAME | --recursive] [--comment=COMMENT]
   opereto services run <service-name> [--agent=AGENT] [--title=TITLE]  [--params=JSON_PARAMS] [--service-version=VERSION] [--async]
   opereto services delete <service-name> [--service-version=VERSION]
-  opereto services info <service-name> [--service-version=VERSION]
-  opereto services versions <service-name>
-  opereto version list <service-version>
+  opereto services info <service-name> [--service-version=VERSION] [--no-cache]
+  opereto services versions <service-name> [--no-cache]
+  opereto version list <service-version> [--no-cache]
   opereto version delete <service-version>
-  opereto process <pid> [--info] [--properties] [--log] [--rca] [--flow] [--all]
+  opereto process <pid> [--info] [--properties] [--log] [--rca] [--flow] [--all] [--no-cache]
   opereto process rerun <pid> [--title=TITLE] [--agent=AGENT] [--async]
   opereto agents list [<search_pattern>]
   opereto environments list [<search_pattern>]
-  opereto environment <environment-name>
+  opereto environment <environment-name> [--no-cache]
   opereto globals list [<search_pattern>]
   opereto token
+  opereto trace analyze <trace-file> [--top=N]
+  opereto shell
+  opereto daemon start [--idle-timeout=SECONDS]
+  opereto daemon (stop | status)
   opereto (-h | --help)
   opereto --version
 
@@ -64,35 +68,39 @@ Options:
                           (e.g all child processes that caused the failure)
     --all                : Print all process data entities
 
+    --no-cache           : Do not use the responses cached in ~/.pyopereto/cache (responses are cached when
+                           the server provides validators and revalidated with If-None-Match/If-Modified-Since)
+
     token                : Show the current token details
+
+    trace-file           : Call trace file recorded by the client trace option (or the opereto_trace_file environment variable)
+    --top=N              : Number of endpoints, N+1 patterns and polled processes to report [default: 10]
+
+    shell                : Interactive shell running CLI commands (without the opereto prefix) with a warm client
+    daemon               : Background daemon on a local Unix socket (~/.pyopereto/daemon.sock, or the
+                           opereto_daemon_socket environment variable). While it runs, opereto commands are
+                           forwarded to it and reuse its client connections, session and caches
+                           (set opereto_no_daemon to run a command locally)
+    --idle-timeout=SECONDS  : Stop the daemon after this number of seconds without commands [default: 3600]
+
     -h,--help            : Show this help message
     --version            : Show this tool version
 """
 
 import os, sys
-sys.path.append('/Users/drorrusso/opereto/pyopereto')
-
-import uuid
-import shutil
-import yaml
 import json
-from os.path import expanduser
-import logging.config
 import time
 import signal
-import pkg_resources
 import tempfile
 import subprocess
+import shlex
 import re
 import traceback
+import logging
+import threading
+from os.path import expanduser
 from docopt import docopt
-from distutils.version import LooseVersion
-from pyopereto.client import OperetoClient, OperetoClientError, process_running_statuses
 
-try:
-    VERSION = pkg_resources.get_distribution("pyopereto").version
-except:
-    VERSION=''
 
 class OperetoCliError(Exception):
 
@@ -107,62 +115,131 @@ class OperetoCliError(Exception):
         return self.message
 
 
-logging.config.dictConfig({
-    'version': 1,
-    'formatters': {
-        'colored': {
-            '()': 'colorlog.ColoredFormatter',
-            'format':
-                "%(log_color)s%(message)s",
-        }
-    },
-    'handlers': {
-        'stream': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'colored',
-            'level': 'DEBUG'
+def _configure_logging():
+    import logging.config
+    logging.config.dictConfig({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'colored': {
+                '()': 'colorlog.ColoredFormatter',
+                'format':
+                    "%(log_color)s%(message)s",
+            }
         },
-    },
-    'loggers': {
-        '': {
-            'handlers': ['stream'],
-            'level': 'DEBUG',
+        'handlers': {
+            'stream': {
+                'class': 'logging.StreamHandler',
+                'formatter': 'colored',
+                'level': 'DEBUG'
+            },
         },
-    },
-})
+        'loggers': {
+            '': {
+                'handlers': ['stream'],
+                'level': 'DEBUG',
+            },
+        },
+    })
 
 logger = logging.getLogger('OperetoCliTool')
-TEMP_DIR = tempfile.gettempdir()
 HOME_DIR = expanduser("~")
 work_dir = os.getcwd()
 
 
-RUNNING_PROCESS = None
+class _CommandState(threading.local):
+    # state of the command running in the current thread (the daemon runs several commands at once)
+    use_cache = True
+    running_process = None
+
+_command = _CommandState()
 
 pyopereto_latest_version_file = os.path.join(HOME_DIR,'.pyopereto.latest')
-opereto_config_file = os.path.join(HOME_DIR,'opereto.yaml')
-if not os.path.exists(opereto_config_file):
-    opereto_config_file = 'arguments.yaml'
-if not os.path.exists(opereto_config_file):
-    raise Exception('Could not find opereto credentials file')
+pyopereto_cache_dir = os.path.join(HOME_DIR, '.pyopereto', 'cache')
+UPGRADE_CHECK_INTERVAL = 12*3600
+
+_config = {}
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_version():
+    """
+    Returns the installed pyopereto version, or an empty string if unknown.
+    """
+    try:
+        from importlib.metadata import version
+    except ImportError:
+        pass
+    else:
+        try:
+            return version('pyopereto')
+        except Exception:
+            return ''
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution('pyopereto').version
+    except Exception:
+        return ''
+
+
+def _version_key(version):
+    return tuple(int(part) for part in re.findall(r'\d+', version))
+
+
+def get_opereto_config_file():
+    opereto_config_file = os.path.join(HOME_DIR,'opereto.yaml')
+    if not os.path.exists(opereto_config_file):
+        opereto_config_file = 'arguments.yaml'
+    if not os.path.exists(opereto_config_file):
+        raise OperetoCliError('Could not find opereto credentials file')
+    return opereto_config_file
 
-opereto_credentials_json = {}
-with open(opereto_config_file, 'r') as f:
-    opereto_credentials_json = yaml.load(f.read(), Loader=yaml.FullLoader)
 
-OPERETO_HOST = opereto_credentials_json['opereto_host']
+def _config_key():
+    opereto_config_file = os.path.abspath(get_opereto_config_file())
+    return opereto_config_file, os.path.getmtime(opereto_config_file)
+
+
+def get_opereto_config():
+    """
+    Returns the opereto credentials, read from ~/opereto.yaml (or arguments.yaml) when first needed, and again
+    when the file changes.
+    """
+    key = _config_key()
+    if key not in _config:
+        import yaml
+        with open(key[0], 'r') as f:
+            _config[key] = yaml.load(f.read(), Loader=yaml.FullLoader)
+    return _config[key]
+
+
+def get_opereto_host():
+    return get_opereto_config()['opereto_host']
 
 
 ### TBD - Remove basic auth after migration to OAUTH2.0
 def get_opereto_client():
-    try:
-        OPERETO_AUTH_TOKEN = opereto_credentials_json['opereto_auth_token']
-        client = OperetoClient(opereto_host=OPERETO_HOST, opereto_auth_token=OPERETO_AUTH_TOKEN)
-    except KeyError:
-        opereto_user = opereto_credentials_json['opereto_user']
-        opereto_password = opereto_credentials_json['opereto_password']
-        client = OperetoClient(opereto_host=OPERETO_HOST, opereto_user=opereto_user, opereto_password=opereto_password)
-    return client
+    """
+    Returns the client of the CLI commands, created once per process for each credentials file (and cache mode).
+    A new client is created when the credentials file changes.
+    """
+    key = _config_key() + (_command.use_cache,)
+    with _clients_lock:
+        if key in _clients:
+            return _clients[key]
+        from pyopereto.client import OperetoClient
+        opereto_credentials_json = get_opereto_config()
+        disk_cache = pyopereto_cache_dir if _command.use_cache else None
+        try:
+            OPERETO_AUTH_TOKEN = opereto_credentials_json['opereto_auth_token']
+            client = OperetoClient(opereto_host=get_opereto_host(), opereto_auth_token=OPERETO_AUTH_TOKEN, disk_cache=disk_cache)
+        except KeyError:
+            opereto_user = opereto_credentials_json['opereto_user']
+            opereto_password = opereto_credentials_json['opereto_password']
+            client = OperetoClient(opereto_host=get_opereto_host(), opereto_user=opereto_user, opereto_password=opereto_password, disk_cache=disk_cache)
+        _clients[key] = client
+        return client
 
 
 def print_token(params):
@@ -171,7 +248,14 @@ def print_token(params):
 
 def local(cmd, working_directory=os.getcwd()):
     print(cmd)
-    p = subprocess.Popen(cmd, cwd=working_directory)
+    if sys.stdout is sys.__stdout__:
+        p = subprocess.Popen(cmd, cwd=working_directory)
+    else:
+        # sys.stdout is redirected (e.g. to the invoking CLI by the daemon): the command output is relayed through it
+        p = subprocess.Popen(cmd, cwd=working_directory, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        for line in iter(p.stdout.readline, b''):
+            sys.stdout.write(line.decode('utf-8', 'replace'))
+        p.stdout.close()
     retval = p.wait()
     return int(retval)
 
@@ -195,13 +279,14 @@ def get_process_rca(pid):
 
 
 def zipfolder(zipname, target_dir):
+    import uuid, shutil
     try:
         remove_service_dir=False
         stripped_target_dir = target_dir.rstrip("/")
         service_deploy_config_file = os.path.join(stripped_target_dir, 'service.deploy.json')
         temp_service_directory = stripped_target_dir
         if os.path.exists(service_deploy_config_file):
-            temp_service_directory = os.path.join(TEMP_DIR, str(uuid.uuid4()))
+            temp_service_directory = os.path.join(tempfile.gettempdir(), str(uuid.uuid4()))
             remove_service_dir=True
             shutil.copytree(stripped_target_dir, temp_service_directory)
             with open(service_deploy_config_file, 'r') as deploy_config:
@@ -245,6 +330,7 @@ def zipfolder(zipname, target_dir):
 
 
 def deploy(params):
+    import uuid
     client = get_opereto_client()
     operations_mode = 'development'
     if params['services']:
@@ -255,7 +341,7 @@ def deploy(params):
     def deploy_service(service_directory, service_name=None):
         service_name = service_name or os.path.basename(os.path.normpath(service_directory))
         try:
-            zip_action_file = os.path.join(TEMP_DIR, str(uuid.uuid4())+'.action')
+            zip_action_file = os.path.join(tempfile.gettempdir(), str(uuid.uuid4())+'.action')
             zip_action_file_with_ext = zip_action_file + '.zip'
             zipfolder(zip_action_file, service_directory)
             file_size = os.stat(zip_action_file_with_ext).st_size
@@ -303,7 +389,6 @@ def deploy(params):
 
 def rerun(params):
 
-    global RUNNING_PROCESS
     client = get_opereto_client()
     old_pid = params['<pid>']
     agent = params['--agent']
@@ -312,20 +397,19 @@ def rerun(params):
     print('Re-running process [%s]..'%pid)
 
     if not params['--async']:
-        RUNNING_PROCESS = pid
+        _command.running_process = pid
         status = wait_and_print_log(pid)
-        RUNNING_PROCESS=None
+        _command.running_process = None
         if status=='success':
             logger.info('Process ended with status: success')
         else:
             raise OperetoCliError('Process ended with status: %s'%status)
             get_process_rca(pid)
-    print('View process flow at: {}/ui#dashboard/flow/{}'.format(OPERETO_HOST, pid))
+    print('View process flow at: {}/ui#dashboard/flow/{}'.format(get_opereto_host(), pid))
 
 
 def run(params):
 
-    global RUNNING_PROCESS
     client = get_opereto_client()
     operations_mode = 'development'
     if params['services']:
@@ -347,20 +431,21 @@ def run(params):
         print('A new development process for service [%s] has been created: pid=%s'%(params['<service-name>'], pid))
 
     if not params['--async']:
-        RUNNING_PROCESS = pid
+        _command.running_process = pid
         status = wait_and_print_log(pid)
-        RUNNING_PROCESS=None
+        _command.running_process = None
         if status=='success':
             logger.info('Process ended with status: success')
         else:
             raise OperetoCliError('Process ended with status: %s'%status)
             get_process_rca(pid)
-    print('View process flow at: {}/ui#dashboard/flow/{}'.format(OPERETO_HOST, pid))
+    print('View process flow at: {}/ui#dashboard/flow/{}'.format(get_opereto_host(), pid))
 
 
 def local_dev(params):
 
     service_dir = get_service_directory(params['<service-directory>'])
+    import yaml
     with open(os.path.join(params['<service-directory>'], 'service.yaml'), 'r') as f:
         spec = yaml.load(f.read(), Loader=yaml.FullLoader)
     if spec['type'] in ['cycle', 'container', 'builtin', 'record', 'testplan']:
@@ -414,8 +499,8 @@ def local_dev(params):
 
         # prepare arguments json
         arguments_json = builtin_params
-        with open(opereto_config_file, 'r') as arguments_file:
-            arguments_json.update(yaml.load(arguments_file.read(), Loader=yaml.FullLoader))
+        # the credentials of the client (the file is not read again)
+        arguments_json.update(get_opereto_config())
         if spec.get('item_properties'):
             for item in spec['item_properties']:
                 value = item['value']
@@ -439,7 +524,7 @@ def local_dev(params):
         ## Add environment vars if exists (TBD)
 
         logger.info('Argument files in service directory [{}] have been created.'.format(service_dir))
-        print('\nIn case you are developing a flow, you can view the created sub processes at:\n{}/ui#dashboard/flow/{}'.format(OPERETO_HOST, ppid))
+        print('\nIn case you are developing a flow, you can view the created sub processes at:\n{}/ui#dashboard/flow/{}'.format(get_opereto_host(), ppid))
 
 
 def delete(params):
@@ -584,6 +669,7 @@ def list_services_version(arguments):
         logger.error('No services found for version {}.'.format(arguments['<service-version>']))
 
 def get_service_info(arguments):
+    import yaml
     logger.info('Details of service {}:'.format(arguments['<service-name>']))
     client = get_opereto_client()
     version=arguments['--service-version'] or 'default'
@@ -622,6 +708,7 @@ def _print_log_entries(pid, s):
 def wait_and_print_log(pid):
     client = get_opereto_client()
     start=0
+    from pyopereto.client import process_running_statuses
     while(True):
         status = client.get_process_status(pid)
         new_start = _print_log_entries(pid, start)
@@ -672,89 +759,231 @@ def get_process(arguments):
         raise OperetoCliError('Please specify one if more process data items to retrieve (e.g. --info, --log).')
 
 
-def _check_for_upgrade():
+def analyze_trace(arguments):
+    from pyopereto.trace import read_trace, analyze_trace as _analyze_trace, format_trace_report
+    trace_file = arguments['<trace-file>']
+    if not os.path.exists(trace_file):
+        raise OperetoCliError('Trace file {} does not exist.'.format(trace_file))
+    report = _analyze_trace(read_trace(trace_file), top=int(arguments['--top']))
+    print(format_trace_report(report))
 
-    try:
 
-        def _check_latest_version():
-            if VERSION!='':
-                with open(pyopereto_latest_version_file, 'r') as latest_version:
-                    latest = latest_version.read()
-                    if latest:
-                        if LooseVersion(latest)>LooseVersion(VERSION):
-                            logger.warning('A newer version of pyopereto exists (v{}). Please upgrade using pip.'.format(latest))
+def update_latest_version():
+    """
+    Stores the latest pyopereto version released on PyPI in ~/.pyopereto.latest.
+    """
+    import requests
+    response = requests.get('https://pypi.org/pypi/pyopereto/json', timeout=10)
+    if response.status_code<299:
+        latest_version = max(response.json()['releases'].keys(), key=_version_key)
+        with open(pyopereto_latest_version_file, 'w') as latest_version_file:
+            latest_version_file.write(latest_version)
 
-        def _update_latest_version():
-            with open(pyopereto_latest_version_file, 'w') as latest_version_file:
-                client = get_opereto_client()
-                all_releases = client._get_client_releases()
-                latest_version = max(LooseVersion(s) for s in all_releases)
-                latest_version_file.write(str(latest_version))
 
-        if not os.path.exists(pyopereto_latest_version_file):
-            _update_latest_version()
-        elif time.time()>os.path.getmtime(pyopereto_latest_version_file)+12*3600:
-            _update_latest_version()
+def _refresh_latest_version():
+    # touch the file first, so that CLI invocations in a tight loop start a single refresh
+    with open(pyopereto_latest_version_file, 'a'):
+        pass
+    os.utime(pyopereto_latest_version_file, None)
+    detach = {'start_new_session': True} if sys.version_info[0] >= 3 else {'preexec_fn': getattr(os, 'setsid', None)}
+    with open(os.devnull, 'w') as devnull:
+        subprocess.Popen([sys.executable, '-c', 'from pyopereto.command_line import update_latest_version; update_latest_version()'],
+                         stdin=devnull, stdout=devnull, stderr=devnull, close_fds=True, **detach)
 
-        _check_latest_version()
+
+def _check_for_upgrade():
+    """
+    Warns if the latest known pyopereto release is newer than the installed one. The latest release is
+    refreshed from PyPI by a detached background process every 12 hours, so the command is never delayed.
+    """
+    try:
+        if os.path.exists(pyopereto_latest_version_file):
+            with open(pyopereto_latest_version_file, 'r') as latest_version:
+                latest = latest_version.read().strip()
+            version = get_version()
+            if latest and version and _version_key(latest)>_version_key(version):
+                logger.warning('A newer version of pyopereto exists (v{}). Please upgrade using pip.'.format(latest))
+            if time.time()<=os.path.getmtime(pyopereto_latest_version_file)+UPGRADE_CHECK_INTERVAL:
+                return
+        _refresh_latest_version()
 
     except Exception as e:
         logger.error('Failed to check for latest pyopereto version: {}'.format(str(e)))
 
 
+def run_command(arguments):
+    if arguments['sandbox'] and arguments['list']:
+        list_development_sandbox()
+    elif arguments['services'] and arguments['list']:
+        list_services(arguments)
+    elif arguments['services'] and arguments['info']:
+        get_service_info(arguments)
+    elif arguments['services'] and arguments['versions']:
+        get_service_versions(arguments)
+    elif arguments['trace'] and arguments['analyze']:
+        analyze_trace(arguments)
+    elif arguments['process'] and arguments['rerun']:
+        rerun(arguments)
+    elif arguments['process']:
+        get_process(arguments)
+    elif arguments['version']:
+        if arguments['delete']:
+            delete_services_version(arguments)
+        elif arguments['list']:
+            list_services_version(arguments)
+    elif arguments['agents'] and arguments['list']:
+        list_agents(arguments)
+    elif arguments['globals'] and arguments['list']:
+        list_globals(arguments)
+    elif arguments['environments'] and arguments['list']:
+        list_environments(arguments)
+    elif arguments['environment']:
+        get_environment(arguments)
+    elif arguments['sandbox'] and arguments['purge']:
+        purge_development_sandbox()
+    elif arguments['deploy']:
+        deploy(arguments)
+    elif arguments['run']:
+        run(arguments)
+    elif arguments['delete']:
+        delete(arguments)
+    elif arguments['local']:
+        local_dev(arguments)
+    elif arguments['token']:
+        print_token(arguments)
+
+
+def execute(argv):
+    """
+    Runs a CLI command in the current process, reusing its client (used by the shell and the daemon).
+    Returns the command exit code.
+    """
+    _command.running_process = None
+    try:
+        arguments = docopt(__doc__, argv=argv)
+    except SystemExit as e:
+        # usage error (or --help, already printed)
+        if e.code:
+            sys.stderr.write('%s\n' % e.code)
+            return 1
+        return 0
+    if arguments['--version']:
+        print('Opereto CLI Tool v%s'%get_version())
+        return 0
+    if arguments['shell'] or arguments['daemon']:
+        logger.error('The shell and daemon commands cannot be run from the shell or the daemon.')
+        return 1
+    _command.use_cache = not arguments['--no-cache']
+    try:
+        run_command(arguments)
+    except Exception as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+def shell():
+    """
+    Interactive shell: reads CLI commands (without the opereto prefix) and runs them with the same client,
+    so that connections, session and caches stay warm between commands.
+    """
+    try:
+        # imported for its side effect: line editing and history in input()
+        __import__('readline')
+    except ImportError:
+        pass
+    try:
+        read_line = raw_input
+    except NameError:
+        read_line = input
+    print('Opereto CLI shell. Type a command (e.g. process <pid> --info), help or exit.')
+    while True:
+        try:
+            line = read_line('opereto> ')
+        except EOFError:
+            print('')
+            break
+        except KeyboardInterrupt:
+            print('')
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            logger.error(str(e))
+            continue
+        if argv and argv[0] == 'opereto':
+            argv = argv[1:]
+        if not argv:
+            continue
+        if argv[0] in ['exit', 'quit']:
+            break
+        if argv[0] == 'help':
+            argv = ['--help']
+        try:
+            execute(argv)
+        except KeyboardInterrupt:
+            sys.stderr.write('\nAborted.\n')
+            if _command.running_process:
+                get_opereto_client().stop_process(_command.running_process, status='terminated')
+
+
+def daemon(arguments):
+    from pyopereto.cli_daemon import start_daemon, stop_daemon, daemon_status
+    if arguments['start']:
+        status = start_daemon(idle_timeout=float(arguments['--idle-timeout']))
+        print('Opereto daemon is running (pid {}, socket {})'.format(status['pid'], status['socket']))
+    elif arguments['stop']:
+        if not stop_daemon():
+            raise OperetoCliError('Opereto daemon is not running')
+        print('Opereto daemon stopped')
+    else:
+        status = daemon_status()
+        if not status:
+            raise OperetoCliError('Opereto daemon is not running')
+        print(json.dumps(status, indent=4, sort_keys=True))
+
+
+def _forward_to_daemon(argv):
+    """
+    Forwards the command to the opereto daemon if one is running. Returns the exit code, or None.
+    """
+    if not argv or argv[0] in ['shell', 'daemon', '-h', '--help', '--version'] or os.environ.get('opereto_no_daemon'):
+        return None
+    from pyopereto.cli_daemon import forward
+    return forward(argv)
+
+
 def main():
 
+    arguments = docopt(__doc__)
+    if arguments['--version']:
+        print('Opereto CLI Tool v%s'%get_version())
+        return
+    _configure_logging()
     _check_for_upgrade()
 
-    arguments = docopt(__doc__, version='Opereto CLI Tool v%s'%VERSION)
+    exit_code = _forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    _command.use_cache = not arguments['--no-cache']
     def ctrlc_signal_handler(s, f):
-        if arguments['run'] and RUNNING_PROCESS:
+        if arguments['run'] and _command.running_process:
             sys.stderr.write('\nYou pressed Ctrl-C. Stopping running processes and aborting..')
             client = get_opereto_client()
-            client.stop_process(RUNNING_PROCESS, status='terminated')
+            client.stop_process(_command.running_process, status='terminated')
         else:
             sys.stderr.write('\nYou pressed Ctrl-C. Aborting..')
         os.kill(os.getpid(), signal.SIGTERM)
 
     try:
-        signal.signal(signal.SIGINT, ctrlc_signal_handler)
-        if arguments['sandbox'] and arguments['list']:
-            list_development_sandbox()
-        elif arguments['services'] and arguments['list']:
-            list_services(arguments)
-        elif arguments['services'] and arguments['info']:
-            get_service_info(arguments)
-        elif arguments['services'] and arguments['versions']:
-            get_service_versions(arguments)
-        elif arguments['process'] and arguments['rerun']:
-            rerun(arguments)
-        elif arguments['process']:
-            get_process(arguments)
-        elif arguments['version']:
-            if arguments['delete']:
-                delete_services_version(arguments)
-            elif arguments['list']:
-                list_services_version(arguments)
-        elif arguments['agents'] and arguments['list']:
-            list_agents(arguments)
-        elif arguments['globals'] and arguments['list']:
-            list_globals(arguments)
-        elif arguments['environments'] and arguments['list']:
-            list_environments(arguments)
-        elif arguments['environment']:
-            get_environment(arguments)
-        elif arguments['sandbox'] and arguments['purge']:
-            purge_development_sandbox()
-        elif arguments['deploy']:
-            deploy(arguments)
-        elif arguments['run']:
-            run(arguments)
-        elif arguments['delete']:
-            delete(arguments)
-        elif arguments['local']:
-            local_dev(arguments)
-        elif arguments['token']:
-            print_token(arguments)
+        if arguments['shell']:
+            shell()
+        elif arguments['daemon']:
+            daemon(arguments)
+        else:
+            signal.signal(signal.SIGINT, ctrlc_signal_handler)
+            run_command(arguments)
 
     except Exception as e:
         logger.error(str(e))
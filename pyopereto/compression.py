@@ -0,0 +1,103 @@
+import gzip
+import threading
+from pyopereto.transport import OperetoTransportWrapper
+
+DEFAULT_COMPRESS_LEVEL = 6
+
+
+class CompressionStats(object):
+    """
+    Counters of the raw and on-the-wire bytes of the requests and responses of a client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.compressed_requests = 0
+        self.request_raw_bytes = 0
+        self.request_sent_bytes = 0
+        self.responses = 0
+        self.compressed_responses = 0
+        self.response_raw_bytes = 0
+        self.response_received_bytes = 0
+
+    def add_request(self, raw_bytes, sent_bytes):
+        with self._lock:
+            self.requests += 1
+            if sent_bytes != raw_bytes:
+                self.compressed_requests += 1
+            self.request_raw_bytes += raw_bytes
+            self.request_sent_bytes += sent_bytes
+
+    def add_response(self, raw_bytes, received_bytes, compressed):
+        with self._lock:
+            self.responses += 1
+            if compressed:
+                self.compressed_responses += 1
+            self.response_raw_bytes += raw_bytes
+            self.response_received_bytes += received_bytes
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'compressed_requests': self.compressed_requests,
+                'request_raw_bytes': self.request_raw_bytes,
+                'request_sent_bytes': self.request_sent_bytes,
+                'responses': self.responses,
+                'compressed_responses': self.compressed_responses,
+                'response_raw_bytes': self.response_raw_bytes,
+                'response_received_bytes': self.response_received_bytes
+            }
+
+
+class GzipTransport(OperetoTransportWrapper):
+    """
+    Gzips request bodies of at least *threshold* bytes and asks the server for gzip encoded responses.
+
+    | Enabled with the compress_threshold client option. Multipart uploads are sent as is.
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(compress_threshold=16*1024)
+       opereto_client.send_process_log(pid, log_entries)
+       print(opereto_client.compression_stats)
+    """
+
+    def __init__(self, inner, threshold=0, level=None):
+        super(GzipTransport, self).__init__(inner)
+        self.threshold = threshold
+        self.level = level or DEFAULT_COMPRESS_LEVEL
+        self.stats = CompressionStats()
+
+    def _compress(self, data, headers):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        raw_bytes = len(data)
+        if raw_bytes >= self.threshold:
+            data = gzip.compress(data, compresslevel=self.level)
+            headers['Content-Encoding'] = 'gzip'
+        self.stats.add_request(raw_bytes, len(data))
+        return data
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        headers = dict(headers or {})
+        headers.setdefault('Accept-Encoding', 'gzip')
+        if data is not None and not files and isinstance(data, (str, bytes)):
+            data = self._compress(data, headers)
+        r = self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+        raw_bytes = len(r.content)
+        compressed = (r.headers.get('Content-Encoding') or '').lower() == 'gzip'
+        received_bytes = raw_bytes
+        if compressed and r.headers.get('Content-Length'):
+            received_bytes = int(r.headers['Content-Length'])
+        self.stats.add_response(raw_bytes, received_bytes, compressed)
+        return r
+
+    def reset_after_fork(self):
+        self.stats.reset_after_fork()
+        super(GzipTransport, self).reset_after_fork()
@@ -0,0 +1,170 @@
+import time
+import threading
+import requests
+from pyopereto.exceptions import OperetoClientError
+from pyopereto.transport import OperetoTransportWrapper
+from pyopereto.context import current_call
+
+
+class AIMDLimiter(object):
+    """
+    Adaptive limit of the number of requests in flight (additive increase, multiplicative decrease).
+
+    | The limit grows by *increase* for every *limit* successful requests, and is multiplied by *decrease* on
+    | server errors (5xx), throttling (429), timeouts and latency spikes (a latency of more than *latency_factor*
+    | times the smoothed latency of the same endpoint, so slow calls such as searches are not compared to fast status
+    | polls). The limit is decreased at most once per smoothed latency period, so a burst of failures of requests sent
+    | together counts once.
+
+    :Parameters:
+    * *initial_limit* (`int`) -- Starting limit. Default is 20
+    * *min_limit* (`int`) -- Minimum limit. Default is 1
+    * *max_limit* (`int`) -- Maximum limit. Default is 200
+    * *increase* (`float`) -- Additive increase per limit successful requests. Default is 1
+    * *decrease* (`float`) -- Multiplicative decrease factor. Default is 0.5
+    * *latency_factor* (`float`) -- Latency spike threshold, relative to the smoothed latency. Default is 3, None disables it
+    * *smoothing* (`float`) -- Weight of a new sample in the smoothed latency. Default is 0.1
+    """
+
+    def __init__(self, initial_limit=20, min_limit=1, max_limit=200, increase=1, decrease=0.5, latency_factor=3, smoothing=0.1):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.smoothing = smoothing
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.latency = None
+        self.latencies = {}
+        self.last_decrease = 0
+        self.increases = 0
+        self.decreases = 0
+        self.queued = 0
+        self.urgent_queued = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None, urgent=False):
+        """
+        Waits for a request slot. Returns False if none is available within *timeout* seconds.
+        Urgent requests (control calls) get the free slots before the others.
+        """
+        end = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            self.queued += 1
+            if urgent:
+                self.urgent_queued += 1
+            try:
+                while self.in_flight >= int(self.limit) or (not urgent and self.urgent_queued):
+                    remaining = end - time.time() if end is not None else None
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                return True
+            finally:
+                self.queued -= 1
+                if urgent:
+                    self.urgent_queued -= 1
+                    self._cond.notify_all()
+
+    def release(self, latency=None, overloaded=False, endpoint=None):
+        """
+        Frees a request slot and adjusts the limit according to the outcome of the request of the given endpoint.
+        The limit is left as is when neither a latency nor an overload is reported (e.g. uploads, connection errors).
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+            if latency is None and not overloaded:
+                return
+            now = time.time()
+            baseline = self.latencies.get(endpoint)
+            if not overloaded and latency is not None and baseline is not None and self.latency_factor \
+                    and latency > baseline * self.latency_factor:
+                overloaded = True
+            if overloaded:
+                if now - self.last_decrease >= (self.latency or 0):
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self.last_decrease = now
+                    self.decreases += 1
+            else:
+                self.limit = min(self.max_limit, self.limit + float(self.increase) / self.limit)
+                self.increases += 1
+            if latency is not None and not overloaded:
+                self.latency = self._smooth(self.latency, latency)
+                self.latencies[endpoint] = self._smooth(baseline, latency)
+
+    def _smooth(self, average, latency):
+        return latency if average is None else (1 - self.smoothing) * average + self.smoothing * latency
+
+    def reset_after_fork(self):
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.queued = 0
+        self.urgent_queued = 0
+
+    def as_dict(self):
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'queued': self.queued,
+                'latency': self.latency,
+                'increases': self.increases,
+                'decreases': self.decreases
+            }
+
+
+def is_overloaded(status_code):
+    """
+    Returns True if the response status code signals an overloaded Opereto center.
+    """
+    return status_code >= 500 or status_code == 429
+
+
+class AdaptiveConcurrencyTransport(OperetoTransportWrapper):
+    """
+    Bounds the number of requests in flight with an AIMDLimiter fed by the status codes and latencies of the responses.
+
+    | Enabled with the adaptive_concurrency client option (True or an AIMDLimiter). The status codes seen here
+    | are the ones turned into OperetoClientError codes by the clients, so 5xx and 429 errors shrink the limit.
+    | A call with a deadline fails with an OperetoClientError (code 408) instead of waiting for a slot past it.
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(adaptive_concurrency=AIMDLimiter(initial_limit=10, max_limit=100))
+       print(opereto_client.concurrency_stats['limit'])
+    """
+
+    def __init__(self, inner, limiter=None):
+        super(AdaptiveConcurrencyTransport, self).__init__(inner)
+        self.limiter = limiter or AIMDLimiter()
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        context = current_call()
+        # the priority class is known when the priority dispatcher is enabled
+        urgent = context is not None and context.priority == 'control'
+        if not self.limiter.acquire(timeout=context.remaining() if context else None, urgent=urgent):
+            raise OperetoClientError(message='Deadline exceeded while waiting for a request slot of %s'
+                                             % (context.endpoint if context else url), code=408)
+        start = time.time()
+        latency = None
+        overloaded = False
+        upload = files or not isinstance(data, (str, bytes, type(None)))
+        try:
+            r = self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+            if not upload:
+                latency = time.time() - start
+            overloaded = is_overloaded(r.status_code)
+            return r
+        except requests.exceptions.Timeout:
+            overloaded = True
+            raise
+        finally:
+            self.limiter.release(latency=latency, overloaded=overloaded, endpoint=context.endpoint if context else None)
+
+    def reset_after_fork(self):
+        self.limiter.reset_after_fork()
+        super(AdaptiveConcurrencyTransport, self).reset_after_fork()
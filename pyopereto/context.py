@@ -0,0 +1,117 @@
+import time
+import threading
+from contextlib import contextmanager
+from pyopereto.exceptions import OperetoClientError
+
+_local = threading.local()
+
+
+class CallContext(object):
+    """
+    Describes the client API call running in the current thread: the client method (endpoint) name
+    and the absolute time (epoch seconds) by which it must complete, if any.
+    Nested calls inherit the deadline of their parent call when it is earlier than their own.
+    The retry controller records the current attempt number (0 for the first one) and its start time, and the
+    client counts the requests of the call, their bytes and the status code of the last response.
+    The priority dispatcher records the priority class of the call.
+    """
+
+    def __init__(self, endpoint, deadline=None, parent=None):
+        self.endpoint = endpoint
+        self.parent = parent
+        self.attempt = 0
+        self.attempt_started = None
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_code = None
+        self.priority = None
+        if parent is not None and parent.deadline is not None:
+            deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+        self.deadline = deadline
+
+    def remaining(self):
+        """
+        Returns the number of seconds left before the deadline, or None if the call has no deadline.
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
+
+    def add_request(self, request_bytes, response_bytes, status_code):
+        self.requests += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.status_code = status_code
+
+    def check_deadline(self):
+        """
+        Raises an OperetoClientError (code 408) if the call deadline has passed.
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise OperetoClientError(message='Deadline exceeded while calling %s' % self.endpoint, code=408)
+
+
+def current_call():
+    """
+    Returns the CallContext of the API call running in the current thread, or None.
+    """
+    return getattr(_local, 'call', None)
+
+
+@contextmanager
+def call_context(endpoint, deadline=None):
+    """
+    Runs the enclosed block as the given client API call.
+
+    :Parameters:
+    * *endpoint* (`string`) -- Client method name
+    * *deadline* (`float`) -- Seconds allowed for the call, including all its retries. Default is None (no deadline)
+    """
+    parent = current_call()
+    context = CallContext(endpoint, deadline=time.time() + deadline if deadline is not None else None, parent=parent)
+    _local.call = context
+    try:
+        yield context
+    finally:
+        _local.call = parent
+
+
+def record_request(request_bytes, response_bytes, status_code):
+    """
+    Adds a request sent by the current API call, if any, to its counters.
+    """
+    context = current_call()
+    if context is not None:
+        context.add_request(request_bytes, response_bytes, status_code)
+
+
+def check_deadline():
+    """
+    Raises an OperetoClientError (code 408) if the deadline of the current API call has passed.
+    """
+    context = current_call()
+    if context is not None:
+        context.check_deadline()
+
+
+def remaining_time():
+    """
+    Returns the number of seconds left before the deadline of the current API call, or None.
+    """
+    context = current_call()
+    if context is not None:
+        return context.remaining()
+
+
+def call_in_context(context, f, *args, **kwargs):
+    """
+    Calls f(*args, **kwargs) as part of the given API call, e.g. from a worker thread.
+    """
+    parent = current_call()
+    _local.call = context
+    try:
+        return f(*args, **kwargs)
+    finally:
+        _local.call = parent
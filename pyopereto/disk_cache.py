@@ -0,0 +1,149 @@
+import os
+import re
+import errno
+import json
+import time
+import hashlib
+import tempfile
+from pyopereto.transport import OperetoTransportWrapper, OperetoResponse
+
+DEFAULT_DISK_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.pyopereto', 'cache')
+DEFAULT_DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_replace = getattr(os, 'replace', os.rename)
+_max_age_re = re.compile(r'max-age\s*=\s*(\d+)')
+_skipped_headers = ['content-encoding', 'content-length', 'transfer-encoding', 'set-cookie', 'connection']
+
+
+class DiskCacheTransport(OperetoTransportWrapper):
+    """
+    Persistent cache of GET responses, shared by the processes of a user (e.g. successive CLI invocations).
+
+    | Responses are stored when the server sends validators (ETag or Last-Modified) or a Cache-Control max-age.
+    | A fresh response (within its max-age) is returned without any request. Otherwise the cached response is
+    | revalidated with If-None-Match/If-Modified-Since and returned as is on 304 Not Modified.
+    | The least recently used responses are evicted when the cache grows above *max_bytes*.
+
+    :Parameters:
+    * *directory* (`string`) -- Cache directory. Default is ~/.pyopereto/cache
+    * *max_bytes* (`int`) -- Maximum total size of the cached responses. Default is 64MB
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(disk_cache=True)
+       opereto_client.get_service_version('my_service')
+    """
+
+    def __init__(self, inner, directory=None, max_bytes=DEFAULT_DISK_CACHE_MAX_BYTES):
+        super(DiskCacheTransport, self).__init__(inner)
+        self.directory = directory or DEFAULT_DISK_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        try:
+            os.makedirs(self.directory)
+        except OSError as e:
+            # created by a concurrent process
+            if e.errno != errno.EEXIST:
+                raise
+
+    def _path(self, url, headers):
+        identity = (headers or {}).get('Authorization', '')
+        key = hashlib.sha256(('%s\n%s' % (url, identity)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key)
+
+    def _load(self, path):
+        try:
+            with open(path, 'rb') as f:
+                meta, content = f.read().split(b'\n', 1)
+            os.utime(path, None)
+            return json.loads(meta.decode('utf-8')), content
+        except (IOError, OSError, ValueError):
+            return None, None
+
+    def _store(self, path, r):
+        headers = dict((key, value) for key, value in r.headers.items() if key.lower() not in _skipped_headers)
+        meta = {'status_code': r.status_code, 'reason': r.reason, 'headers': headers, 'stored_at': time.time(),
+                'max_age': _max_age(r.headers)}
+        self._write(path, meta, r.content)
+        self.evict()
+
+    def _write(self, path, meta, content):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json.dumps(meta).encode('utf-8') + b'\n' + content)
+        _replace(temp_path, path)
+
+    def evict(self):
+        """
+        Removes the least recently used responses until the cache fits in max_bytes.
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+        for mtime, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        if method.lower() != 'get':
+            return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+        path = self._path(url, headers)
+        meta, content = self._load(path)
+        headers = dict(headers or {})
+        if meta is not None:
+            if meta['max_age'] and time.time() < meta['stored_at'] + meta['max_age']:
+                self.hits += 1
+                return OperetoResponse(meta['status_code'], meta['reason'], meta['headers'], content)
+            cached_headers = dict((key.lower(), value) for key, value in meta['headers'].items())
+            if 'etag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['etag']
+            if 'last-modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['last-modified']
+        r = self.inner.request(method, url, headers=headers, timeout=timeout)
+        if r.status_code == 304 and meta is not None:
+            self.revalidations += 1
+            meta['stored_at'] = time.time()
+            meta['max_age'] = _max_age(r.headers) or meta['max_age']
+            # the next processes use the refreshed entry without revalidating it while it is fresh
+            self._write(path, meta, content)
+            return OperetoResponse(meta['status_code'], meta['reason'], meta['headers'], content)
+        self.misses += 1
+        if r.status_code == 200 and _cacheable(r.headers):
+            self._store(path, r)
+        return r
+
+    def as_dict(self):
+        return {
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses
+        }
+
+
+def _max_age(headers):
+    match = _max_age_re.search(headers.get('Cache-Control') or '')
+    return int(match.group(1)) if match else None
+
+
+def _cacheable(headers):
+    if 'no-store' in (headers.get('Cache-Control') or '').lower():
+        return False
+    return bool(headers.get('ETag') or headers.get('Last-Modified') or _max_age(headers))
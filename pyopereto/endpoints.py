@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from pyopereto.retry import apicall
+from pyopereto.cache import cached, invalidates
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+PAGING_STYLES = [None, 'offset']
+
+
+class Endpoint(object):
+    """
+    Describes an Opereto REST API endpoint and the client method calling it.
+
+    | The path template and the error message are formatted with the call parameters (e.g. '/services/{service_id}').
+    | The other attributes are the policies applied to the method: retries, response cache and priority class.
+
+    :Parameters:
+    * *name* (`string`) -- Client method name
+    * *method* (`string`) -- HTTP method: get, put, post or delete
+    * *path* (`string`) -- Path template of the request
+    * *error* (`string`) -- Error message template, prepended to the message returned by the server
+    * *idempotent* (`bool`) -- Whether a failed call may be retried. Default is True for get requests only
+    * *cacheable* (`tuple`) -- Entity type and id argument the results are cached with, e.g. ('service', 'service_id')
+    * *invalidates* (`tuple`) -- Entity type and id argument whose cached results are dropped by the call
+    * *priority* (`string`) -- Priority class of the requests (see pyopereto.priority). Default is properties
+    * *paging* (`string`) -- None or 'offset' for methods taking start and limit arguments
+    """
+
+    def __init__(self, name, method, path, error=None, idempotent=None, cacheable=None, invalidates=None,
+                 priority='properties', paging=None):
+        if paging not in PAGING_STYLES:
+            raise ValueError('Invalid paging style [%s]' % paging)
+        self.name = name
+        self.method = method
+        self.path = path
+        self.error = error
+        self.idempotent = method == 'get' if idempotent is None else idempotent
+        self.cacheable = cacheable
+        self.invalidates = invalidates
+        self.priority = priority
+        self.paging = paging
+
+    def url(self, query=None, **params):
+        """
+        Returns the request path formatted with the given parameters, followed by the *query* parameters if any.
+        """
+        url = self.path.format(**params)
+        if query:
+            url += '?' + urlencode(query)
+        return url
+
+    def error_message(self, **params):
+        if self.error:
+            return self.error.format(**params)
+
+    def __repr__(self):
+        return 'Endpoint(%s: %s %s)' % (self.name, self.method.upper(), self.path)
+
+
+def _search(entity, error, **kwargs):
+    kwargs.setdefault('priority', 'bulk')
+    return Endpoint('search_' + entity, 'post', '/search/' + entity, error=error, idempotent=True, paging='offset',
+                    **kwargs)
+
+
+ENDPOINTS = OrderedDict((endpoint.name, endpoint) for endpoint in [
+    #### GENERAL ####
+    Endpoint('hello', 'get', '/hello', error='Failed to get response from the opereto server', priority='control'),
+
+    #### MICROSERVICES & VERSIONS ####
+    _search('services', 'Failed to search services'),
+    Endpoint('get_service', 'get', '/services/{service_id}', error='Failed to fetch service information',
+             cacheable=('service', 'service_id')),
+    Endpoint('get_service_version', 'get', '/services/{service_id}/{mode}/{version}',
+             error='Failed to fetch service information', cacheable=('service', 'service_id')),
+    Endpoint('verify_service', 'post', '/services/verify', error='Service [{service_id}] verification failed',
+             idempotent=True),
+    Endpoint('modify_service', 'post', '/services', error='Failed to modify service [{service_id}]',
+             invalidates=('service', 'service_id')),
+    Endpoint('upload_service_version', 'post', '/services/upload/{mode}', error='Failed to upload service',
+             invalidates=('service', 'service_id'), priority='bulk'),
+    Endpoint('import_service_version', 'post', '/services', error='Failed to import service',
+             invalidates=('service', 'service_id'), priority='bulk'),
+    Endpoint('delete_service', 'delete', '/services/{service_id}', error='Failed to delete service',
+             invalidates=('service', 'service_id')),
+    Endpoint('delete_service_version', 'delete', '/services/{service_id}/{mode}/{service_version}',
+             error='Failed to delete service', invalidates=('service', 'service_id')),
+    Endpoint('list_development_sandbox', 'get', '/services/sandbox', error='Failed to list sandbox services'),
+    Endpoint('purge_development_sandbox', 'delete', '/services/sandbox', error='Failed to delete sandbox services',
+             invalidates=('service', None)),
+
+    #### ENVIRONMENTS ####
+    _search('environments', 'Failed to search environments'),
+    Endpoint('get_environment', 'get', '/environments/{environment_id}',
+             error='Failed to fetch environment [{environment_id}]', cacheable=('environment', 'environment_id')),
+    Endpoint('verify_environment_scheme', 'post', '/environments/verify', error='Failed to verify environment.',
+             idempotent=True),
+    Endpoint('verify_environment', 'post', '/environments/verify', error='Failed to verify environment.',
+             idempotent=True),
+    Endpoint('create_environment', 'post', '/environments', error='Failed to create environment',
+             invalidates=('environment', 'id')),
+    Endpoint('modify_environment', 'post', '/environments', error='Failed to modify environment',
+             invalidates=('environment', 'environment_id')),
+    Endpoint('delete_environment', 'delete', '/environments/{environment_id}',
+             error='Failed to delete environment [{environment_id}]', invalidates=('environment', 'environment_id')),
+
+    #### AGENTS ####
+    _search('agents', 'Failed to search agents'),
+    Endpoint('get_agents', 'get', '/agents/{agent_id}', error='Failed to fetch agent details.'),
+    Endpoint('get_agent_properties', 'get', '/agents/{agent_id}/properties',
+             error='Failed to fetch agent [{agent_id}] properties', cacheable=('agent', 'agent_id')),
+    Endpoint('get_all_agents', 'get', '/agents/all', error='Failed to fetch agents'),
+    Endpoint('modify_agent_property', 'post', '/agents/{agent_id}/properties',
+             error='Failed to modify agent [{agent_id}] property [{key}]', invalidates=('agent', 'agent_id')),
+    Endpoint('modify_agent_properties', 'post', '/agents/{agent_id}/properties',
+             error='Failed to modify agent [{agent_id}] properties', invalidates=('agent', 'agent_id')),
+    Endpoint('create_agent', 'post', '/agents', error='Failed to create agent', invalidates=('agent', 'agent_id')),
+    Endpoint('modify_agent', 'post', '/agents', error='Failed to modify agent [{agent_id}]',
+             invalidates=('agent', 'agent_id')),
+    Endpoint('get_agent', 'get', '/agents/{agent_id}', error='Failed to fetch agent [{agent_id}] status'),
+    Endpoint('get_agent_status', 'get', '/agents/{agent_id}', error='Failed to fetch agent [{agent_id}] status',
+             priority='status'),
+    Endpoint('delete_agent', 'delete', '/agents/{agent_id}', error='Failed to delete agent [{agent_id}]',
+             invalidates=('agent', 'agent_id')),
+
+    #### PROCESSES ####
+    Endpoint('create_process', 'post', '/processes', error='Failed to create a new process', priority='control'),
+    Endpoint('rerun_process', 'post', '/processes/{pid}/rerun', error='Failed to create a new process',
+             priority='control'),
+    Endpoint('modify_process_properties', 'post', '/processes/{pid}/output', error='Failed to output properties'),
+    Endpoint('modify_process_property', 'post', '/processes/{pid}/output',
+             error='Failed to modify output property [{key}]'),
+    Endpoint('modify_process_summary', 'post', '/processes/{pid}/summary', error='Failed to update process summary'),
+    Endpoint('stop_process', 'post', '/processes/{pid}/terminate/{status}', error='Failed to stop process',
+             priority='control'),
+    Endpoint('get_process_status', 'get', '/processes/{pid}/status', error='Failed to fetch process [{pid}] status',
+             priority='status'),
+    Endpoint('get_process_flow', 'get', '/processes/{pid}/flow', error='Failed to fetch process information',
+             priority='status'),
+    Endpoint('get_process_rca', 'get', '/processes/{pid}/rca', error='Failed to fetch process information',
+             priority='status'),
+    Endpoint('get_process_info', 'get', '/processes/{pid}', error='Failed to fetch process information',
+             priority='status'),
+    Endpoint('get_process_log', 'get', '/processes/{pid}/log', error='Failed to fetch process log', priority='logs',
+             paging='offset'),
+    Endpoint('send_process_log', 'post', '/processes/{pid}/log', error='Failed to send process log', idempotent=True,
+             priority='logs'),
+    Endpoint('search_process_log', 'post', '/processes/{pid}/log/search', error='Failed to search in process log',
+             idempotent=True, priority='logs', paging='offset'),
+    Endpoint('get_process_properties', 'get', '/processes/{pid}/properties',
+             error='Failed to fetch process properties'),
+    Endpoint('get_process_runtime_cache', 'get', '/processes/{pid}/cache',
+             error='Failed to fetch process runtime cache'),
+    Endpoint('set_process_runtime_cache', 'post', '/processes/{pid}/cache',
+             error='Failed to modify process runtime cache'),
+    Endpoint('upload_datastore', 'post', '/processes/{pid}/datastore/{datastore_id}',
+             error='Failed to upload datastore', priority='bulk'),
+
+    #### GLOBAL PARAMETERS ####
+    _search('globals', 'Failed to search globals', cacheable=('globals', None)),
+
+    #### KPI ####
+    _search('kpi', 'Failed to search kpi entries'),
+    Endpoint('modify_kpi', 'post', '/kpi', error='Failed to modify a kpi entry', invalidates=('kpi', 'kpi_id')),
+    Endpoint('delete_kpi', 'delete', '/kpi/{kpi_id}/{product_id}', error='Failed to delete kpi',
+             invalidates=('kpi', 'kpi_id')),
+    Endpoint('get_kpi', 'get', '/kpi/{kpi_id}/{product_id}', error='Failed to get kpi information',
+             cacheable=('kpi', 'kpi_id')),
+
+    #### TESTS ####
+    _search('tests', 'Failed to search tests'),
+    Endpoint('get_test', 'get', '/tests/{test_id}', error='Failed to get test information'),
+
+    #### FEATURES ####
+    _search('features', 'Failed to search features'),
+    Endpoint('create_feature', 'post', '/features', error='Failed to create a new feature entry'),
+
+    #### DIMENSIONS ####
+    _search('dimensions', 'Failed to search dimensions'),
+    Endpoint('modify_dimension', 'post', '/dimensions', error='Failed to modify dimension',
+             invalidates=('dimension', 'dimension_id')),
+    Endpoint('delete_dimension', 'delete', '/dimensions/{dimension_id}', error='Failed to delete a dimension',
+             invalidates=('dimension', 'dimension_id')),
+    Endpoint('get_dimension', 'get', '/dimensions/{dimension_id}', error='Failed to get dimension information',
+             cacheable=('dimension', 'dimension_id')),
+
+    #### QUALITY CRITERIA ####
+    _search('qc', 'Failed to search quality criteria'),
+    Endpoint('get_qc', 'get', '/qc/{qc_id}', error='Failed to get quality criteria information'),
+    Endpoint('create_qc', 'post', '/qc', error='Failed to create criteria'),
+    Endpoint('modify_qc', 'post', '/qc', error='Failed to modify criteria'),
+    Endpoint('delete_qc', 'delete', '/qc/{qc_id}', error='Failed to delete criteria'),
+
+    #### USERS ####
+    _search('users', 'Failed to search users'),
+])
+
+
+def endpoint(f):
+    """
+    Decorates a client method with the policies of its ENDPOINTS entry: retries (apicall), response caching
+    or cache invalidation. The entry is available as the endpoint attribute of the decorated method.
+    """
+    spec = ENDPOINTS[f.__name__]
+    f_call = apicall(f, idempotent=spec.idempotent)
+    if spec.cacheable:
+        f_call = cached(*spec.cacheable)(f_call)
+    if spec.invalidates:
+        f_call = invalidates(*spec.invalidates)(f_call)
+    f_call.endpoint = spec
+    return f_call
@@ -0,0 +1,15 @@
+class OperetoClientError(Exception):
+    """
+    Exceptions thrown by OperetoClient methods are wrapped by this class, /
+    taking from the inner exception the message and error code.
+    remote is True when the error is the answer of the Opereto center (and not e.g. a missing argument)
+    """
+
+    def __init__(self, message, code=500, retry_after=None, remote=False):
+        self.message = message
+        self.code = code
+        self.retry_after = retry_after
+        self.remote = remote
+
+    def __str__(self):
+        return self.message
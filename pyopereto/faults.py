@@ -0,0 +1,264 @@
+import json
+import math
+import time
+import random
+import threading
+import requests
+from pyopereto.transport import OperetoTransportWrapper, OperetoResponse
+from pyopereto.context import current_call
+from pyopereto.ratelimit import endpoint_group
+
+try:
+    from http.client import responses as _reasons
+except ImportError:
+    from httplib import responses as _reasons
+
+FAULT_KINDS = ['error', 'reset', 'timeout', 'expire', 'latency']
+OTHER_ENDPOINT = 'other'
+
+
+def constant(seconds):
+    """
+    Latency distribution always returning *seconds*.
+    """
+    return lambda rng: seconds
+
+
+def uniform(low, high):
+    """
+    Latency distribution uniform between *low* and *high* seconds.
+    """
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean):
+    """
+    Exponential latency distribution of the given *mean* (seconds).
+    """
+    return lambda rng: rng.expovariate(1.0 / mean)
+
+
+def lognormal(median, sigma=1.0):
+    """
+    Log-normal latency distribution (long tail) of the given *median* (seconds).
+    """
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+def _distribution(latency):
+    if latency is None or callable(latency):
+        return latency
+    return constant(latency)
+
+
+def _matches(endpoints, endpoint):
+    return endpoints is None or endpoint in endpoints or endpoint_group(endpoint) in endpoints
+
+
+class Fault(object):
+    """
+    A fault injected in the requests of the matching client methods.
+
+    | Kinds: 'error' (an HTTP error response of the given *status*), 'reset' (a connection reset, raised as
+    | requests.exceptions.ConnectionError), 'timeout' (requests.exceptions.ReadTimeout), 'expire' (the auth token
+    | expires: this request and all the following ones get 403 until FaultInjector.renew_token() is called) and
+    | 'latency' (the request is only delayed by *latency*).
+
+    :Parameters:
+    * *kind* (`string`) -- Fault kind. Default is 'error'
+    * *status* (`int`) -- HTTP status code of error faults. Default is 502
+    * *probability* (`float`) -- Probability of injecting the fault in a matching request. Default is 1
+    * *endpoints* (`list`) -- Client method names or endpoint groups ('status', 'logging', 'search', 'process_creation', 'default'). Default is None (all)
+    * *latency* -- Seconds, or a latency distribution (e.g. lognormal(0.2)), added before the fault. Default is None
+    * *after* (`int`) -- Number of matching requests let through before the fault may be injected. Default is 0
+    * *limit* (`int`) -- Maximum number of injections. Default is None (unlimited)
+    * *sent* (`bool`) -- Send the request before a reset or timeout fault (the server processes a request whose response is lost). Default is False
+    * *retry_after* (`float`) -- Retry-After header of error faults. Default is None
+
+    :Example:
+    .. code-block:: python
+
+       Fault('error', status=502, probability=0.1, endpoints=['status'])
+       Fault('reset', probability=0.05, sent=True, endpoints=['create_process'])
+       Fault('expire', after=100, limit=1)
+    """
+
+    def __init__(self, kind='error', status=502, probability=1.0, endpoints=None, latency=None, after=0, limit=None,
+                 sent=False, retry_after=None):
+        if kind not in FAULT_KINDS:
+            raise ValueError('Unknown fault kind [%s], must be one of %s' % (kind, FAULT_KINDS))
+        self.kind = kind
+        self.status = 403 if kind == 'expire' else status
+        self.probability = probability
+        self.endpoints = endpoints
+        self.latency = _distribution(latency)
+        self.after = after
+        self.limit = limit
+        self.sent = sent
+        self.retry_after = retry_after
+        self.matched = 0
+        self.injected = 0
+
+    def __repr__(self):
+        return 'Fault(%r, status=%r, probability=%r, endpoints=%r)' % (self.kind, self.status, self.probability, self.endpoints)
+
+
+def _scripted_fault(action):
+    if action is None or isinstance(action, Fault):
+        return action
+    if isinstance(action, int):
+        return Fault('error', status=action)
+    return Fault(action)
+
+
+class FaultInjector(object):
+    """
+    Decides the faults injected in the requests of one or more clients (see FaultInjectionTransport).
+
+    | Scripted faults are applied first: each client method of *script* gets the listed actions on its successive
+    | requests (an HTTP status code, 'reset', 'timeout', 'expire', a Fault, or None to let a request through),
+    | then no scripted fault. Otherwise the first matching probabilistic fault drawn is injected. The *latency*
+    | distribution is added to every request.
+
+    :Parameters:
+    * *faults* (`list`) -- Probabilistic Fault instances. Default is None
+    * *script* (`dict`) -- Lists of actions by client method name. Default is None
+    * *latency* -- Seconds or a latency distribution added to every request, or a dict of them by client method name or endpoint group. Default is None
+    * *seed* (`int`) -- Random generator seed, for reproducible runs. Default is None
+
+    :Example:
+    .. code-block:: python
+
+       from pyopereto.faults import FaultInjector, Fault, lognormal
+
+       injector = FaultInjector(faults=[Fault('error', status=502, probability=0.05), Fault('reset', probability=0.01)],
+                                script={'wait_for': [None, None, 'expire']},
+                                latency={'status': lognormal(0.05, 0.8)}, seed=1)
+       opereto_client = OperetoClient(faults=injector, metrics=True)
+       ...
+       print(injector.stats)
+    """
+
+    def __init__(self, faults=None, script=None, latency=None, seed=None):
+        self.faults = list(faults or [])
+        self.script = dict((endpoint, [_scripted_fault(action) for action in actions])
+                           for endpoint, actions in (script or {}).items())
+        if isinstance(latency, dict):
+            self.latency = dict((endpoint, _distribution(value)) for endpoint, value in latency.items())
+        else:
+            self.latency = {None: _distribution(latency)} if latency is not None else {}
+        self.random = random.Random(seed)
+        self.expired = False
+        self.requests = 0
+        self.delayed = 0
+        self.delay = 0.0
+        self.injected = {}
+        self._lock = threading.Lock()
+
+    def _latency(self, endpoint):
+        distribution = self.latency.get(endpoint) or self.latency.get(endpoint_group(endpoint)) or self.latency.get(None)
+        return max(0.0, distribution(self.random)) if distribution else 0.0
+
+    def _draw(self, endpoint):
+        actions = self.script.get(endpoint)
+        if actions:
+            return actions.pop(0)
+        for fault in self.faults:
+            if not _matches(fault.endpoints, endpoint) or (fault.limit is not None and fault.injected >= fault.limit):
+                continue
+            fault.matched += 1
+            if fault.matched > fault.after and self.random.random() < fault.probability:
+                return fault
+        return None
+
+    def decide(self, endpoint):
+        """
+        Returns the (delay in seconds, Fault or None) of a request of the given client method.
+        """
+        with self._lock:
+            self.requests += 1
+            fault = self._draw(endpoint)
+            if fault is None and self.expired:
+                fault = Fault('expire')
+            delay = self._latency(endpoint)
+            if fault is not None:
+                fault.injected += 1
+                if fault.kind == 'expire':
+                    self.expired = True
+                if fault.latency is not None:
+                    delay += max(0.0, fault.latency(self.random))
+                self.injected[fault.kind] = self.injected.get(fault.kind, 0) + 1
+            if delay:
+                self.delayed += 1
+                self.delay += delay
+            return delay, fault
+
+    def expire_token(self):
+        """
+        Fails all the following requests with 403, as if the auth token expired.
+        """
+        self.expired = True
+
+    def renew_token(self):
+        self.expired = False
+
+    @property
+    def stats(self):
+        with self._lock:
+            return {'requests': self.requests, 'injected': dict(self.injected), 'delayed': self.delayed,
+                    'delay': self.delay, 'expired': self.expired}
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+
+def _read_timeout(timeout):
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+class FaultInjectionTransport(OperetoTransportWrapper):
+    """
+    Injects the faults decided by a FaultInjector in the requests of the inner transport.
+
+    | Enabled with the faults client option (a FaultInjector, or a list of Fault instances). It wraps the base
+    | transport, so injected errors go through the client retries, circuit breaker, adaptive concurrency and
+    | metrics like real ones. Added latencies longer than the request read timeout raise a read timeout.
+    """
+
+    def __init__(self, inner, injector=None):
+        super(FaultInjectionTransport, self).__init__(inner)
+        self.injector = injector or FaultInjector()
+
+    def _error_response(self, fault):
+        message = 'Access is forbidden' if fault.kind == 'expire' else 'Injected fault (HTTP %s)' % fault.status
+        headers = {'Content-Type': 'application/json'}
+        if fault.retry_after is not None:
+            headers['Retry-After'] = str(fault.retry_after)
+        content = json.dumps({'status': 'failure', 'message': message}).encode('utf-8')
+        return OperetoResponse(fault.status, _reasons.get(fault.status, ''), headers, content)
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        context = current_call()
+        endpoint = context.endpoint if context and context.endpoint else OTHER_ENDPOINT
+        delay, fault = self.injector.decide(endpoint)
+        if delay:
+            read_timeout = _read_timeout(timeout)
+            if read_timeout is not None and delay >= read_timeout:
+                time.sleep(read_timeout)
+                raise requests.exceptions.ReadTimeout('Read timed out after %s seconds (injected latency)' % read_timeout)
+            time.sleep(delay)
+        if fault is None or fault.kind == 'latency':
+            return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+        if fault.kind in ('reset', 'timeout'):
+            if fault.sent:
+                self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+            if fault.kind == 'reset':
+                raise requests.exceptions.ConnectionError('Connection reset by peer (injected fault)')
+            raise requests.exceptions.ReadTimeout('Read timed out (injected fault)')
+        return self._error_response(fault)
+
+    def reset_after_fork(self):
+        self.injector.reset_after_fork()
+        super(FaultInjectionTransport, self).reset_after_fork()
@@ -0,0 +1,30 @@
+import os
+import logging
+import weakref
+
+logger = logging.getLogger('pyopereto')
+
+_instances = weakref.WeakSet()
+
+
+def register_after_fork(obj):
+    """
+    Calls obj.reset_after_fork() in the child process after every os.fork(), as long as obj is alive.
+
+    | The child only has the thread that forked: locks held by other threads of the parent stay locked forever,
+    | and pooled connections are shared with the parent. Registered objects recreate their locks and drop
+    | their parent's connections and in-flight state.
+    """
+    _instances.add(obj)
+
+
+def _reset_in_child():
+    for obj in list(_instances):
+        try:
+            obj.reset_after_fork()
+        except Exception as e:
+            logger.debug('Failed to reset %s after fork: %s', obj, e)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_in_child)
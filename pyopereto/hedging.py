@@ -0,0 +1,186 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pyopereto.transport import OperetoTransportWrapper
+from pyopereto.context import current_call, call_in_context
+from pyopereto.retry import RetryBudget
+
+DEFAULT_HEDGED_ENDPOINTS = ['get_process_status', 'get_process_info']
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_DELAY = 1.0
+
+
+class LatencyTracker(object):
+    """
+    Sliding window of the latencies of an endpoint, used to derive the hedging delay.
+    """
+
+    def __init__(self, size=1000, min_samples=20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def add(self, latency):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percentile):
+        """
+        Returns the given percentile of the latencies, or None until enough latencies are known.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100.0))]
+
+
+class HedgingTransport(OperetoTransportWrapper):
+    """
+    Cuts the tail latency of idempotent GET requests: when no response arrives within the *percentile*
+    latency of the endpoint, a second identical request is sent on another pooled connection and the
+    first response wins. The slower request is abandoned and its response discarded.
+
+    | Enabled with the hedge_requests client option (True for get_process_status and get_process_info,
+    | or a list of client method names). Hedges are capped by a budget, a fraction of the requests.
+    | Requests are sent by *max_workers* threads, so that the caller can return the first response. A request
+    | that cannot be hedged (budget exhausted, or no idle worker) is sent on the calling thread: requests are
+    | never queued for a worker.
+
+    :Parameters:
+    * *endpoints* (`list`) -- Client methods whose GET requests are hedged. Default is get_process_status and get_process_info
+    * *percentile* (`float`) -- Latency percentile after which a hedge is sent. Default is 95
+    * *min_delay* (`float`) -- Minimum hedging delay in seconds. Default is 0.01
+    * *initial_delay* (`float`) -- Hedging delay used until enough latencies are known. Default is 1
+    * *budget* (`RetryBudget`) -- Budget of hedges. Default is 5% of the requests over 10 seconds
+    * *max_workers* (`int`) -- Maximum number of hedged requests (primary requests and hedges) in flight. Default is 64
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(hedge_requests=['get_process_status', 'get_service_version'], hedge_percentile=90)
+       print(opereto_client.hedging_stats)
+    """
+
+    def __init__(self, inner, endpoints=None, percentile=DEFAULT_HEDGE_PERCENTILE, min_delay=0.01,
+                 initial_delay=DEFAULT_HEDGE_DELAY, budget=None, max_workers=64):
+        super(HedgingTransport, self).__init__(inner)
+        self.endpoints = list(endpoints or DEFAULT_HEDGED_ENDPOINTS)
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.budget = budget or RetryBudget(ratio=0.05, min_retries=1)
+        self.latencies = {}
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._busy = 0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+        self.saturated = 0
+
+    def delay_for(self, endpoint):
+        tracker = self.latencies.get(endpoint)
+        delay = tracker.percentile(self.percentile) if tracker else None
+        return max(self.min_delay, delay if delay is not None else self.initial_delay)
+
+    def _send(self, context, endpoint, method, url, headers, timeout):
+        start = time.time()
+        r = call_in_context(context, self.inner.request, method, url, headers=headers, timeout=timeout)
+        with self._lock:
+            tracker = self.latencies.get(endpoint)
+            if tracker is None:
+                tracker = self.latencies[endpoint] = LatencyTracker()
+        tracker.add(time.time() - start)
+        return r
+
+    def _send_on_worker(self, context, endpoint, method, url, headers, timeout):
+        try:
+            return self._send(context, endpoint, method, url, headers, timeout)
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _submit(self, context, endpoint, method, url, headers, timeout):
+        """
+        Sends a request on an idle worker thread. Returns None if all the workers are busy.
+        """
+        with self._lock:
+            if self._busy >= self.max_workers:
+                self.saturated += 1
+                return None
+            self._busy += 1
+        return self._executor.submit(self._send_on_worker, context, endpoint, method, url, headers, timeout)
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        context = current_call()
+        endpoint = context.endpoint if context else None
+        if method.lower() != 'get' or data is not None or files or endpoint not in self.endpoints:
+            return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+        with self._lock:
+            self.requests += 1
+        self.budget.record_call()
+        delay = self.delay_for(endpoint)
+        primary = self._submit(context, endpoint, method, url, headers, timeout) if self.budget.has_room() else None
+        if primary is None:
+            # no hedge can follow: sent on the calling thread
+            start = time.time()
+            r = self._send(context, endpoint, method, url, headers, timeout)
+            if time.time() - start >= delay:
+                with self._lock:
+                    self.budget_exhausted += 1
+            return r
+        done, pending = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if not self.budget.can_retry():
+            with self._lock:
+                self.budget_exhausted += 1
+            return primary.result()
+        hedge = self._submit(context, endpoint, method, url, headers, timeout)
+        if hedge is None:
+            return primary.result()
+        with self._lock:
+            self.hedges += 1
+        pending = set([primary, hedge])
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded or not pending:
+                winner = succeeded[0] if succeeded else done.pop()
+                if winner is hedge and succeeded:
+                    with self._lock:
+                        self.hedge_wins += 1
+                for future in pending:
+                    future.cancel()
+                return winner.result()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        super(HedgingTransport, self).close()
+
+    def reset_after_fork(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._lock = threading.Lock()
+        self._busy = 0
+        self.budget.reset_after_fork()
+        for tracker in self.latencies.values():
+            tracker.reset_after_fork()
+        super(HedgingTransport, self).reset_after_fork()
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'budget_exhausted': self.budget_exhausted,
+                'saturated': self.saturated,
+                'delays': dict((endpoint, self.delay_for(endpoint)) for endpoint in self.latencies)
+            }
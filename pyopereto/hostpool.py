@@ -0,0 +1,267 @@
+import time
+import weakref
+import logging
+import threading
+import requests
+from pyopereto.transport import OperetoTransport
+from pyopereto.endpoints import ENDPOINTS
+
+logger = logging.getLogger('pyopereto')
+
+HOST_ROUTING = ['least_outstanding', 'latency']
+DEFAULT_HEALTH_CHECK_INTERVAL = 10.0
+DEFAULT_EJECT_AFTER = 3
+DEFAULT_EJECT_TIME = 30.0
+HEALTH_CHECK_TIMEOUT = (2, 5)
+LATENCY_DECAY = 0.3
+LOGIN_PATH = '/login'
+# the node (or its gateway) is down or overloaded, unlike an application error of a healthy node
+NODE_FAILURE_CODES = (502, 503, 504)
+
+
+def parse_hosts(value):
+    """
+    Returns the list of hosts of an opereto_host value: a URL, a list of URLs or comma separated URLs.
+    """
+    if isinstance(value, (list, tuple)):
+        hosts = list(value)
+    else:
+        hosts = str(value).split(',')
+    return [host.strip().rstrip('/') for host in hosts if host and host.strip()]
+
+
+class HostNode(object):
+    """
+    One front-end node of the Opereto center, with its own transport (connections and session cookies).
+    """
+
+    def __init__(self, host, transport):
+        self.host = host
+        self.transport = transport
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0
+        self.latency = None
+        self.weight = 0.0
+
+    def available(self, now):
+        return self.ejected_until <= now
+
+    def observe(self, latency):
+        self.latency = latency if self.latency is None else LATENCY_DECAY * latency + (1 - LATENCY_DECAY) * self.latency
+
+    def as_dict(self, now):
+        return {
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejections': self.ejections,
+            'ejected_for': max(0.0, self.ejected_until - now),
+            'latency': self.latency
+        }
+
+
+class HostPoolTransport(OperetoTransport):
+    """
+    Spreads the requests of a client over several front-end nodes of the same Opereto center.
+
+    | Enabled by giving opereto_host a list of URLs. Each node gets its own transport. Requests go to the available
+    | node with the least outstanding requests (in turn when tied), or are spread by latency-weighted round robin.
+    | A node is ejected for *eject_time* seconds after *eject_after* consecutive failures (network errors, timeouts or
+    | 502/503/504 responses, not the application errors of a healthy node), or when its health check fails. A background thread checks the nodes with the hello endpoint every
+    | *health_check_interval* seconds, measuring their latency and readmitting recovered nodes early.
+    | Once a node sets a session cookie on login (basic auth), requests stick to it. If it is ejected, the next request
+    | raises a ConnectionError, so the client logs in again on another node and sticks to that one.
+
+    :Parameters:
+    * *hosts* (`list`) -- Node URLs
+    * *transports* (`list`) -- Transport of each node
+    * *routing* (`string`) -- 'least_outstanding' or 'latency'. Default is 'least_outstanding'
+    * *health_check_interval* (`float`) -- Seconds between health checks, None disables them. Default is 10
+    * *eject_after* (`int`) -- Consecutive failures ejecting a node. Default is 3
+    * *eject_time* (`float`) -- Seconds a node stays ejected. Default is 30
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(opereto_host=['https://node1:8080', 'https://node2:8080'], opereto_auth_token=token,
+                                      host_routing='latency', health_check_interval=5)
+       print(opereto_client.host_stats)
+    """
+
+    def __init__(self, hosts, transports, routing='least_outstanding', health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 eject_after=DEFAULT_EJECT_AFTER, eject_time=DEFAULT_EJECT_TIME):
+        if routing not in HOST_ROUTING:
+            raise ValueError('Unknown host routing [%s], must be one of %s' % (routing, HOST_ROUTING))
+        self.nodes = [HostNode(host, transport) for host, transport in zip(hosts, transports)]
+        self.routing = routing
+        self.health_check_interval = health_check_interval
+        self.eject_after = eject_after
+        self.eject_time = eject_time
+        self.affinity = None
+        self.failovers = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread = None
+
+    def _node_url(self, url):
+        for node in self.nodes:
+            if url.startswith(node.host):
+                return url[len(node.host):]
+        raise ValueError('Request URL [%s] does not belong to any of the hosts %s' % (url, [n.host for n in self.nodes]))
+
+    def _pick_latency(self, nodes):
+        # smooth weighted round robin, weights inversely proportional to the node latencies
+        known = [node.latency for node in nodes if node.latency]
+        default = sum(known) / len(known) if known else 1.0
+        total = 0.0
+        best = None
+        for node in nodes:
+            weight = 1.0 / (node.latency or default)
+            node.weight += weight
+            total += weight
+            if best is None or node.weight > best.weight:
+                best = node
+        best.weight -= total
+        return best
+
+    def _pick_least_outstanding(self, nodes):
+        self._next = (self._next + 1) % len(nodes)
+        rotated = nodes[self._next:] + nodes[:self._next]
+        return min(rotated, key=lambda node: node.in_flight)
+
+    def _select(self):
+        now = time.time()
+        with self._lock:
+            if self.affinity is not None:
+                if self.affinity.available(now):
+                    node = self.affinity
+                else:
+                    lost, self.affinity = self.affinity, None
+                    self.failovers += 1
+                    raise requests.exceptions.ConnectionError(
+                        'Opereto host %s is unavailable, the session moves to another host' % lost.host)
+            else:
+                nodes = [node for node in self.nodes if node.available(now)]
+                if not nodes:
+                    # all nodes are ejected: try the one that recovers first
+                    nodes = [min(self.nodes, key=lambda node: node.ejected_until)]
+                if self.routing == 'latency':
+                    node = self._pick_latency(nodes)
+                else:
+                    node = self._pick_least_outstanding(nodes)
+            node.in_flight += 1
+            node.requests += 1
+            return node
+
+    def _eject(self, node, now):
+        node.ejected_until = now + self.eject_time
+        node.ejections += 1
+        logger.warning('Opereto host %s ejected for %s seconds', node.host, self.eject_time)
+
+    def _finish(self, node, latency, failed, session_cookie=False):
+        now = time.time()
+        with self._lock:
+            node.in_flight -= 1
+            if failed:
+                node.failures += 1
+                node.consecutive_failures += 1
+                if node.consecutive_failures >= self.eject_after and node.available(now):
+                    self._eject(node, now)
+            else:
+                node.consecutive_failures = 0
+                node.observe(latency)
+                if session_cookie:
+                    self.affinity = node
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        self._start_health_checks()
+        path = self._node_url(url)
+        node = self._select()
+        start = time.time()
+        try:
+            r = node.transport.request(method, node.host + path, headers=headers, data=data, files=files, timeout=timeout)
+        except requests.exceptions.RequestException:
+            self._finish(node, time.time() - start, True)
+            raise
+        self._finish(node, time.time() - start, r.status_code in NODE_FAILURE_CODES,
+                     session_cookie=path == LOGIN_PATH and 'Set-Cookie' in r.headers)
+        return r
+
+    def check_health(self):
+        """
+        Sends a hello request to every node, ejecting the failing ones and readmitting the recovered ones.
+        """
+        for node in self.nodes:
+            start = time.time()
+            try:
+                r = node.transport.request('get', node.host + ENDPOINTS['hello'].url(), timeout=HEALTH_CHECK_TIMEOUT)
+                healthy = r.status_code not in NODE_FAILURE_CODES
+            except requests.exceptions.RequestException:
+                healthy = False
+            now = time.time()
+            with self._lock:
+                if healthy:
+                    node.observe(now - start)
+                    node.consecutive_failures = 0
+                    node.ejected_until = 0
+                elif node.available(now):
+                    self._eject(node, now)
+
+    def _start_health_checks(self):
+        if self._health_thread is not None or not self.health_check_interval:
+            return
+        with self._lock:
+            if self._health_thread is not None:
+                return
+            # the thread holds the pool weakly: it exits once the pool is closed or no longer used
+            self._health_thread = threading.Thread(target=_run_health_checks, args=(weakref.ref(self), self._stop),
+                                                   name='pyopereto-health-checks')
+            self._health_thread.daemon = True
+            self._health_thread.start()
+
+    def as_dict(self):
+        now = time.time()
+        with self._lock:
+            return {
+                'routing': self.routing,
+                'affinity': self.affinity.host if self.affinity else None,
+                'failovers': self.failovers,
+                'hosts': dict((node.host, node.as_dict(now)) for node in self.nodes)
+            }
+
+    def close(self):
+        self._stop.set()
+        for node in self.nodes:
+            node.transport.close()
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread = None
+        for node in self.nodes:
+            node.in_flight = 0
+            node.transport.reset_after_fork()
+
+
+def _run_health_checks(pool_ref, stop):
+    while True:
+        pool = pool_ref()
+        if pool is None:
+            return
+        interval = pool.health_check_interval
+        del pool
+        if stop.wait(interval):
+            return
+        pool = pool_ref()
+        if pool is None:
+            return
+        try:
+            pool.check_health()
+        except Exception as e:
+            logger.debug('Opereto hosts health check failed: %s', e)
+        del pool
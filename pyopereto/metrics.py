@@ -0,0 +1,285 @@
+import time
+import bisect
+import logging
+import threading
+from pyopereto.transport import OperetoTransportWrapper
+from pyopereto.context import current_call
+
+logger = logging.getLogger('pyopereto')
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+OTHER_ENDPOINT = 'other'
+
+
+class Histogram(object):
+    """
+    Counts observed durations (seconds) in buckets of the given upper bounds.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """
+        Returns the (upper bound, number of values lower or equal) pairs of the buckets, ending with +Inf.
+        """
+        total = 0
+        rv = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            rv.append((bound, total))
+        return rv
+
+    def percentile(self, percent):
+        """
+        Returns the upper bound of the bucket holding the given percentile (capped by the maximum value), or None.
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return min(bound, self.max)
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': [[bound, total] for bound, total in self.cumulative()[:-1]]
+        }
+
+
+class EndpointMetrics(object):
+    """
+    Metrics of the requests of a single client method.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.requests = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.errors = {}
+        self.latency = Histogram(buckets)
+        self.queue_wait = Histogram(buckets)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'in_flight': self.in_flight,
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'errors': dict(self.errors),
+            'latency': self.latency.as_dict(),
+            'queue_wait': self.queue_wait.as_dict()
+        }
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class ClientMetrics(object):
+    """
+    Per endpoint (client method) metrics of the requests sent by one or more clients.
+
+    | Each request records its latency, its request and response sizes, and its error (HTTP status code >= 400 or
+    | network error class name). The first request of an attempt also records its queue wait: the time spent in the
+    | client (rate limits, concurrency limits, priority queues) between the start of the attempt and the request.
+    | Attempts after the first one are counted as retries. In-flight gauges count the requests waiting for a response.
+
+    :Parameters:
+    * *buckets* (`tuple`) -- Upper bounds in seconds of the latency and queue wait histogram buckets. Default is 5ms to 60s
+    * *callback* (`callable`) -- Called with a dict describing each request once it completes (endpoint, method, status, error, latency, queue_wait, request_bytes, response_bytes, attempt)
+
+    :Example:
+    .. code-block:: python
+
+       metrics = ClientMetrics(callback=lambda sample: statsd.timing(sample['endpoint'], sample['latency']))
+       opereto_client = OperetoClient(metrics=metrics)
+       print(opereto_client.metrics()['get_process_status']['latency']['p95'])
+       print(opereto_client.metrics(format='prometheus'))
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS, callback=None):
+        self.buckets = tuple(buckets)
+        self.callback = callback
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint):
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics(self.buckets)
+        return metrics
+
+    def start(self, endpoint, queue_wait=None, retry=False):
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.requests += 1
+            metrics.in_flight += 1
+            if retry:
+                metrics.retries += 1
+            if queue_wait is not None:
+                metrics.queue_wait.observe(queue_wait)
+
+    def finish(self, endpoint, latency, request_bytes=0, response_bytes=0, error=None):
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.in_flight -= 1
+            metrics.latency.observe(latency)
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+            if error is not None:
+                metrics.errors[error] = metrics.errors.get(error, 0) + 1
+
+    def notify(self, sample):
+        if self.callback is None:
+            return
+        try:
+            self.callback(sample)
+        except Exception as e:
+            logger.debug('Metrics callback failed: %s', e)
+
+    def reset(self):
+        """
+        Drops all the recorded metrics.
+        """
+        with self._lock:
+            self.endpoints = {}
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        for metrics in self.endpoints.values():
+            metrics.in_flight = 0
+
+    def as_dict(self):
+        """
+        Returns the metrics by endpoint name.
+        """
+        with self._lock:
+            return dict((endpoint, metrics.as_dict()) for endpoint, metrics in self.endpoints.items())
+
+    def prometheus(self, prefix='pyopereto'):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = []
+
+            def family(name, kind, description):
+                lines.append('# HELP %s_%s %s' % (prefix, name, description))
+                lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+
+            def sample(name, labels, value):
+                label_text = ','.join('%s="%s"' % (key, _escape_label(label)) for key, label in labels)
+                lines.append('%s_%s{%s} %s' % (prefix, name, label_text, repr(float(value)) if isinstance(value, float) else value))
+
+            for name, attribute, description in [('request_duration_seconds', 'latency', 'Latency of the Opereto API requests.'),
+                                                  ('queue_wait_seconds', 'queue_wait', 'Time spent in the client before sending a request.')]:
+                family(name, 'histogram', description)
+                for endpoint, metrics in endpoints:
+                    histogram = getattr(metrics, attribute)
+                    for bound, total in histogram.cumulative():
+                        sample(name + '_bucket', [('endpoint', endpoint), ('le', _format_bound(bound))], total)
+                    sample(name + '_sum', [('endpoint', endpoint)], histogram.sum)
+                    sample(name + '_count', [('endpoint', endpoint)], histogram.count)
+            for name, attribute, description in [('requests_total', 'requests', 'Number of Opereto API requests.'),
+                                                 ('retries_total', 'retries', 'Number of retried Opereto API calls attempts.'),
+                                                 ('request_bytes_total', 'request_bytes', 'Size of the request bodies.'),
+                                                 ('response_bytes_total', 'response_bytes', 'Size of the response bodies.')]:
+                family(name, 'counter', description)
+                for endpoint, metrics in endpoints:
+                    sample(name, [('endpoint', endpoint)], getattr(metrics, attribute))
+            family('errors_total', 'counter', 'Number of failed Opereto API requests by status code or network error.')
+            for endpoint, metrics in endpoints:
+                for error, count in sorted(metrics.errors.items()):
+                    sample('errors_total', [('endpoint', endpoint), ('code', error)], count)
+            family('requests_in_flight', 'gauge', 'Number of Opereto API requests waiting for a response.')
+            for endpoint, metrics in endpoints:
+                sample('requests_in_flight', [('endpoint', endpoint)], metrics.in_flight)
+        return '\n'.join(lines) + '\n'
+
+
+def _body_size(data):
+    if data is None:
+        return 0
+    if hasattr(data, 'len'):
+        return data.len
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+
+class MetricsTransport(OperetoTransportWrapper):
+    """
+    Records the metrics of every request sent by the inner transport in a ClientMetrics.
+
+    | Enabled with the metrics client option (True or a ClientMetrics, which may be shared by several clients) or
+    | the metrics_callback option. It wraps the base transport, so latencies and sizes are those of the wire requests
+    | and responses, and requests served by the response or disk caches are not counted.
+    """
+
+    def __init__(self, inner, metrics=None):
+        super(MetricsTransport, self).__init__(inner)
+        self.metrics = metrics or ClientMetrics()
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        context = current_call()
+        endpoint = context.endpoint if context and context.endpoint else OTHER_ENDPOINT
+        attempt = context.attempt if context else 0
+        queue_wait = None
+        if context is not None and context.attempt_started is not None:
+            queue_wait = max(0.0, time.time() - context.attempt_started)
+            context.attempt_started = None
+        self.metrics.start(endpoint, queue_wait=queue_wait, retry=queue_wait is not None and attempt > 0)
+        start = time.time()
+        status = None
+        error = None
+        response_bytes = 0
+        try:
+            r = self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+            status = r.status_code
+            response_bytes = len(r.content or b'')
+            if status >= 400:
+                error = str(status)
+            return r
+        except Exception as e:
+            error = e.__class__.__name__
+            raise
+        finally:
+            latency = time.time() - start
+            request_bytes = _body_size(data)
+            self.metrics.finish(endpoint, latency, request_bytes=request_bytes, response_bytes=response_bytes, error=error)
+            self.metrics.notify({
+                'endpoint': endpoint, 'method': method, 'status': status, 'error': error, 'latency': latency,
+                'queue_wait': queue_wait, 'request_bytes': request_bytes, 'response_bytes': response_bytes,
+                'attempt': attempt
+            })
+
+    def reset_after_fork(self):
+        self.metrics.reset_after_fork()
+        super(MetricsTransport, self).reset_after_fork()
@@ -0,0 +1,112 @@
+import time
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('pyopereto')
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+# (connect, read) timeouts of the pre-connect request, so that an unreachable host does not stall the client creation
+DEFAULT_PRECONNECT_TIMEOUT = (2, 5)
+
+POOL_OPTIONS = ['pool_connections', 'pool_maxsize', 'pool_block', 'pool_idle_timeout', 'pool_preconnect', 'pool_preconnect_timeout']
+
+
+def pop_pool_options(kwargs):
+    """
+    Removes the connection pool options from the client keyword arguments and returns them as a dict.
+    """
+    return dict((key, kwargs.pop(key)) for key in POOL_OPTIONS if key in kwargs)
+
+
+class OperetoConnectionPool(object):
+    """
+    A keep-alive HTTP connection pool shared by all the REST calls of a single Opereto client.
+
+    :Parameters:
+    * *host* (`string`) -- Opereto center url, used to pre-connect
+    * *pool_connections* (`int`) -- Number of host pools to cache. Default is 10
+    * *pool_maxsize* (`int`) -- Maximum number of connections kept open per host. Default is 10
+    * *pool_block* (`bool`) -- Block when all the connections are in use instead of opening a new one. Default is False
+    * *pool_idle_timeout* (`int`) -- Seconds after which idle connections are dropped. Default is 60 (0 disables eviction)
+    * *pool_preconnect* (`bool`) -- Open a connection to the host when the pool is created. Default is False
+    * *pool_preconnect_timeout* (`float` or `tuple`) -- (connect, read) timeouts of the pre-connect request. Default is (2, 5)
+    * *headers* (`dict`) -- Default headers sent on every request
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(opereto_host=host, opereto_auth_token=token, pool_maxsize=50, pool_preconnect=True)
+    """
+
+    def __init__(self, host, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT, pool_preconnect=False, pool_preconnect_timeout=DEFAULT_PRECONNECT_TIMEOUT,
+                 headers=None):
+        self.host = host
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = pool_idle_timeout
+        self.headers = headers or {}
+        self.preconnect_timeout = pool_preconnect_timeout
+        self._lock = threading.Lock()
+        self._last_used = time.time()
+        self._session = None
+        if host and pool_preconnect:
+            self.preconnect()
+
+    def _create_session(self):
+        session = requests.Session()
+        session.verify = False
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _evict_idle_connections(self, session):
+        for adapter in session.adapters.values():
+            adapter.close()
+        logger.debug('Dropped idle connections to {}'.format(self.host))
+
+    @property
+    def session(self):
+        with self._lock:
+            now = time.time()
+            if self._session is None:
+                self._session = self._create_session()
+            elif self.idle_timeout and now - self._last_used > self.idle_timeout:
+                self._evict_idle_connections(self._session)
+            self._last_used = now
+            return self._session
+
+    def preconnect(self):
+        """
+        Opens a connection to the Opereto center so the TCP and TLS handshakes are not paid by the first API call.
+        """
+        try:
+            self.session.head(self.host + '/hello', timeout=self.preconnect_timeout)
+        except requests.exceptions.RequestException as e:
+            logger.debug('Failed to pre-connect to {}: {}'.format(self.host, str(e)))
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def reset_after_fork(self):
+        """
+        Drops the connections inherited from the parent process, keeping the session cookies (e.g. the login cookie).
+        """
+        self._lock = threading.Lock()
+        session = self._session
+        self._session = None
+        if session is not None:
+            self.session.cookies.update(session.cookies)
@@ -0,0 +1,168 @@
+import time
+import threading
+from pyopereto.exceptions import OperetoClientError
+from pyopereto.transport import OperetoTransportWrapper
+from pyopereto.context import current_call
+from pyopereto.endpoints import ENDPOINTS
+
+PRIORITY_CLASSES = ['control', 'status', 'properties', 'logs', 'bulk']
+
+# Client methods calling several endpoints; the others have their priority in pyopereto.endpoints.ENDPOINTS
+ENDPOINT_PRIORITIES = {
+    'status': ['wait_for']
+}
+
+DEFAULT_MAX_IN_FLIGHT = 10
+
+DEFAULT_BULKHEADS = {
+    'control': 4,
+    'status': 8,
+    'properties': 6,
+    'logs': 4,
+    'bulk': 2
+}
+
+
+def priority_class(endpoint, endpoint_priorities=None):
+    """
+    Returns the priority class of a client method, as given by *endpoint_priorities* or by its ENDPOINTS entry.
+    Other searches are 'bulk' calls and other methods are 'properties' calls.
+    """
+    for priority, endpoints in (endpoint_priorities or {}).items():
+        if endpoint in endpoints:
+            return priority
+    if endpoint in ENDPOINTS:
+        return ENDPOINTS[endpoint].priority
+    for priority, endpoints in ENDPOINT_PRIORITIES.items():
+        if endpoint in endpoints:
+            return priority
+    if endpoint and endpoint.startswith('search_'):
+        return 'bulk'
+    return 'properties'
+
+
+class PriorityDispatcher(object):
+    """
+    Dispatches the requests of a client by priority class: control > status > properties > logs > bulk.
+
+    | At most *max_in_flight* requests are sent at once, and each class is confined to its bulkhead (its own
+    | maximum number of requests in flight), so a log flood or a large upload cannot take all the slots.
+    | A free slot always goes to the highest priority class waiting for one. Control calls (e.g. stop_process)
+    | are only limited by their bulkhead, so they are never queued behind other classes.
+
+    :Parameters:
+    * *max_in_flight* (`int`) -- Maximum number of requests in flight, control calls excluded. Default is 10
+    * *bulkheads* (`dict`) -- Maximum number of requests in flight by class. Default is control 4, status 8, properties 6, logs 4, bulk 2
+    * *endpoint_priorities* (`dict`) -- Additional client method names by class (e.g. {'control': ['modify_process_summary']})
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(priority_dispatcher=PriorityDispatcher(max_in_flight=20, bulkheads={'logs': 8}))
+       print(opereto_client.priority_stats)
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, bulkheads=None, endpoint_priorities=None):
+        self.max_in_flight = max_in_flight
+        self.bulkheads = dict(DEFAULT_BULKHEADS)
+        self.bulkheads.update(bulkheads or {})
+        self.endpoint_priorities = endpoint_priorities or {}
+        self.in_flight = dict((priority, 0) for priority in PRIORITY_CLASSES)
+        self.waiting = dict((priority, 0) for priority in PRIORITY_CLASSES)
+        self.requests = dict((priority, 0) for priority in PRIORITY_CLASSES)
+        self.queued = dict((priority, 0) for priority in PRIORITY_CLASSES)
+        self.wait_time = dict((priority, 0.0) for priority in PRIORITY_CLASSES)
+        self.max_wait_time = dict((priority, 0.0) for priority in PRIORITY_CLASSES)
+        self._cond = threading.Condition()
+
+    def _bulkhead_full(self, priority):
+        bulkhead = self.bulkheads.get(priority)
+        return bulkhead is not None and self.in_flight[priority] >= bulkhead
+
+    def _can_run(self, priority):
+        if self._bulkhead_full(priority):
+            return False
+        if priority == 'control':
+            return True
+        if sum(self.in_flight[p] for p in PRIORITY_CLASSES[1:]) >= self.max_in_flight:
+            return False
+        for higher in PRIORITY_CLASSES[1:PRIORITY_CLASSES.index(priority)]:
+            if self.waiting[higher] and not self._bulkhead_full(higher):
+                return False
+        return True
+
+    def acquire(self, priority, timeout=None):
+        """
+        Waits for a request slot of the given class. Returns False if none is available within *timeout* seconds.
+        """
+        start = time.time()
+        with self._cond:
+            self.waiting[priority] += 1
+            try:
+                while not self._can_run(priority):
+                    remaining = start + timeout - time.time() if timeout is not None else None
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting[priority] -= 1
+            self.in_flight[priority] += 1
+            self.requests[priority] += 1
+            waited = time.time() - start
+            if waited > 0.001:
+                self.queued[priority] += 1
+                self.wait_time[priority] += waited
+                self.max_wait_time[priority] = max(self.max_wait_time[priority], waited)
+            self._cond.notify_all()
+            return True
+
+    def release(self, priority):
+        with self._cond:
+            self.in_flight[priority] -= 1
+            self._cond.notify_all()
+
+    def reset_after_fork(self):
+        self._cond = threading.Condition()
+        self.in_flight = dict((priority, 0) for priority in PRIORITY_CLASSES)
+        self.waiting = dict((priority, 0) for priority in PRIORITY_CLASSES)
+
+    def as_dict(self):
+        with self._cond:
+            return dict((priority, {
+                'in_flight': self.in_flight[priority],
+                'waiting': self.waiting[priority],
+                'requests': self.requests[priority],
+                'queued': self.queued[priority],
+                'wait_time': self.wait_time[priority],
+                'max_wait_time': self.max_wait_time[priority]
+            }) for priority in PRIORITY_CLASSES)
+
+
+class PriorityTransport(OperetoTransportWrapper):
+    """
+    Sends the requests of the API calls through a PriorityDispatcher.
+
+    | Enabled with the priority_dispatcher client option (True or a PriorityDispatcher). A call with a deadline
+    | fails with an OperetoClientError (code 408) instead of waiting for a slot past it.
+    """
+
+    def __init__(self, inner, dispatcher=None):
+        super(PriorityTransport, self).__init__(inner)
+        self.dispatcher = dispatcher or PriorityDispatcher()
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        context = current_call()
+        endpoint = context.endpoint if context else None
+        priority = priority_class(endpoint, self.dispatcher.endpoint_priorities)
+        if context:
+            context.priority = priority
+        if not self.dispatcher.acquire(priority, timeout=context.remaining() if context else None):
+            raise OperetoClientError(message='Deadline exceeded while waiting for a request slot of %s' % endpoint, code=408)
+        try:
+            return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+        finally:
+            self.dispatcher.release(priority)
+
+    def reset_after_fork(self):
+        self.dispatcher.reset_after_fork()
+        super(PriorityTransport, self).reset_after_fork()
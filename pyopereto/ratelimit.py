@@ -0,0 +1,202 @@
+import os
+import time
+import threading
+from pyopereto.exceptions import OperetoClientError
+from pyopereto.transport import OperetoTransportWrapper
+from pyopereto.context import current_call
+
+ENDPOINT_GROUPS = {
+    'process_creation': ['create_process', 'rerun_process'],
+    'status': ['get_process_status', 'get_process_info', 'get_process_flow', 'wait_for'],
+    'logging': ['send_process_log', 'get_process_log', 'get_process_rca']
+}
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def endpoint_group(endpoint):
+    """
+    Returns the rate limit group of a client method: 'process_creation', 'status', 'logging', 'search' or 'default'.
+    """
+    for group, endpoints in ENDPOINT_GROUPS.items():
+        if endpoint in endpoints:
+            return group
+    if endpoint and endpoint.startswith('search_'):
+        return 'search'
+    return 'default'
+
+
+class TokenBucket(object):
+    """
+    Token bucket allowing *rate* requests per second on average, with bursts of up to *burst* requests.
+
+    | Tokens are reserved under a lock and waited for outside of it, so concurrent callers are served in order.
+
+    :Parameters:
+    * *rate* (`float`) -- Requests per second
+    * *burst* (`int`) -- Bucket capacity. Default is max(1, rate)
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.burst
+        self.updated = time.time()
+        self._lock = threading.Lock()
+        self.sleep = time.sleep
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def reserve(self, max_wait=None):
+        """
+        Takes a token and returns the number of seconds to wait before using it.
+        Returns None, without taking a token, if the wait would exceed *max_wait* seconds.
+        """
+        with self._lock:
+            now = time.time()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= 1
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_time += wait
+                self.max_wait_time = max(self.max_wait_time, wait)
+            return wait
+
+    def acquire(self, max_wait=None):
+        """
+        Waits for a token. Returns False if it is not available within *max_wait* seconds.
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            self.sleep(wait)
+        return True
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'wait_time': self.wait_time,
+                'max_wait_time': self.max_wait_time,
+                'avg_wait_time': self.wait_time / self.throttled if self.throttled else 0.0
+            }
+
+
+def _as_bucket(limit):
+    if isinstance(limit, TokenBucket):
+        return limit
+    if isinstance(limit, (tuple, list)):
+        return TokenBucket(*limit)
+    return TokenBucket(limit)
+
+
+class RateLimiter(object):
+    """
+    Token buckets of the API calls sent to an Opereto center, by endpoint group or client method name.
+
+    | Calls whose group has no limit are not throttled. A call with a deadline fails with an
+    | OperetoClientError (code 408) instead of waiting past it.
+
+    :Parameters:
+    * *limits* (`dict`) -- Requests per second, a (rate, burst) tuple or a TokenBucket, by endpoint group
+    | ('process_creation', 'status', 'logging', 'search', 'default') or client method name
+    """
+
+    def __init__(self, limits=None):
+        self.buckets = {}
+        self._lock = threading.Lock()
+        self.configure(limits or {})
+
+    def configure(self, limits):
+        with self._lock:
+            for key, limit in limits.items():
+                bucket = _as_bucket(limit)
+                current = self.buckets.get(key)
+                if current is None or (current.rate, current.burst) != (bucket.rate, bucket.burst):
+                    self.buckets[key] = bucket
+
+    def bucket_for(self, endpoint):
+        return self.buckets.get(endpoint) or self.buckets.get(endpoint_group(endpoint))
+
+    def acquire(self, endpoint):
+        bucket = self.bucket_for(endpoint)
+        if bucket is None:
+            return
+        context = current_call()
+        remaining = context.remaining() if context else None
+        if not bucket.acquire(max_wait=remaining):
+            raise OperetoClientError(message='Deadline exceeded while waiting for the rate limit of %s' % endpoint, code=408)
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        for bucket in self.buckets.values():
+            bucket.reset_after_fork()
+
+    def stats(self):
+        """
+        Returns the request count and wait-time statistics of each token bucket.
+        """
+        return dict((key, bucket.as_dict()) for key, bucket in self.buckets.items())
+
+
+def get_rate_limiter(host, limits=None):
+    """
+    Returns the rate limiter shared by all the clients of the given Opereto host, updated with the given limits.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = RateLimiter()
+    if limits:
+        limiter.configure(limits)
+    return limiter
+
+
+def _reset_limiters_after_fork():
+    global _limiters_lock
+    _limiters_lock = threading.Lock()
+    for limiter in _limiters.values():
+        limiter.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_limiters_after_fork)
+
+
+class RateLimitedTransport(OperetoTransportWrapper):
+    """
+    Throttles the requests of the API calls according to a RateLimiter.
+
+    | Enabled with the rate_limits client option. All the clients of the same opereto_host, in all threads,
+    | share the same token buckets. Retries consume tokens like first attempts.
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(rate_limits={'process_creation': 5, 'status': (50, 100)})
+       print(opereto_client.rate_limit_stats)
+    """
+
+    def __init__(self, inner, limiter):
+        super(RateLimitedTransport, self).__init__(inner)
+        self.limiter = limiter
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        context = current_call()
+        self.limiter.acquire(context.endpoint if context else None)
+        return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
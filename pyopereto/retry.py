@@ -0,0 +1,331 @@
+import time
+import random
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from functools import wraps as _wraps
+import requests
+from pyopereto.exceptions import OperetoClientError
+from pyopereto.context import call_context
+
+try:
+    from email.utils import parsedate_to_datetime
+except ImportError:
+    parsedate_to_datetime = None
+
+logger = logging.getLogger('pyopereto')
+
+RETRY_OPTIONS = ['retry_policy', 'endpoint_retry_policies', 'retry_budget', 'circuit_breaker', 'safe_retry']
+
+
+def parse_retry_after(value):
+    """
+    Returns the number of seconds to wait according to a Retry-After header value (seconds or HTTP date), or None.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+        return max(0.0, (retry_date - datetime.now(retry_date.tzinfo)).total_seconds())
+    except Exception:
+        return None
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed API call is retried and how long to wait before the next attempt.
+
+    | Server errors (5xx), throttling (429) and connection errors are retried with an exponential backoff and full jitter.
+    | Errors raised by the client itself (e.g. a missing process identifier) are not retried.
+    | A Retry-After value sent by the server is honored (up to *max_retry_after* seconds).
+
+    :Parameters:
+    * *max_attempts* (`int`) -- Maximum number of attempts, including the first call. Default is 3
+    * *backoff_base* (`float`) -- Backoff of the first retry in seconds. Default is 0.5
+    * *backoff_factor* (`float`) -- Backoff multiplier between attempts. Default is 2
+    * *backoff_max* (`float`) -- Maximum backoff in seconds. Default is 30
+    * *jitter* (`bool`) -- Wait a random time between 0 and the backoff. Default is True
+    * *max_retry_after* (`float`) -- Maximum Retry-After value honored, in seconds. Default is 120
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(retry_policy=RetryPolicy(max_attempts=5),
+                                      endpoint_retry_policies={'get_process_status': RetryPolicy(max_attempts=10)})
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_factor=2, backoff_max=30, jitter=True, max_retry_after=120):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, error):
+        if isinstance(error, OperetoClientError):
+            return error.remote and (error.code >= 500 or error.code == 429)
+        return isinstance(error, requests.exceptions.RequestException)
+
+    def backoff(self, attempt, retry_after=None):
+        delay = min(self.backoff_max, self.backoff_base * self.backoff_factor ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+
+class RetryBudget(object):
+    """
+    Caps the number of retries of a client to a fraction of its calls over a sliding time window,
+    so that a failing center is not flooded with retries.
+
+    :Parameters:
+    * *ratio* (`float`) -- Maximum retries per call. Default is 0.2
+    * *min_retries* (`int`) -- Retries always allowed per window, regardless of the ratio. Default is 10
+    * *window* (`float`) -- Window length in seconds. Default is 10
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10, window=10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        for events in (self._calls, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_call(self):
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._calls.append(now)
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def has_room(self):
+        """
+        Returns True if the budget allows a retry, without consuming it.
+        """
+        with self._lock:
+            self._expire(time.time())
+            return len(self._retries) < self.min_retries + self.ratio * len(self._calls)
+
+    def can_retry(self):
+        """
+        Returns True and consumes a retry if the budget allows it.
+        """
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._calls):
+                return False
+            self._retries.append(now)
+            return True
+
+
+class CircuitBreaker(object):
+    """
+    Fails calls fast while the Opereto center is down.
+
+    | After *failure_threshold* consecutive failures the circuit opens and calls are rejected with an
+    | OperetoClientError (code 503) for *reset_timeout* seconds. A single trial call is then let through:
+    | the circuit closes if it succeeds and opens again otherwise. If the trial call ends without an outcome
+    | (e.g. it is interrupted), or reports none within *reset_timeout* seconds, another call is let through.
+
+    :Parameters:
+    * *failure_threshold* (`int`) -- Consecutive failures opening the circuit. Default is 10
+    * *reset_timeout* (`float`) -- Seconds the circuit stays open. Default is 30
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=10, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.time()
+            remaining = self.opened_at + self.reset_timeout - now
+            if (self.state == self.OPEN and remaining <= 0) or \
+                    (self.state == self.HALF_OPEN and now - self.trial_started >= self.reset_timeout):
+                self.state = self.HALF_OPEN
+                self.trial_started = now
+                return
+            raise OperetoClientError(message='Opereto center is unavailable (circuit breaker is open after %s consecutive failures)'
+                                     % self.failures, code=503, retry_after=max(0.0, remaining))
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release_trial(self):
+        """
+        Lets another call through when the trial call ended without reaching the Opereto center or getting its answer.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+
+class RetryController(object):
+    """
+    Runs the API calls of a client according to its retry policies, retry budget and circuit breaker.
+
+    :Parameters:
+    * *retry_policy* (`RetryPolicy`) -- Default policy of all the endpoints
+    * *endpoint_retry_policies* (`dict`) -- Policies by client method name (e.g. {'get_process_status': RetryPolicy(max_attempts=10)})
+    * *retry_budget* (`RetryBudget`) -- Retry budget shared by all the calls of the client, None disables it
+    * *circuit_breaker* (`CircuitBreaker`) -- Circuit breaker shared by all the calls of the client, True for a default one. Default is None (disabled)
+    * *safe_retry* (`bool` or `list`) -- Also retry non idempotent calls (e.g. create_process): True for all of them or a list of method names. Default is False
+    * *tracer* (`TraceRecorder`) -- Records every call (see pyopereto.trace), None disables it
+    """
+
+    def __init__(self, retry_policy=None, endpoint_retry_policies=None, retry_budget=True, circuit_breaker=None, safe_retry=False,
+                 tracer=None):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.endpoint_retry_policies = endpoint_retry_policies or {}
+        self.retry_budget = RetryBudget() if retry_budget is True else retry_budget
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else circuit_breaker
+        self.safe_retry = safe_retry
+        self.tracer = tracer
+        self.sleep = time.sleep
+
+    def reset_after_fork(self):
+        for lockable in (self.retry_budget, self.circuit_breaker):
+            if lockable:
+                lockable.reset_after_fork()
+
+    def policy_for(self, endpoint):
+        return self.endpoint_retry_policies.get(endpoint) or self.retry_policy
+
+    def _retry_allowed(self, endpoint, idempotent):
+        if idempotent or self.safe_retry is True:
+            return True
+        return bool(self.safe_retry) and endpoint in self.safe_retry
+
+    def call(self, endpoint, idempotent, f, *args, **kwargs):
+        """
+        Calls f(*args, **kwargs) as the given client method, retrying it according to the policies.
+        A deadline keyword argument (seconds) bounds the total time of the call, including all its retries.
+        """
+        deadline = kwargs.pop('deadline', None)
+        with call_context(endpoint, deadline=deadline) as context:
+            if self.tracer is None:
+                return self._call(context, idempotent, f, *args, **kwargs)
+            start = time.time()
+            rv = error = None
+            try:
+                rv = self._call(context, idempotent, f, *args, **kwargs)
+                return rv
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.tracer.record_call(context, f, args, kwargs, start, rv, error)
+
+    def _call(self, context, idempotent, f, *args, **kwargs):
+        endpoint = context.endpoint
+        policy = self.policy_for(endpoint)
+        if self.retry_budget:
+            self.retry_budget.record_call()
+        attempt = 0
+        while True:
+            context.check_deadline()
+            if self.circuit_breaker:
+                self.circuit_breaker.before_call()
+            context.attempt = attempt
+            context.attempt_started = time.time()
+            try:
+                rv = f(*args, **kwargs)
+            except (OperetoClientError, requests.exceptions.RequestException) as e:
+                logger.debug('API Call failed: %s', e)
+                retryable = policy.is_retryable(e)
+                if self.circuit_breaker:
+                    if retryable:
+                        self.circuit_breaker.record_failure()
+                    elif getattr(e, 'remote', True):
+                        self.circuit_breaker.record_success()
+                    else:
+                        # raised by the client, the center was not reached
+                        self.circuit_breaker.release_trial()
+                if not retryable or attempt + 1 >= policy.max_attempts or not self._retry_allowed(endpoint, idempotent):
+                    raise
+                delay = policy.backoff(attempt, getattr(e, 'retry_after', None))
+                remaining = context.remaining()
+                if remaining is not None and delay >= remaining:
+                    logger.debug('Not retrying %s, its deadline expires in %.2f seconds', endpoint, remaining)
+                    raise
+                if self.retry_budget and not self.retry_budget.can_retry():
+                    logger.debug('Retry budget exhausted, not retrying %s', endpoint)
+                    raise
+                logger.debug('Retrying %s in %.2f seconds (attempt %s of %s)', endpoint, delay, attempt + 2, policy.max_attempts)
+                self.sleep(delay)
+                attempt += 1
+            except BaseException:
+                # not an outcome of the Opereto center (e.g. a KeyboardInterrupt): do not leave a trial call pending
+                if self.circuit_breaker:
+                    self.circuit_breaker.release_trial()
+                raise
+            else:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_success()
+                return rv
+
+
+def pop_retry_options(kwargs):
+    """
+    Removes the retry options from the client keyword arguments and returns them as a dict.
+    """
+    return dict((key, kwargs.pop(key)) for key in RETRY_OPTIONS if key in kwargs)
+
+
+_default_controller = RetryController()
+
+
+def apicall(f=None, idempotent=True):
+    """
+    Decorates a client method so it runs through the client RetryController.
+    Non idempotent methods, decorated with apicall(idempotent=False), are retried only if opted in with safe_retry.
+    Decorated methods accept a deadline keyword argument: the number of seconds allowed for the call, including retries.
+    """
+    if f is None:
+        return lambda func: apicall(func, idempotent=idempotent)
+
+    @_wraps(f)
+    def f_call(self, *args, **kwargs):
+        controller = getattr(self, 'retry', None) or _default_controller
+        return controller.call(f.__name__, idempotent, f, self, *args, **kwargs)
+    return f_call
@@ -0,0 +1,80 @@
+import sys
+import threading
+from pyopereto.exceptions import OperetoClientError
+from pyopereto.transport import OperetoTransportWrapper
+from pyopereto.context import current_call
+
+
+class _Flight(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlightTransport(OperetoTransportWrapper):
+    """
+    Coalesces concurrent identical GET requests: while a GET of a URL is in flight, other GET requests of the
+    same URL wait for it and share its response or error instead of being sent.
+
+    | Enabled with the coalesce_requests client option. Only requests sent at the same time are coalesced,
+    | responses are never reused once the request completes.
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(coalesce_requests=True)
+       print(opereto_client.coalescing_stats['coalesced'])
+    """
+
+    def __init__(self, inner):
+        super(SingleFlightTransport, self).__init__(inner)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.coalesced = 0
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        if method.lower() != 'get' or data is not None or files:
+            return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+        with self._lock:
+            flight = self._flights.get(url)
+            leader = flight is None
+            if leader:
+                flight = self._flights[url] = _Flight()
+                self.requests += 1
+            else:
+                flight.followers += 1
+                self.coalesced += 1
+        if leader:
+            try:
+                flight.response = self.inner.request(method, url, headers=headers, timeout=timeout)
+                return flight.response
+            except Exception:
+                flight.error = sys.exc_info()[1]
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[url]
+                flight.done.set()
+        context = current_call()
+        if not flight.done.wait(context.remaining() if context and context.deadline is not None else None):
+            raise OperetoClientError(message='Deadline exceeded while waiting for a coalesced call of %s' % context.endpoint, code=408)
+        if flight.error is not None:
+            raise flight.error
+        return flight.response
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        super(SingleFlightTransport, self).reset_after_fork()
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._flights)
+            }
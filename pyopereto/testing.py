@@ -0,0 +1,654 @@
+"""
+In-process fake Opereto center for offline tests and benchmarks.
+
+| FakeOperetoServer implements the REST routes used by OperetoClient on top of the standard library HTTP server,
+| keeping all the entities in memory. Latency, error rate and process state machines are configurable, so client
+| throughput and resilience can be measured without a live Opereto center.
+
+:Example:
+.. code-block:: python
+
+   from pyopereto.testing import FakeOperetoServer
+
+   with FakeOperetoServer(latency=0.01, process_states=['registered', 'in_process', 'success']) as server:
+       client = server.client()
+       pid = client.create_process('my_service')
+       client.wait_to_end(pid)
+
+Pytest users may enable the fake_opereto_server and fake_opereto_client fixtures with:
+
+.. code-block:: python
+
+   pytest_plugins = ['pyopereto.testing']
+"""
+
+import re
+import gzip
+import json
+import base64
+import hashlib
+import time
+import uuid
+import random
+import threading
+from datetime import datetime
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+    from BaseHTTPServer import HTTPServer
+    from urlparse import urlparse, parse_qs
+
+    class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+
+FAKE_AUTH_TOKEN = 'fake-opereto-token'
+DEFAULT_PROCESS_STATES = ['registered', 'in_process', 'success']
+DEFAULT_STATE_INTERVAL = 0.1
+
+
+class FakeOperetoError(Exception):
+
+    def __init__(self, message, code=400):
+        self.message = message
+        self.code = code
+
+    def __str__(self):
+        return self.message
+
+
+def _new_id():
+    return uuid.uuid4().hex[:11]
+
+
+def _now():
+    return datetime.utcnow().isoformat()
+
+
+class FakeOperetoServer(object):
+    """
+    A local HTTP server emulating the Opereto center REST API.
+
+    :Parameters:
+    * *latency* (`float` or `callable`) -- Seconds added to every response, or a callable returning them. Default is 0
+    * *error_rate* (`float`) -- Fraction of requests failing with an HTTP error. Default is 0
+    * *error_code* (`int`) -- HTTP status of the injected errors (e.g. 503 for an unavailable node). Default is 500
+    * *process_states* (`list`) -- Statuses a new process goes through. Default is registered, in_process, success
+    * *state_interval* (`float`) -- Seconds a process stays in each status. The statuses advance with time, not with the
+      status requests, so duplicate (hedged or retried) requests see the same status. Default is 0.1
+    * *auth_token* (`string`) -- Bearer token accepted by the server
+    * *username* (`string`) -- Basic auth user name accepted by the server
+    * *password* (`string`) -- Basic auth password accepted by the server
+    * *seed* (`int`) -- Seed of the random generator used for error injection
+    * *compress_responses* (`int`) -- Gzip responses of at least this number of bytes when the client accepts it. Default is 1024 (None disables)
+    * *etags* (`bool`) -- Send an ETag with successful GET responses and answer matching If-None-Match requests with 304. Default is False
+    """
+
+    def __init__(self, latency=0, error_rate=0, process_states=None, auth_token=FAKE_AUTH_TOKEN, username='admin',
+                 password='admin', seed=None, compress_responses=1024, etags=False, host='127.0.0.1', port=0,
+                 state_interval=DEFAULT_STATE_INTERVAL, error_code=500):
+        self.compress_responses = compress_responses
+        self.etags = etags
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.process_states = list(process_states or DEFAULT_PROCESS_STATES)
+        self.state_interval = state_interval
+        self.auth_token = auth_token
+        self.username = username
+        self.password = password
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.requests = []
+        self.reset()
+        self._httpd = _FakeHTTPServer((host, port), _FakeOperetoHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake_server = self
+        self._thread = None
+
+    def reset(self):
+        with self.lock:
+            self.requests = []
+            self.services = {}
+            self.sandbox = {}
+            self.processes = {}
+            self.agents = {}
+            self.environments = {}
+            self.globals = {}
+            self.kpi = {}
+            self.features = {}
+            self.qc = {}
+            self.dimensions = {}
+            self.tests = {}
+            self.users = {}
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name='FakeOperetoServer')
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def client(self, basic_auth=False, **kwargs):
+        """
+        Returns an OperetoClient connected to this server.
+
+        :Parameters:
+        * *basic_auth* (`bool`) -- Use user/password authentication instead of an auth token. Default is False
+        * *kwargs* -- Additional client options (e.g. transport)
+        """
+        from pyopereto.client import OperetoClient
+        if basic_auth:
+            return OperetoClient(opereto_host=self.url, opereto_user=self.username, opereto_password=self.password, **kwargs)
+        return OperetoClient(opereto_host=self.url, opereto_auth_token=self.auth_token, **kwargs)
+
+    def add_process(self, service='fake_service', states=None, name=None, properties=None):
+        """
+        Adds a process to the server and returns its pid.
+
+        :Parameters:
+        * *service* (`string`) -- Service identifier
+        * *states* (`list`) -- Statuses the process goes through. Default is the server process_states
+        * *name* (`string`) -- Process title
+        * *properties* (`dict`) -- Process input properties
+        """
+        pid = _new_id()
+        with self.lock:
+            self.processes[pid] = {
+                'id': pid, 'service_id': service, 'name': name or service,
+                'states': list(states or self.process_states), 'states_set_at': time.time(),
+                'properties': dict(properties or {}), 'output': {},
+                'log': [], 'cache': {}, 'summary': '', 'datastores': {}, 'date_created': _now()
+            }
+        return pid
+
+    def set_process_states(self, pid, states):
+        """
+        Restarts the statuses a process goes through.
+        """
+        with self.lock:
+            self.processes[pid]['states'] = list(states)
+            self.processes[pid]['states_set_at'] = time.time()
+
+    def process_status(self, pid):
+        """
+        Returns the current status of a process.
+        """
+        with self.lock:
+            process = self.processes[pid]
+            states = process['states']
+            if not self.state_interval:
+                return states[-1]
+            elapsed = time.time() - process['states_set_at']
+            return states[min(int(elapsed / self.state_interval), len(states) - 1)]
+
+    ## request handling
+    def _delay(self):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def _authorized(self, headers):
+        authorization = headers.get('Authorization') or ''
+        if authorization.startswith('Bearer '):
+            return authorization[len('Bearer '):] == self.auth_token
+        if authorization.startswith('Basic '):
+            credentials = base64.b64decode(authorization[len('Basic '):]).decode('utf-8')
+            return credentials == '%s:%s' % (self.username, self.password)
+        return False
+
+    def handle(self, method, path, headers, body):
+        """
+        Dispatches a request to its route and returns the HTTP status code and the response json.
+        """
+        self._delay()
+        parsed = urlparse(path)
+        with self.lock:
+            self.requests.append((method, parsed.path))
+        if not self._authorized(headers):
+            return 403, {'status': 'failure', 'message': 'Access is forbidden'}
+        with self.lock:
+            failed = self.error_rate and self.random.random() < self.error_rate
+        if failed:
+            return self.error_code, {'status': 'failure', 'message': 'Injected server error'}
+        query = dict((k, v[0]) for k, v in parse_qs(parsed.query).items())
+        for route_method, pattern, handler_name in ROUTES:
+            if route_method != method:
+                continue
+            m = pattern.match(parsed.path)
+            if m:
+                data = body
+                if body and not headers.get('Content-Type', '').startswith('multipart') and handler_name != '_upload':
+                    try:
+                        data = json.loads(body.decode('utf-8'))
+                    except ValueError:
+                        pass
+                try:
+                    with self.lock:
+                        result = getattr(self, handler_name)(data, query, *m.groups())
+                except FakeOperetoError as e:
+                    return e.code, {'status': 'failure', 'message': e.message}
+                return 200, {'status': 'success', 'data': result}
+        return 404, {'status': 'failure', 'message': 'Route not found: %s %s' % (method, parsed.path)}
+
+    def _get(self, collection, key, kind):
+        try:
+            return collection[key]
+        except KeyError:
+            raise FakeOperetoError('%s [%s] does not exist' % (kind, key), code=404)
+
+    def _search(self, entities, data):
+        data = data or {}
+        start = int(data.get('start') or 0)
+        limit = int(data.get('limit') or 100)
+        pattern = ((data.get('filter') or {}).get('generic') or '').lower()
+        results = [e for e in entities if not pattern or pattern in json.dumps(e, sort_keys=True).lower()]
+        return results[start:start + limit]
+
+    ## general
+    def _hello(self, data, query):
+        return 'Hello, welcome to Opereto fake center'
+
+    def _login(self, data, query):
+        return None
+
+    ## services
+    def _search_entities(self, data, query, entity):
+        collections = {
+            'services': self.services, 'agents': self.agents, 'environments': self.environments,
+            'globals': self.globals, 'kpi': self.kpi, 'features': self.features, 'qc': self.qc,
+            'dimensions': self.dimensions, 'tests': self.tests, 'users': self.users
+        }
+        if entity not in collections:
+            raise FakeOperetoError('Unknown search entity [%s]' % entity, code=404)
+        return self._search(list(collections[entity].values()), data)
+
+    def _upload(self, data, query, mode, rest):
+        parts = [p for p in (rest or '').split('/') if p]
+        if mode == 'production':
+            version = parts[0] if parts else 'default'
+            service_id = parts[1] if len(parts) > 1 else _new_id()
+        else:
+            version = mode
+            service_id = parts[0] if parts else _new_id()
+        service = self.services.setdefault(service_id, {'id': service_id, 'type': 'action', 'versions': [], 'audit': []})
+        if mode == 'production':
+            if version not in service['versions']:
+                service['versions'].append(version)
+        else:
+            self.sandbox[service_id] = service
+        service.setdefault('specs', {})[mode + '/' + version] = {'size': len(data or b''), 'comment': query.get('comment')}
+        return service_id
+
+    def _get_service(self, data, query, service_id):
+        return self._get(self.services, service_id, 'Service')
+
+    def _get_service_version(self, data, query, service_id, mode, version):
+        service = self._get(self.services, service_id, 'Service')
+        actual_version = version if version in service['versions'] else ('default' if 'default' in service['versions'] else None)
+        return {'id': service_id, 'actual_version': actual_version, 'mode': mode, 'spec': {'type': service['type']},
+                'description': '', 'sam': {}}
+
+    def _modify_service(self, data, query):
+        data = data or {}
+        service_id = data.get('id') or _new_id()
+        service = self.services.setdefault(service_id, {'id': service_id, 'type': 'action', 'versions': [], 'audit': []})
+        if data.get('type'):
+            service['type'] = data['type']
+        if data.get('repository'):
+            version = data.get('service_version') or 'default'
+            if version not in service['versions']:
+                service['versions'].append(version)
+        return service
+
+    def _verify_service(self, data, query):
+        return {'errors': [], 'warnings': [], 'success': True}
+
+    def _delete_service(self, data, query, service_id):
+        self._get(self.services, service_id, 'Service')
+        del self.services[service_id]
+        self.sandbox.pop(service_id, None)
+
+    def _delete_service_version(self, data, query, service_id, mode, version):
+        service = self._get(self.services, service_id, 'Service')
+        if mode == 'development':
+            self.sandbox.pop(service_id, None)
+        elif version in service['versions']:
+            service['versions'].remove(version)
+
+    def _list_sandbox(self, data, query):
+        return sorted(self.sandbox)
+
+    def _purge_sandbox(self, data, query):
+        for service_id in list(self.sandbox):
+            self.services.pop(service_id, None)
+        self.sandbox.clear()
+
+    ## environments
+    def _get_environment(self, data, query, environment_id):
+        return self._get(self.environments, environment_id, 'Environment')
+
+    def _modify_environment(self, data, query):
+        data = dict(data or {})
+        environment_id = data.get('id') or _new_id()
+        data['id'] = environment_id
+        self.environments.setdefault(environment_id, {}).update(data)
+        return environment_id
+
+    def _verify_environment(self, data, query):
+        return {'errors': [], 'agents': {}, 'success': True, 'warnings': []}
+
+    def _delete_environment(self, data, query, environment_id):
+        self._get(self.environments, environment_id, 'Environment')
+        del self.environments[environment_id]
+
+    ## agents
+    def _get_all_agents(self, data, query):
+        return list(self.agents.values())
+
+    def _get_agent(self, data, query, agent_id):
+        return self._get(self.agents, agent_id, 'Agent')
+
+    def _modify_agent(self, data, query):
+        data = dict(data or {})
+        agent_id = data.get('id') or _new_id()
+        agent = self.agents.setdefault(agent_id, {'id': agent_id, 'online': False, 'properties': {}})
+        agent.update(data)
+        return agent_id
+
+    def _get_agent_properties(self, data, query, agent_id):
+        agent = self._get(self.agents, agent_id, 'Agent')
+        return {'name': agent.get('name'), 'custom': agent['properties']}
+
+    def _modify_agent_properties(self, data, query, agent_id):
+        agent = self._get(self.agents, agent_id, 'Agent')
+        agent['properties'].update(data or {})
+
+    def _delete_agent(self, data, query, agent_id):
+        self._get(self.agents, agent_id, 'Agent')
+        del self.agents[agent_id]
+
+    ## processes
+    def _create_process(self, data, query):
+        data = dict(data or {})
+        properties = data.pop('properties', None) or {}
+        properties.update(data)
+        return [self.add_process(service=data.get('service_id'), name=data.get('name'), properties=properties)]
+
+    def _process(self, pid):
+        return self._get(self.processes, pid, 'Process')
+
+    def _rerun_process(self, data, query, pid):
+        process = self._process(pid)
+        return [self.add_process(service=process['service_id'], name=(data or {}).get('name') or process['name'],
+                                 properties=process['properties'])]
+
+    def _get_process_info(self, data, query, pid):
+        process = self._process(pid)
+        return {'id': pid, 'service_id': process['service_id'], 'name': process['name'],
+                'status': self.process_status(pid),
+                'summary': process['summary'], 'date_created': process['date_created']}
+
+    def _get_process_status(self, data, query, pid):
+        self._process(pid)
+        return self.process_status(pid)
+
+    def _get_process_flow(self, data, query, pid):
+        return {'id': pid, 'children': []}
+
+    def _get_process_rca(self, data, query, pid):
+        self._process(pid)
+        return []
+
+    def _get_process_properties(self, data, query, pid):
+        process = self._process(pid)
+        return {'input': process['properties'], 'output': process['output']}
+
+    def _modify_process_output(self, data, query, pid):
+        process = self._process(pid)
+        data = data or {}
+        if 'properties' in data:
+            process['output'].update(data['properties'])
+        else:
+            process['output'][data.get('key')] = data.get('value')
+
+    def _modify_process_summary(self, data, query, pid):
+        self._process(pid)['summary'] = (data or {}).get('data') or ''
+
+    def _stop_process(self, data, query, pid, status):
+        self.set_process_states(pid, [status])
+
+    def _get_process_log(self, data, query, pid):
+        log = self._process(pid)['log']
+        start = int(query.get('start') or 0)
+        limit = int(query.get('limit') or 1000)
+        return {'list': log[start:start + limit]}
+
+    def _send_process_log(self, data, query, pid):
+        log = self._process(pid)['log']
+        for entry in (data or {}).get('data') or []:
+            entry = dict(entry)
+            entry['level'] = (entry.get('level') or 'info').lower()
+            log.append(entry)
+
+    def _search_process_log(self, data, query, pid):
+        return self._search(self._process(pid)['log'], data)
+
+    def _get_process_cache(self, data, query, pid):
+        return self._process(pid)['cache'].get(query.get('key'))
+
+    def _set_process_cache(self, data, query, pid):
+        data = data or {}
+        self._process(pid)['cache'][data.get('key')] = data.get('value')
+
+    def _upload_datastore(self, data, query, pid, datastore_id):
+        self._process(pid)['datastores'][datastore_id] = len(data or b'')
+
+    ## kpi, features, qc, dimensions, tests, globals
+    def _modify_kpi(self, data, query):
+        data = dict(data or {})
+        key = '%s/%s' % (data.get('kpi_id'), data.get('product_id'))
+        kpi = self.kpi.get(key)
+        if kpi and data.get('append'):
+            kpi['measures'] += data.get('measures') or []
+        else:
+            self.kpi[key] = data
+        return key
+
+    def _get_kpi(self, data, query, kpi_id, product_id):
+        return self._get(self.kpi, '%s/%s' % (kpi_id, product_id), 'Kpi')
+
+    def _delete_kpi(self, data, query, kpi_id, product_id):
+        self._get(self.kpi, '%s/%s' % (kpi_id, product_id), 'Kpi')
+        del self.kpi['%s/%s' % (kpi_id, product_id)]
+
+    def _create_feature(self, data, query):
+        data = dict(data or {})
+        self.features['%s/%s' % (data.get('feature_id'), data.get('product_id'))] = data
+        return data.get('feature_id')
+
+    def _modify_qc(self, data, query):
+        data = dict(data or {})
+        qc_id = data.get('id') or _new_id()
+        data['id'] = qc_id
+        self.qc.setdefault(qc_id, {}).update(data)
+        return qc_id
+
+    def _get_qc(self, data, query, qc_id):
+        return self._get(self.qc, qc_id, 'Quality criteria')
+
+    def _delete_qc(self, data, query, qc_id):
+        self._get(self.qc, qc_id, 'Quality criteria')
+        del self.qc[qc_id]
+
+    def _modify_dimension(self, data, query):
+        data = dict(data or {})
+        dimension_id = data.get('id') or _new_id()
+        self.dimensions.setdefault(dimension_id, {}).update(data)
+        return dimension_id
+
+    def _get_dimension(self, data, query, dimension_id):
+        return self._get(self.dimensions, dimension_id, 'Dimension')
+
+    def _delete_dimension(self, data, query, dimension_id):
+        self._get(self.dimensions, dimension_id, 'Dimension')
+        del self.dimensions[dimension_id]
+
+    def _get_test(self, data, query, test_id):
+        return self._get(self.tests, test_id, 'Test')
+
+    def _get_global(self, data, query, name):
+        return self._get(self.globals, name, 'Global')
+
+
+def _route(method, pattern, handler_name):
+    return method, re.compile('^' + pattern + '$'), handler_name
+
+
+_ID = '([^/?]+)'
+
+ROUTES = [
+    _route('GET', '/hello', '_hello'),
+    _route('POST', '/login', '_login'),
+    _route('GET', '/logout', '_login'),
+    _route('POST', '/search/' + _ID, '_search_entities'),
+    _route('POST', '/services/upload/' + _ID + '(/.*)?', '_upload'),
+    _route('POST', '/services/verify', '_verify_service'),
+    _route('GET', '/services/sandbox', '_list_sandbox'),
+    _route('DELETE', '/services/sandbox', '_purge_sandbox'),
+    _route('POST', '/services', '_modify_service'),
+    _route('GET', '/services/' + _ID, '_get_service'),
+    _route('DELETE', '/services/' + _ID, '_delete_service'),
+    _route('GET', '/services/' + _ID + '/' + _ID + '/' + _ID, '_get_service_version'),
+    _route('DELETE', '/services/' + _ID + '/' + _ID + '/' + _ID, '_delete_service_version'),
+    _route('POST', '/environments/verify', '_verify_environment'),
+    _route('POST', '/environments', '_modify_environment'),
+    _route('GET', '/environments/' + _ID, '_get_environment'),
+    _route('DELETE', '/environments/' + _ID, '_delete_environment'),
+    _route('GET', '/agents/all', '_get_all_agents'),
+    _route('POST', '/agents', '_modify_agent'),
+    _route('GET', '/agents/' + _ID, '_get_agent'),
+    _route('DELETE', '/agents/' + _ID, '_delete_agent'),
+    _route('GET', '/agents/' + _ID + '/properties', '_get_agent_properties'),
+    _route('POST', '/agents/' + _ID + '/properties', '_modify_agent_properties'),
+    _route('POST', '/processes', '_create_process'),
+    _route('GET', '/processes/' + _ID, '_get_process_info'),
+    _route('POST', '/processes/' + _ID + '/rerun', '_rerun_process'),
+    _route('GET', '/processes/' + _ID + '/status', '_get_process_status'),
+    _route('GET', '/processes/' + _ID + '/flow', '_get_process_flow'),
+    _route('GET', '/processes/' + _ID + '/rca', '_get_process_rca'),
+    _route('GET', '/processes/' + _ID + '/properties', '_get_process_properties'),
+    _route('POST', '/processes/' + _ID + '/output', '_modify_process_output'),
+    _route('POST', '/processes/' + _ID + '/summary', '_modify_process_summary'),
+    _route('POST', '/processes/' + _ID + '/terminate/' + _ID, '_stop_process'),
+    _route('GET', '/processes/' + _ID + '/log', '_get_process_log'),
+    _route('POST', '/processes/' + _ID + '/log', '_send_process_log'),
+    _route('POST', '/processes/' + _ID + '/log/search', '_search_process_log'),
+    _route('GET', '/processes/' + _ID + '/cache', '_get_process_cache'),
+    _route('POST', '/processes/' + _ID + '/cache', '_set_process_cache'),
+    _route('POST', '/processes/' + _ID + '/datastore/' + _ID, '_upload_datastore'),
+    _route('POST', '/kpi', '_modify_kpi'),
+    _route('GET', '/kpi/' + _ID + '/' + _ID, '_get_kpi'),
+    _route('DELETE', '/kpi/' + _ID + '/' + _ID, '_delete_kpi'),
+    _route('POST', '/features', '_create_feature'),
+    _route('POST', '/qc', '_modify_qc'),
+    _route('GET', '/qc/' + _ID, '_get_qc'),
+    _route('DELETE', '/qc/' + _ID, '_delete_qc'),
+    _route('POST', '/dimensions', '_modify_dimension'),
+    _route('GET', '/dimensions/' + _ID, '_get_dimension'),
+    _route('DELETE', '/dimensions/' + _ID, '_delete_dimension'),
+    _route('GET', '/tests/' + _ID, '_get_test'),
+    _route('GET', '/globals/' + _ID, '_get_global'),
+]
+
+
+class _FakeOperetoHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if body and self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return body
+
+    def _respond(self):
+        fake_server = self.server.fake_server
+        body = self._read_body()
+        status_code, response_json = fake_server.handle(self.command, self.path, self.headers, body)
+        content = json.dumps(response_json).encode('utf-8')
+        etag = None
+        if fake_server.etags and self.command == 'GET' and status_code == 200:
+            etag = '"%s"' % hashlib.md5(content).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                status_code, content = 304, b''
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        if self.command == 'POST' and self.path == '/login' and status_code == 200:
+            self.send_header('Set-Cookie', 'JSESSIONID=%s; Path=/; HttpOnly' % _new_id())
+        if etag:
+            self.send_header('ETag', etag)
+        if fake_server.compress_responses is not None and len(content) >= fake_server.compress_responses and \
+                'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            content = gzip.compress(content)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+if pytest is not None:
+
+    @pytest.fixture
+    def fake_opereto_server():
+        """
+        A running FakeOperetoServer, stopped at the end of the test.
+        """
+        with FakeOperetoServer(process_states=['in_process', 'success']) as server:
+            yield server
+
+    @pytest.fixture
+    def fake_opereto_client(fake_opereto_server):
+        """
+        An OperetoClient connected to the fake_opereto_server fixture.
+        """
+        return fake_opereto_server.client()
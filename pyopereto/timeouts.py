@@ -0,0 +1,77 @@
+from pyopereto.context import current_call
+
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    'search': (DEFAULT_CONNECT_TIMEOUT, 300),
+    'upload': (DEFAULT_CONNECT_TIMEOUT, 600)
+}
+
+UPLOAD_ENDPOINTS = ['upload_service_version', 'upload_datastore']
+
+TIMEOUT_OPTIONS = ['timeout', 'endpoint_timeouts']
+
+
+def endpoint_class(endpoint):
+    """
+    Returns the timeout class of a client method: 'upload', 'search' or 'default'.
+    """
+    if endpoint in UPLOAD_ENDPOINTS:
+        return 'upload'
+    if endpoint and endpoint.startswith('search_'):
+        return 'search'
+    return 'default'
+
+
+def _as_pair(timeout):
+    if isinstance(timeout, (tuple, list)):
+        return tuple(timeout)
+    return timeout, timeout
+
+
+class Timeouts(object):
+    """
+    Connect and read timeouts of the requests sent by a client.
+
+    | Timeouts are looked up by client method name, then by endpoint class ('upload', 'search' or 'default').
+    | When the running call has a deadline, the timeouts are shortened so the request never overruns it.
+
+    :Parameters:
+    * *timeout* (`float` or `tuple`) -- Default (connect, read) timeouts in seconds, or a single value for both. Default is (10, 60)
+    * *endpoint_timeouts* (`dict`) -- Timeouts by endpoint class or client method name (e.g. {'upload': (10, 1200), 'get_process_status': 5})
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(timeout=(5, 30), endpoint_timeouts={'search': (5, 120)})
+    """
+
+    def __init__(self, timeout=None, endpoint_timeouts=None):
+        self.default = _as_pair(timeout) if timeout is not None else (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        for key, value in (endpoint_timeouts or {}).items():
+            self.endpoint_timeouts[key] = _as_pair(value)
+
+    def for_endpoint(self, endpoint):
+        return self.endpoint_timeouts.get(endpoint) or self.endpoint_timeouts.get(endpoint_class(endpoint)) or self.default
+
+    def for_current_call(self):
+        """
+        Returns the (connect, read) timeouts of a request sent by the API call running in the current thread.
+        """
+        context = current_call()
+        connect, read = self.for_endpoint(context.endpoint if context else None)
+        remaining = context.remaining() if context else None
+        if remaining is not None:
+            remaining = max(remaining, 0.001)
+            connect = min(connect, remaining) if connect is not None else remaining
+            read = min(read, remaining) if read is not None else remaining
+        return connect, read
+
+
+def pop_timeout_options(kwargs):
+    """
+    Removes the timeout options from the client keyword arguments and returns them as a dict.
+    """
+    return dict((key, kwargs.pop(key)) for key in TIMEOUT_OPTIONS if key in kwargs)
@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from pyopereto.forksafe import register_after_fork
+
+logger = logging.getLogger('pyopereto')
+
+TRACE_ENV_VAR = 'opereto_trace_file'
+DEFAULT_TRACE_FILE = 'pyopereto_trace.jsonl'
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_BUFFER = 10000
+
+# Client methods polling the status of processes
+POLL_ENDPOINTS = ['get_process_status', 'get_process_info', 'wait_for']
+
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def _call_arguments(f, args, kwargs):
+    names = f.__code__.co_varnames[:f.__code__.co_argcount]
+    values = dict(zip(names, args))
+    values.update(kwargs)
+    return names, values
+
+
+def _scalar(value):
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return str(value)[:200]
+    return None
+
+
+class TraceRecorder(object):
+    """
+    Appends one JSON line per client API call to a trace file.
+
+    | Each line holds the call start time (ts), the client method (endpoint), its pid and first argument (target)
+    | when it has ones, its status ('success', the error code or the error class name), latency, number of HTTP
+    | requests, request and response bytes, retries, number of results for list results, parent call and thread.
+    | Calls only add an entry to a buffer: the lines are encoded and written by a background thread every
+    | *flush_interval* seconds, and when the process exits. Entries are dropped (and counted) if the buffer is full.
+
+    :Parameters:
+    * *path* (`string`) -- Trace file path, opened in append mode
+    * *flush_interval* (`float`) -- Seconds between writes of the buffered lines. Default is 1
+    * *max_buffer* (`int`) -- Maximum number of buffered lines. Default is 10000
+
+    :Example:
+    .. code-block:: python
+
+       opereto_client = OperetoClient(trace='/tmp/opereto_trace.jsonl')
+       # or: export opereto_trace_file=/tmp/opereto_trace.jsonl
+       # then: opereto trace analyze /tmp/opereto_trace.jsonl
+    """
+
+    def __init__(self, path, flush_interval=DEFAULT_FLUSH_INTERVAL, max_buffer=DEFAULT_MAX_BUFFER):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.recorded = 0
+        self.dropped = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+        atexit.register(self.close)
+        register_after_fork(self)
+
+    def record(self, entry):
+        with self._lock:
+            if self._closed:
+                return
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._buffer.append(entry)
+            self.recorded += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='pyopereto-trace')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def record_call(self, context, f, args, kwargs, start, result=None, error=None):
+        """
+        Records an API call, as run by RetryController.call.
+        """
+        names, values = _call_arguments(f, args, kwargs)
+        pid = values.get('pid')
+        if 'pid' in names and pid is None and names and hasattr(values.get(names[0]), 'input'):
+            pid = values[names[0]].input.get('pid')
+        if error is None:
+            status = 'success'
+        else:
+            status = str(getattr(error, 'code', None) or error.__class__.__name__)
+        self.record({
+            'ts': round(start, 6),
+            'endpoint': context.endpoint,
+            'pid': _scalar(pid),
+            'target': _scalar(values.get(names[1])) if len(names) > 1 else None,
+            'status': status,
+            'latency': round(time.time() - start, 6),
+            'requests': context.requests,
+            'request_bytes': context.request_bytes,
+            'response_bytes': context.response_bytes,
+            'retries': context.attempt,
+            'results': len(result) if isinstance(result, list) else None,
+            'parent': context.parent.endpoint if context.parent else None,
+            'thread': threading.current_thread().ident
+        })
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered lines to the trace file.
+        """
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return
+        data = ''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries)
+        with self._write_lock:
+            try:
+                with open(self.path, 'a') as f:
+                    f.write(data)
+            except (IOError, OSError) as e:
+                logger.debug('Failed to write the call trace to %s: %s', self.path, e)
+
+    def close(self):
+        """
+        Stops the background writer and writes the buffered lines.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.flush_interval + 1)
+        self.flush()
+
+    def reset_after_fork(self):
+        # the lines buffered by the parent process are written by the parent
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._buffer = []
+        self._thread = None
+
+
+def get_trace_recorder(path):
+    """
+    Returns the TraceRecorder of the given trace file, shared by all the clients of the process.
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    with _recorders_lock:
+        recorder = _recorders.get(path)
+        if recorder is None or recorder._closed:
+            recorder = _recorders[path] = TraceRecorder(path)
+        return recorder
+
+
+def create_tracer(trace=None):
+    """
+    Returns the TraceRecorder of a client: None (the opereto_trace_file environment variable, if set, names the
+    trace file), False (disabled), True (pyopereto_trace.jsonl in the working directory), a trace file path or a
+    TraceRecorder instance.
+    """
+    if trace is None:
+        trace = os.environ.get(TRACE_ENV_VAR) or None
+    if not trace:
+        return None
+    if isinstance(trace, TraceRecorder):
+        return trace
+    return get_trace_recorder(DEFAULT_TRACE_FILE if trace is True else trace)
+
+
+def read_trace(path):
+    """
+    Returns the entries of a trace file, skipping malformed lines.
+    """
+    entries = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def _n_plus_one(entries, min_repeat):
+    patterns = {}
+    threads = {}
+    for entry in entries:
+        threads.setdefault(entry.get('thread'), []).append(entry)
+
+    def close_run(source, run):
+        targets = set(e.get('target') for e in run if e.get('target') is not None)
+        if len(targets) >= min_repeat:
+            key = (source, run[0]['endpoint'])
+            pattern = patterns.setdefault(key, {'source': source, 'endpoint': run[0]['endpoint'], 'occurrences': 0,
+                                                'calls': 0, 'total_time': 0.0})
+            pattern['occurrences'] += 1
+            pattern['calls'] += len(run)
+            pattern['total_time'] += sum(e.get('latency') or 0 for e in run)
+
+    for thread_entries in threads.values():
+        source = None
+        run = []
+        for entry in sorted(thread_entries, key=lambda e: e.get('ts') or 0):
+            if entry.get('parent'):
+                continue
+            if run and entry['endpoint'] == run[0]['endpoint']:
+                run.append(entry)
+                continue
+            if run:
+                close_run(source, run)
+            if entry.get('results') is not None:
+                source, run = entry['endpoint'], []
+            else:
+                run = [entry]
+        if run:
+            close_run(source, run)
+    return sorted(patterns.values(), key=lambda p: -p['total_time'])
+
+
+def _polling(entries):
+    pids = {}
+    for entry in entries:
+        if entry.get('endpoint') in POLL_ENDPOINTS and entry.get('pid') and not entry.get('parent'):
+            stats = pids.setdefault(entry['pid'], {'pid': entry['pid'], 'polls': 0, 'first': entry['ts'], 'last': entry['ts']})
+            stats['polls'] += entry.get('requests') or 1
+            stats['first'] = min(stats['first'], entry['ts'])
+            stats['last'] = max(stats['last'], entry['ts'] + (entry.get('latency') or 0))
+    rv = []
+    for stats in pids.values():
+        span = stats.pop('last') - stats.pop('first')
+        stats['span'] = span
+        stats['polls_per_minute'] = stats['polls'] * 60.0 / span if span > 0 else None
+        stats['mean_interval'] = span / (stats['polls'] - 1) if stats['polls'] > 1 else None
+        rv.append(stats)
+    return sorted(rv, key=lambda s: -s['polls'])
+
+
+def analyze_trace(entries, top=10, min_repeat=5):
+    """
+    Summarizes trace entries (see read_trace).
+
+    | Returns a dict of the total number of calls and of the top *top* items of:
+    | endpoints: calls, total and mean latency, errors, retries and bytes by client method, by total time
+    | n_plus_one: runs of at least *min_repeat* calls of the same method with different targets (e.g. get_service
+    | once per search_services result), by the method returning the list (source) and the called method
+    | polling: number of status polls of each pid, polls per minute and mean interval between polls
+    """
+    endpoints = {}
+    for entry in entries:
+        stats = endpoints.setdefault(entry.get('endpoint'), {
+            'endpoint': entry.get('endpoint'), 'calls': 0, 'total_time': 0.0, 'errors': 0, 'retries': 0,
+            'request_bytes': 0, 'response_bytes': 0
+        })
+        stats['calls'] += 1
+        stats['total_time'] += entry.get('latency') or 0
+        stats['errors'] += entry.get('status') != 'success'
+        stats['retries'] += entry.get('retries') or 0
+        stats['request_bytes'] += entry.get('request_bytes') or 0
+        stats['response_bytes'] += entry.get('response_bytes') or 0
+    for stats in endpoints.values():
+        stats['mean_time'] = stats['total_time'] / stats['calls']
+    timestamps = [entry['ts'] for entry in entries if entry.get('ts')]
+    return {
+        'calls': len(entries),
+        'duration': max(timestamps) - min(timestamps) if timestamps else 0,
+        'endpoints': sorted(endpoints.values(), key=lambda s: -s['total_time'])[:top],
+        'n_plus_one': _n_plus_one(entries, min_repeat)[:top],
+        'polling': _polling(entries)[:top]
+    }
+
+
+def format_trace_report(report):
+    """
+    Returns an analyze_trace report as text.
+    """
+    lines = ['%d calls over %.1f seconds' % (report['calls'], report['duration']), '', 'Top endpoints by total time:',
+             '  %-32s %8s %10s %10s %7s %8s %12s' % ('endpoint', 'calls', 'total (s)', 'mean (ms)', 'errors', 'retries', 'bytes in')]
+    for s in report['endpoints']:
+        lines.append('  %-32s %8d %10.2f %10.1f %7d %8d %12d' % (s['endpoint'], s['calls'], s['total_time'], s['mean_time'] * 1000,
+                                                               s['errors'], s['retries'], s['response_bytes']))
+    lines += ['', 'N+1 patterns:']
+    if not report['n_plus_one']:
+        lines.append('  none found')
+    for p in report['n_plus_one']:
+        lines.append('  %s called %d times in %d runs%s (%.2f s)' % (
+            p['endpoint'], p['calls'], p['occurrences'], ' after %s' % p['source'] if p['source'] else '', p['total_time']))
+    lines += ['', 'Status polling by pid:']
+    if not report['polling']:
+        lines.append('  none found')
+    for s in report['polling']:
+        lines.append('  %-24s %6d polls%s%s' % (
+            s['pid'], s['polls'],
+            ', %.1f per minute' % s['polls_per_minute'] if s['polls_per_minute'] is not None else '',
+            ', every %.2f s' % s['mean_interval'] if s['mean_interval'] is not None else ''))
+    return '\n'.join(lines)
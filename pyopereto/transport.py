@@ -0,0 +1,281 @@
+import os
+import json
+import threading
+import requests
+from pyopereto.pool import OperetoConnectionPool, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_PRECONNECT_TIMEOUT, \
+    POOL_OPTIONS
+
+TRANSPORT_OPTIONS = ['transport', 'compress_threshold', 'compress_level', 'rate_limits', 'adaptive_concurrency', 'coalesce_requests',
+                     'disk_cache', 'disk_cache_max_bytes', 'hedge_requests', 'hedge_percentile',
+                     'priority_dispatcher', 'metrics', 'metrics_callback', 'cassette', 'cassette_mode', 'cassette_latency', 'faults', 'host_routing', 'health_check_interval',
+                     'host_eject_after', 'host_eject_time'] + POOL_OPTIONS
+
+
+class OperetoResponse(object):
+    """
+    Minimal HTTP response returned by transports that do not use requests.
+    Exposes the subset of requests.Response used by the Opereto clients.
+    """
+
+    def __init__(self, status_code, reason, headers, content):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+
+class OperetoTransport(object):
+    """
+    Base class of the HTTP transports used by the Opereto clients.
+
+    | A transport sends a single HTTP request and returns a response exposing status_code, reason, headers,
+    | content and json(). The timeout is a (connect, read) tuple in seconds or None. Network failures must be
+    | raised as requests.exceptions.RequestException so the clients retry logic applies to all transports alike.
+    """
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+    def reset_after_fork(self):
+        """
+        Reinitializes the transport state (connections, locks) in a child process after os.fork().
+        """
+        pass
+
+
+class OperetoTransportWrapper(OperetoTransport):
+    """
+    Base class of transports adding a behavior on top of another transport.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        return self.inner.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+
+    def close(self):
+        self.inner.close()
+
+    def reset_after_fork(self):
+        self.inner.reset_after_fork()
+
+
+def find_transport(transport, transport_class):
+    """
+    Returns the first transport of the given class in a chain of wrapped transports, or None.
+    """
+    while transport is not None:
+        if isinstance(transport, transport_class):
+            return transport
+        transport = getattr(transport, 'inner', None)
+    return None
+
+
+class RequestsTransport(OperetoTransport):
+    """
+    Default transport, sending requests through a pooled keep-alive requests.Session.
+    """
+
+    def __init__(self, host=None, **pool_options):
+        self.pool = OperetoConnectionPool(host, **pool_options)
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        return self.pool.request(method, url, headers=headers, data=data, files=files, timeout=timeout)
+
+    def close(self):
+        self.pool.close()
+
+    def reset_after_fork(self):
+        self.pool.reset_after_fork()
+
+
+class Urllib3Transport(OperetoTransport):
+    """
+    Low overhead transport calling urllib3 directly.
+
+    | Skips the requests hooks, cookie jar and response encoding detection. Session cookies set by the
+    | server (e.g. by the basic auth login) are kept as plain name/value pairs and sent back on every request.
+    """
+
+    def __init__(self, host=None, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 pool_preconnect=False, pool_preconnect_timeout=DEFAULT_PRECONNECT_TIMEOUT, **kwargs):
+        import urllib3
+        self._urllib3 = urllib3
+        self._manager_options = dict(num_pools=pool_connections, maxsize=pool_maxsize, block=pool_block,
+                                     cert_reqs='CERT_NONE', retries=False)
+        self.manager = urllib3.PoolManager(**self._manager_options)
+        self.cookies = {}
+        self._cookies_lock = threading.Lock()
+        if host and pool_preconnect:
+            try:
+                self.request('head', host + '/hello', timeout=pool_preconnect_timeout)
+            except requests.exceptions.RequestException:
+                pass
+
+    def _encode_files(self, files):
+        fields = {}
+        for name, f in files.items():
+            fields[name] = (getattr(f, 'name', name), f.read())
+        return self._urllib3.encode_multipart_formdata(fields)
+
+    def _store_cookies(self, headers):
+        set_cookies = headers.getlist('Set-Cookie')
+        if not set_cookies:
+            return
+        with self._cookies_lock:
+            cookies = dict(self.cookies)
+            for cookie in set_cookies:
+                name, _, value = cookie.split(';', 1)[0].partition('=')
+                cookies[name.strip()] = value.strip()
+            # replaced rather than updated: requests of other threads iterate the previous dict
+            self.cookies = cookies
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        request_headers = dict(headers or {})
+        request_headers.setdefault('Accept-Encoding', 'gzip')
+        if files:
+            data, content_type = self._encode_files(files)
+            request_headers['Content-Type'] = content_type
+        elif hasattr(data, 'len'):
+            request_headers['Content-Length'] = str(data.len)
+        cookies = self.cookies
+        if cookies:
+            request_headers['Cookie'] = '; '.join('%s=%s' % item for item in cookies.items())
+        if isinstance(timeout, tuple):
+            timeout = self._urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        elif timeout is None:
+            timeout = self._urllib3.Timeout.DEFAULT_TIMEOUT
+        try:
+            r = self.manager.urlopen(method.upper(), url, body=data, headers=request_headers, retries=False,
+                                     preload_content=True, decode_content=True, timeout=timeout)
+        except self._urllib3.exceptions.TimeoutError as e:
+            raise requests.exceptions.Timeout(str(e))
+        except self._urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        self._store_cookies(r.headers)
+        return OperetoResponse(r.status, r.reason, r.headers, r.data)
+
+    def close(self):
+        self.manager.clear()
+
+    def reset_after_fork(self):
+        self.manager = self._urllib3.PoolManager(**self._manager_options)
+        self._cookies_lock = threading.Lock()
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'urllib3': Urllib3Transport
+}
+
+
+def pop_transport_options(kwargs):
+    """
+    Removes the transport and connection pool options from the client keyword arguments and returns them as a dict.
+    """
+    return dict((key, kwargs.pop(key)) for key in TRANSPORT_OPTIONS if key in kwargs)
+
+
+def create_transport(transport=None, compress_threshold=None, compress_level=None, rate_limits=None,
+                     adaptive_concurrency=None, coalesce_requests=False, disk_cache=None, disk_cache_max_bytes=None,
+                     hedge_requests=None, hedge_percentile=None, priority_dispatcher=None, metrics=None, metrics_callback=None,
+                     cassette=None, cassette_mode=None, cassette_latency=0, faults=None, hosts=None, host_routing=None,
+                     health_check_interval=None, host_eject_after=None, host_eject_time=None, **options):
+    """
+    Returns the transport to be used by a client.
+
+    :Parameters:
+    * *transport* -- A transport name ('requests' or 'urllib3'), an OperetoTransport subclass or instance. Default is 'requests'
+    * *compress_threshold* (`int`) -- Gzip request bodies of at least this number of bytes. Default is None (no compression)
+    * *compress_level* (`int`) -- Gzip compression level (1-9)
+    * *rate_limits* (`dict`) -- Token bucket limits by endpoint group or client method name, shared by all the clients of the host. Default is None (no limit)
+    * *adaptive_concurrency* -- True or an AIMDLimiter to adapt the number of requests in flight to the center load. Default is None
+    * *coalesce_requests* (`bool`) -- Share a single request between concurrent identical GET requests. Default is False
+    * *disk_cache* -- True or a directory to cache GET responses on disk (default directory is ~/.pyopereto/cache). Default is None
+    * *disk_cache_max_bytes* (`int`) -- Maximum size of the disk cache. Default is 64MB
+    * *hedge_requests* -- True or a list of client method names whose slow GET requests are hedged. Default is None
+    * *hedge_percentile* (`float`) -- Latency percentile after which a hedge is sent. Default is 95
+    * *priority_dispatcher* -- True or a PriorityDispatcher to send requests by priority class with bulkheads. Default is None
+    * *metrics* -- True or a ClientMetrics to record per endpoint request metrics. Default is None
+    * *metrics_callback* (`callable`) -- Called with a dict describing each request once it completes (enables metrics). Default is None
+    * *cassette* (`string`) -- Cassette file recording the HTTP interactions, or replaying them without network (default is the opereto_cassette environment variable). Default is None
+    * *cassette_mode* (`string`) -- 'record', 'replay' or 'once' (default is the opereto_cassette_mode environment variable, else 'once')
+    * *cassette_latency* (`float`) -- Factor applied to the recorded latencies on replay, 0 replays at full speed. Default is 0
+    * *faults* -- A FaultInjector or a list of Fault instances injected in the requests (see pyopereto.faults). Default is None
+    * *hosts* (`list`) -- Front-end nodes of the Opereto center, spreading the requests with health checks and failover. Default is None (the host option only)
+    * *host_routing* (`string`) -- 'least_outstanding' or 'latency' (latency-weighted round robin). Default is 'least_outstanding'
+    * *health_check_interval* (`float`) -- Seconds between the health checks of the hosts. Default is 10
+    * *host_eject_after* (`int`) -- Consecutive failures ejecting a host. Default is 3
+    * *host_eject_time* (`float`) -- Seconds an ejected host is not used. Default is 30
+    * *options* -- Transport options (opereto host and connection pool options), ignored for transport instances
+    """
+    if transport is None:
+        transport = 'requests'
+    if isinstance(transport, str):
+        try:
+            transport = TRANSPORTS[transport]
+        except KeyError:
+            raise ValueError('Unknown transport [%s], must be one of %s' % (transport, sorted(TRANSPORTS)))
+    if hosts and len(hosts) > 1:
+        from pyopereto.hostpool import HostPoolTransport, DEFAULT_HEALTH_CHECK_INTERVAL, DEFAULT_EJECT_AFTER, DEFAULT_EJECT_TIME
+        if isinstance(transport, OperetoTransport):
+            raise ValueError('Several hosts require a transport name or class, not a transport instance')
+        transports = [transport(**dict(options, host=host)) for host in hosts]
+        transport = HostPoolTransport(hosts, transports, routing=host_routing or 'least_outstanding',
+                                      health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL if health_check_interval is None else health_check_interval,
+                                      eject_after=host_eject_after or DEFAULT_EJECT_AFTER, eject_time=host_eject_time or DEFAULT_EJECT_TIME)
+    elif not isinstance(transport, OperetoTransport):
+        transport = transport(**options)
+    cassette = cassette or os.environ.get('opereto_cassette')
+    if cassette:
+        from pyopereto.cassette import CassetteTransport
+        transport = CassetteTransport(transport, cassette, mode=cassette_mode or os.environ.get('opereto_cassette_mode') or 'once',
+                                      latency=cassette_latency)
+    if faults:
+        from pyopereto.faults import FaultInjectionTransport, FaultInjector
+        transport = FaultInjectionTransport(transport, faults if isinstance(faults, FaultInjector) else FaultInjector(faults))
+    if metrics or metrics_callback:
+        from pyopereto.metrics import MetricsTransport, ClientMetrics
+        collector = metrics if isinstance(metrics, ClientMetrics) else ClientMetrics()
+        if metrics_callback:
+            collector.callback = metrics_callback
+        transport = MetricsTransport(transport, collector)
+    if compress_threshold is not None:
+        from pyopereto.compression import GzipTransport
+        transport = GzipTransport(transport, threshold=compress_threshold, level=compress_level)
+    if rate_limits is not None:
+        from pyopereto.ratelimit import RateLimitedTransport, get_rate_limiter
+        transport = RateLimitedTransport(transport, get_rate_limiter(options.get('host'), rate_limits))
+    if adaptive_concurrency:
+        from pyopereto.concurrency import AdaptiveConcurrencyTransport
+        limiter = adaptive_concurrency if adaptive_concurrency is not True else None
+        transport = AdaptiveConcurrencyTransport(transport, limiter)
+    # outside the admission layers: queued requests wait for their class before taking a rate limit token or a
+    # concurrency slot, so a log flood cannot hold them while control calls wait
+    if priority_dispatcher:
+        from pyopereto.priority import PriorityTransport
+        dispatcher = priority_dispatcher if priority_dispatcher is not True else None
+        transport = PriorityTransport(transport, dispatcher)
+    if hedge_requests:
+        from pyopereto.hedging import HedgingTransport, DEFAULT_HEDGE_PERCENTILE
+        transport = HedgingTransport(transport, endpoints=hedge_requests if hedge_requests is not True else None,
+                                     percentile=hedge_percentile or DEFAULT_HEDGE_PERCENTILE)
+    if disk_cache:
+        from pyopereto.disk_cache import DiskCacheTransport, DEFAULT_DISK_CACHE_MAX_BYTES
+        transport = DiskCacheTransport(transport, directory=disk_cache if disk_cache is not True else None,
+                                       max_bytes=disk_cache_max_bytes or DEFAULT_DISK_CACHE_MAX_BYTES)
+    if coalesce_requests:
+        from pyopereto.singleflight import SingleFlightTransport
+        transport = SingleFlightTransport(transport)
+    return transport
@@ -0,0 +1,54 @@
+import time
+from pyopereto.cache import ResponseCache
+
+
+class TestResponseCache():
+
+    def test_hits_and_invalidation(self, fake_opereto_server):
+        client = fake_opereto_server.client(response_cache=True)
+        client.create_agent(agent_id='my_agent', name='My Agent')
+        client.modify_agent_properties('my_agent', {'color': 'blue'})
+        assert client.get_agent_properties('my_agent')['custom'] == {'color': 'blue'}
+        properties = client.get_agent_properties('my_agent')
+        properties['custom']['color'] = 'changed locally'
+        assert client.get_agent_properties('my_agent')['custom'] == {'color': 'blue'}
+        assert client.cache_stats['hits'] == 2
+        assert client.cache_stats['misses'] == 1
+        client.modify_agent_properties('my_agent', {'color': 'red'})
+        assert client.get_agent_properties('my_agent')['custom'] == {'color': 'red'}
+        assert len([r for r in fake_opereto_server.requests if r[0] == 'GET']) == 2
+
+    def test_ttl(self, fake_opereto_server):
+        client = fake_opereto_server.client(response_cache=ResponseCache(endpoint_ttls={'get_agent_properties': 0.1}))
+        client.create_agent(agent_id='my_agent')
+        client.get_agent_properties('my_agent')
+        client.get_agent_properties('my_agent')
+        time.sleep(0.2)
+        client.get_agent_properties('my_agent')
+        assert client.cache_stats['hits'] == 1
+        assert client.cache_stats['misses'] == 2
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_bytes=100)
+        for i in range(10):
+            cache.set('get_service', ('service_%s' % i,), {}, ('service', 'service_%s' % i), {'id': 'x' * 20})
+        stats = cache.stats()
+        assert stats['size'] <= 100 and stats['evictions'] > 0
+        assert cache.get('get_service', ('service_9',), {})[0]
+        assert not cache.get('get_service', ('service_0',), {})[0]
+
+    def test_read_during_modification_is_not_cached(self):
+        cache = ResponseCache()
+        tag = ('agent', 'my_agent')
+        # get_agent_properties reads the agent, then modify_agent_properties completes before the read is cached
+        generation = cache.generation(tag)
+        cache.invalidate('agent', 'my_agent')
+        cache.set('get_agent_properties', ('my_agent',), {}, tag, {'color': 'blue'}, generation=generation)
+        assert not cache.get('get_agent_properties', ('my_agent',), {})[0]
+        cache.set('get_agent_properties', ('my_agent',), {}, tag, {'color': 'red'}, generation=cache.generation(tag))
+        assert cache.get('get_agent_properties', ('my_agent',), {}) == (True, {'color': 'red'})
+        # invalidating all the agents also drops reads in flight
+        generation = cache.generation(('agent', 'other_agent'))
+        cache.invalidate('agent')
+        cache.set('get_agent_properties', ('other_agent',), {}, ('agent', 'other_agent'), {}, generation=generation)
+        assert not cache.get('get_agent_properties', ('other_agent',), {})[0]
@@ -0,0 +1,39 @@
+import json
+import time
+import pytest
+from pyopereto.client import OperetoClient, OperetoClientError
+from pyopereto.testing import FakeOperetoServer
+
+
+def run_session(client, zip_file, interval=0):
+    service_id = client.upload_service_version(zip_file, mode='development', service_id='my_service')
+    pid = client.create_process('my_service', title='recorded run')
+    statuses = []
+    for i in range(3):
+        statuses.append(client.get_process_status(pid))
+        time.sleep(interval)
+    return service_id, pid, statuses
+
+
+class TestCassette():
+
+    def test_record_and_replay(self, tmpdir):
+        cassette = str(tmpdir.join('session.cassette'))
+        zip_file = tmpdir.join('service.zip')
+        zip_file.write(b'PK' + b'\x00' * 1000, mode='wb')
+        with FakeOperetoServer(process_states=['in_process', 'in_process', 'success'], state_interval=0.2) as server:
+            client = server.client(basic_auth=True, cassette=cassette, cassette_mode='record')
+            recorded = run_session(client, str(zip_file), interval=0.2)
+            assert server.requests.count(('POST', '/login')) == 1
+        interactions = [json.loads(line) for line in open(cassette)]
+        assert interactions[0]['path'] == '/login'
+        assert 'Basic ' not in open(cassette).read()
+
+        # the server is stopped: the session is replayed from the cassette only
+        client = OperetoClient(opereto_host=server.url, opereto_user='admin', opereto_password='secret', cassette=cassette,
+                               cassette_mode='replay')
+        assert run_session(client, str(zip_file)) == recorded
+        assert recorded[2] == ['in_process', 'in_process', 'success']
+        with pytest.raises(OperetoClientError) as e:
+            client.get_process_info('unknown')
+        assert e.value.code == 404
@@ -0,0 +1,112 @@
+import io
+import os
+import sys
+import json
+import time
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(home, *args, **environment):
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=ROOT_DIR, **environment)
+    return subprocess.check_output([sys.executable, '-m', 'pyopereto.command_line'] + list(args), cwd=str(home), env=env,
+                                   stderr=subprocess.PIPE).decode('utf-8')
+
+
+class TestCommandLine():
+
+    def test_import_is_lazy(self, tmpdir):
+        code = 'import sys; import pyopereto.command_line; print(",".join(m for m in ["yaml", "pyopereto.client", "pkg_resources", "requests"] if m in sys.modules))'
+        env = dict(os.environ, HOME=str(tmpdir), PYTHONPATH=ROOT_DIR)
+        # no opereto.yaml: the module is imported without reading any configuration
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=str(tmpdir), env=env)
+        assert output.decode('utf-8').strip() == ''
+        assert 'Opereto CLI Tool' in run_cli(tmpdir, '--version')
+        if sys.version_info >= (3, 8):
+            # the version lookup does not fall back to pkg_resources when pyopereto is not installed
+            code = 'import sys; from pyopereto.command_line import get_version; get_version(); print("pkg_resources" in sys.modules)'
+            output = subprocess.check_output([sys.executable, '-c', code], cwd=str(tmpdir), env=env)
+            assert output.decode('utf-8').strip() == 'False'
+
+    def test_error_is_printed(self, tmpdir):
+        env = dict(os.environ, HOME=str(tmpdir), PYTHONPATH=ROOT_DIR)
+        tmpdir.join('.pyopereto.latest').write('0.0.1')
+        cli = subprocess.Popen([sys.executable, '-m', 'pyopereto.command_line', 'token'], cwd=str(tmpdir), env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, errors = cli.communicate()
+        assert cli.returncode == 1
+        assert 'Could not find opereto credentials file' in errors.decode('utf-8')
+
+    def test_process_info(self, fake_opereto_server, tmpdir):
+        tmpdir.join('opereto.yaml').write('opereto_host: %s\nopereto_auth_token: %s\n' %
+                                          (fake_opereto_server.url, fake_opereto_server.auth_token))
+        tmpdir.join('.pyopereto.latest').write('0.0.1')
+        pid = fake_opereto_server.add_process(name='cli process')
+        output = run_cli(tmpdir, 'process', pid, '--info', '--no-cache')
+        assert json.loads(output)['id'] == pid
+        # the latest version file is fresh: no upgrade check request
+        assert tmpdir.join('.pyopereto.latest').read() == '0.0.1'
+
+    def test_shell(self, fake_opereto_server, tmpdir):
+        tmpdir.join('opereto.yaml').write('opereto_host: %s\nopereto_auth_token: %s\n' %
+                                          (fake_opereto_server.url, fake_opereto_server.auth_token))
+        tmpdir.join('.pyopereto.latest').write('0.0.1')
+        pid = fake_opereto_server.add_process(name='cli process')
+        env = dict(os.environ, HOME=str(tmpdir), PYTHONPATH=ROOT_DIR)
+        shell = subprocess.Popen([sys.executable, '-m', 'pyopereto.command_line', 'shell'], cwd=str(tmpdir), env=env,
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        commands = 'process %s --info --no-cache\nopereto process %s --info --no-cache\nnosuchcommand\nexit\n' % (pid, pid)
+        output, errors = shell.communicate(commands.encode('utf-8'))
+        assert shell.returncode == 0
+        assert output.decode('utf-8').count('"id": "%s"' % pid) == 2
+        assert 'Usage:' in errors.decode('utf-8')
+
+    def test_local_output_is_relayed(self, monkeypatch, tmpdir):
+        from pyopereto.command_line import local
+        # in the daemon sys.stdout is relayed to the invoking CLI: so is the output of the build commands
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, 'stdout', stdout)
+        code = 'import sys; print("build " + "output"); sys.stderr.write("build " + "warning")'
+        assert local([sys.executable, '-c', code], working_directory=str(tmpdir)) == 0
+        assert 'build output' in stdout.getvalue() and 'build warning' in stdout.getvalue()
+
+    def test_daemon(self, fake_opereto_server, tmpdir):
+        config = tmpdir.join('opereto.yaml')
+        config.write('opereto_host: %s\nopereto_auth_token: %s\n' % (fake_opereto_server.url, fake_opereto_server.auth_token))
+        tmpdir.join('.pyopereto.latest').write('0.0.1')
+        pid = fake_opereto_server.add_process(name='cli process')
+        env = dict(os.environ, HOME=str(tmpdir), PYTHONPATH=ROOT_DIR)
+        assert 'Opereto daemon is running' in run_cli(tmpdir, 'daemon', 'start')
+        try:
+            for i in range(2):
+                assert json.loads(run_cli(tmpdir, 'process', pid, '--info', '--no-cache'))['id'] == pid
+            status = json.loads(run_cli(tmpdir, 'daemon', 'status'))
+            assert status['commands'] == 2 and status['pid'] != os.getpid()
+
+            # a slow command does not hold the daemon
+            fake_opereto_server.latency = 1
+            slow = subprocess.Popen([sys.executable, '-m', 'pyopereto.command_line', 'process', pid, '--info', '--no-cache'],
+                                    cwd=str(tmpdir), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            time.sleep(0.5)
+            start = time.time()
+            assert json.loads(run_cli(tmpdir, 'daemon', 'status'))['running'] == 1
+            assert time.time() - start < 0.5
+            assert json.loads(slow.communicate()[0].decode('utf-8'))['id'] == pid
+            fake_opereto_server.latency = 0
+
+            # commands with other opereto environment variables run locally
+            run_cli(tmpdir, 'process', pid, '--info', '--no-cache', opereto_trace_file=str(tmpdir.join('calls.trace')))
+            assert tmpdir.join('calls.trace').exists()
+            assert json.loads(run_cli(tmpdir, 'daemon', 'status'))['commands'] == 3
+
+            # the daemon reads the credentials file again when it changes
+            config.write('opereto_host: %s\nopereto_auth_token: wrong\n' % fake_opereto_server.url)
+            os.utime(str(config), (time.time() + 10, time.time() + 10))
+            cli = subprocess.Popen([sys.executable, '-m', 'pyopereto.command_line', 'process', pid, '--info', '--no-cache'],
+                                   cwd=str(tmpdir), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            cli.communicate()
+            assert cli.returncode == 1
+        finally:
+            run_cli(tmpdir, 'daemon', 'stop')
+        assert not tmpdir.join('.pyopereto', 'daemon.sock').exists()
@@ -0,0 +1,54 @@
+import time
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.concurrency import AIMDLimiter
+from pyopereto.testing import FakeOperetoServer
+
+
+class TestAdaptiveConcurrency():
+
+    def test_additive_increase(self):
+        limiter = AIMDLimiter(initial_limit=2, max_limit=4)
+        for i in range(20):
+            assert limiter.acquire()
+            limiter.release(latency=0.01)
+        assert limiter.as_dict()['limit'] == 4
+
+    def test_multiplicative_decrease(self):
+        limiter = AIMDLimiter(initial_limit=16)
+        limiter.acquire()
+        limiter.release(overloaded=True)
+        assert limiter.as_dict()['limit'] == 8
+        limiter.acquire()
+        limiter.release(latency=0.01)
+        time.sleep(0.02)
+        limiter.acquire()
+        limiter.release(latency=1)
+        assert limiter.as_dict()['limit'] == 4
+
+    def test_latency_spikes_are_per_endpoint(self):
+        limiter = AIMDLimiter(initial_limit=20)
+        for i in range(50):
+            for endpoint, latency in (('get_process_status', 0.01), ('search_process_log', 0.2)):
+                limiter.acquire()
+                limiter.release(latency=latency, endpoint=endpoint)
+        assert limiter.decreases == 0 and limiter.as_dict()['limit'] > 20
+        limiter.acquire()
+        limiter.release(latency=0.2, endpoint='get_process_status')
+        assert limiter.decreases == 1
+
+    def test_acquire_timeout(self):
+        limiter = AIMDLimiter(initial_limit=1)
+        assert limiter.acquire()
+        assert not limiter.acquire(timeout=0.05)
+        limiter.release()
+        assert limiter.acquire(timeout=0.05)
+
+    def test_server_errors_shrink_the_limit(self):
+        with FakeOperetoServer(error_rate=1) as server:
+            client = server.client(adaptive_concurrency=AIMDLimiter(initial_limit=10), retry_policy=None)
+            client.retry.sleep = lambda seconds: None
+            with pytest.raises(OperetoClientError):
+                client.get_service('my_service')
+            stats = client.concurrency_stats
+            assert stats['limit'] < 10 and stats['in_flight'] == 0
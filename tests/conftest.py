@@ -1,7 +1,7 @@
 import pytest
 from pyopereto.client import OperetoClient
+from pyopereto.testing import fake_opereto_server, fake_opereto_client
 
 @pytest.fixture
 def opereto_client():
     return OperetoClient()
-
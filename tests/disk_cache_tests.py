@@ -0,0 +1,45 @@
+from pyopereto.testing import FakeOperetoServer
+from pyopereto.transport import find_transport, OperetoResponse
+from pyopereto.disk_cache import DiskCacheTransport
+
+
+class RevalidatingTransport(object):
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, headers=None, data=None, files=None, timeout=None):
+        self.requests.append(headers.get('If-None-Match'))
+        if headers.get('If-None-Match') == '"v1"':
+            return OperetoResponse(304, 'Not Modified', {'ETag': '"v1"', 'Cache-Control': 'max-age=60'}, b'')
+        return OperetoResponse(200, 'OK', {'ETag': '"v1"'}, b'{"status": "success", "data": {}}')
+
+
+class TestDiskCache():
+
+    def test_revalidation(self, tmpdir):
+        with FakeOperetoServer(etags=True) as server:
+            client = server.client(disk_cache=str(tmpdir))
+            client.create_agent(agent_id='my_agent', name='My Agent')
+            assert client.get_agent('my_agent')['name'] == 'My Agent'
+            other_client = server.client(disk_cache=str(tmpdir))
+            assert other_client.get_agent('my_agent')['name'] == 'My Agent'
+            assert find_transport(other_client.transport, DiskCacheTransport).as_dict()['revalidations'] == 1
+            client.modify_agent('my_agent', name='Renamed')
+            assert other_client.get_agent('my_agent')['name'] == 'Renamed'
+
+    def test_size_bound(self, tmpdir):
+        with FakeOperetoServer(etags=True) as server:
+            client = server.client(disk_cache=str(tmpdir), disk_cache_max_bytes=1024)
+            for i in range(20):
+                client.create_agent(agent_id='agent_%s' % i, description='x' * 200)
+                client.get_agent('agent_%s' % i)
+            assert sum(f.size() for f in tmpdir.listdir()) <= 1024
+
+    def test_revalidated_entry_is_fresh_in_other_processes(self, tmpdir):
+        inner = RevalidatingTransport()
+        for i in range(4):
+            # a new transport per call, as in successive CLI invocations
+            r = DiskCacheTransport(inner, directory=str(tmpdir)).request('get', 'http://opereto/agents/a', headers={})
+            assert r.status_code == 200
+        assert inner.requests == [None, '"v1"']
@@ -0,0 +1,43 @@
+import pytest
+from pyopereto.client import OperetoClientError, OperetoClientOauto2, OperetoClientBasicAuth
+from pyopereto.async_client import AsyncOperetoClient
+from pyopereto.endpoints import ENDPOINTS
+from pyopereto.batch import OperetoBatch
+
+
+class TestEndpoints():
+
+    def test_every_endpoint_has_a_method(self):
+        for name, spec in ENDPOINTS.items():
+            for client_class in (OperetoClientOauto2, OperetoClientBasicAuth):
+                assert getattr(client_class, name).endpoint is spec
+            assert callable(getattr(AsyncOperetoClient, name))
+            assert callable(getattr(OperetoBatch, name))
+
+    def test_endpoint_policies(self):
+        assert ENDPOINTS['get_process_status'].idempotent
+        assert ENDPOINTS['search_services'].idempotent and ENDPOINTS['search_services'].paging == 'offset'
+        assert not ENDPOINTS['create_qc'].idempotent
+        assert ENDPOINTS['get_service_version'].url(service_id='s1', mode='production', version='1') == '/services/s1/production/1'
+        assert ENDPOINTS['get_process_log'].url(query={'start': 0}, pid='p1') == '/processes/p1/log?start=0'
+        assert ENDPOINTS['delete_agent'].error_message(agent_id='a1') == 'Failed to delete agent [a1]'
+
+    def test_batch(self, fake_opereto_server):
+        client = fake_opereto_server.client(basic_auth=True)
+        pids = [fake_opereto_server.add_process(states=['success']) for i in range(5)]
+        assert client.batch(max_workers=3).get_process_status(pids) == ['success'] * 5
+        client.batch().modify_process_property([('counter', i, pid) for i, pid in enumerate(pids)])
+        assert [fake_opereto_server.processes[pid]['output']['counter'] for pid in pids] == list(range(5))
+        results = client.batch().get_process_info([pids[0], 'unknown'], return_exceptions=True)
+        assert results[0]['id'] == pids[0] and isinstance(results[1], OperetoClientError)
+        with pytest.raises(OperetoClientError):
+            client.batch().get_process_info(['unknown'])
+
+    def test_iterate(self, fake_opereto_server):
+        client = fake_opereto_server.client()
+        pid = fake_opereto_server.add_process()
+        client.send_process_log(pid, [{'text': 'line %d' % i} for i in range(25)])
+        assert [entry['text'] for entry in client.iterate('get_process_log', page_size=10, pid=pid)] == \
+            ['line %d' % i for i in range(25)]
+        with pytest.raises(OperetoClientError):
+            list(client.iterate('get_process_info'))
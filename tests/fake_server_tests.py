@@ -0,0 +1,63 @@
+import os
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.testing import FakeOperetoServer
+from helpers import test_helpers
+
+
+class TestFakeOperetoServer():
+
+    def test_hello(self, fake_opereto_client):
+        assert 'Hello' in fake_opereto_client.hello()
+
+    def test_process_lifecycle(self, fake_opereto_server, fake_opereto_client):
+        pid = fake_opereto_client.create_process(service='my_service', title='my process', my_input='1')
+        assert fake_opereto_client.get_process_info(pid)['name'] == 'my process'
+        fake_opereto_client.modify_process_property('my_output', 'value', pid=pid)
+        assert fake_opereto_client.get_process_properties(pid)['output'] == {'my_output': 'value'}
+        assert fake_opereto_client.wait_to_end(pid) == {pid: 'success'}
+        fake_opereto_server.set_process_states(pid, ['in_process'])
+        fake_opereto_client.stop_process(pid, status='failure')
+        assert fake_opereto_client.get_process_status(pid) == 'failure'
+
+    def test_process_states_advance_with_time(self):
+        with FakeOperetoServer(process_states=['in_process', 'success'], state_interval=0.3) as server:
+            client = server.client()
+            pid = server.add_process()
+            # repeated (e.g. hedged or retried) status requests do not advance the process
+            assert [client.get_process_status(pid) for i in range(5)] == ['in_process'] * 5
+            assert client.wait_to_end(pid) == {pid: 'success'}
+
+    def test_process_log(self, fake_opereto_server, fake_opereto_client):
+        pid = fake_opereto_server.add_process()
+        fake_opereto_client.send_process_log(pid, [{'text': 'line 1'}, {'text': 'line 2', 'level': 'ERROR'}])
+        log = fake_opereto_client.get_process_log(pid)
+        assert [entry['text'] for entry in log] == ['line 1', 'line 2']
+        assert fake_opereto_client.get_process_log(pid, start=1) == log[1:]
+
+    def test_upload_service_version(self, fake_opereto_client):
+        zip_action_file = test_helpers.zip_folder(
+            os.path.join(os.path.dirname(__file__), 'test_data/microservices/testing_hello_world'))
+        fake_opereto_client.upload_service_version(service_zip_file=zip_action_file + '.zip', mode='production',
+                                                   service_version='111', service_id='testing_hello_world')
+        assert '111' in fake_opereto_client.get_service('testing_hello_world')['versions']
+        search_result = fake_opereto_client.search_services(filter={'generic': 'testing_hello'})
+        assert [s['id'] for s in search_result] == ['testing_hello_world']
+
+    def test_basic_auth_client(self, fake_opereto_server):
+        client = fake_opereto_server.client(basic_auth=True, transport='urllib3')
+        assert client.create_agent(agent_id='my_agent', name='My agent') == 'my_agent'
+        assert client.get_agent_properties('my_agent')['name'] == 'My agent'
+
+    def test_invalid_token(self, fake_opereto_server):
+        client = fake_opereto_server.client()
+        client.headers['Authorization'] = 'Bearer invalid'
+        with pytest.raises(OperetoClientError) as e:
+            client.get_service('my_service')
+        assert e.value.code == 403
+
+    def test_error_rate(self):
+        with FakeOperetoServer(error_rate=1) as server:
+            with pytest.raises(OperetoClientError) as e:
+                server.client().modify_agent('my_agent')
+            assert e.value.code == 500
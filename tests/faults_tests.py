@@ -0,0 +1,46 @@
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.faults import FaultInjector, Fault, constant
+from pyopereto.retry import RetryPolicy
+
+
+class TestFaults():
+
+    def test_scripted_faults(self, fake_opereto_server):
+        injector = FaultInjector(script={'get_process_status': [502, 'reset', None, 'timeout']})
+        client = fake_opereto_server.client(faults=injector, retry_policy=RetryPolicy(max_attempts=3))
+        client.retry.sleep = lambda seconds: None
+        pid = fake_opereto_server.add_process(states=['success'])
+        assert client.get_process_status(pid) == 'success'
+        assert fake_opereto_server.requests.count(('GET', '/processes/%s/status' % pid)) == 1
+        assert client.fault_stats['injected'] == {'error': 1, 'reset': 1}
+        assert client.get_process_status(pid) == 'success'
+        assert client.fault_stats['injected'] == {'error': 1, 'reset': 1, 'timeout': 1}
+
+    def test_token_expiry(self, fake_opereto_server):
+        injector = FaultInjector(faults=[Fault('expire', after=2, limit=1)])
+        client = fake_opereto_server.client(faults=injector)
+        pid = fake_opereto_server.add_process(states=['success'])
+        client.get_process_status(pid)
+        client.get_process_info(pid)
+        for i in range(2):
+            with pytest.raises(OperetoClientError) as e:
+                client.get_process_status(pid)
+            assert e.value.code == 403
+        injector.renew_token()
+        assert client.get_process_status(pid) == 'success'
+
+    def test_probabilistic_faults(self, fake_opereto_server):
+        injector = FaultInjector(faults=[Fault('error', status=503, probability=0.5, endpoints=['status'])],
+                                 latency={'status': constant(0.001)}, seed=1)
+        client = fake_opereto_server.client(faults=injector, metrics=True, retry_policy=RetryPolicy(max_attempts=20),
+                                            retry_budget=None, circuit_breaker=None)
+        client.retry.sleep = lambda seconds: None
+        pid = fake_opereto_server.add_process(states=['success'])
+        assert [client.get_process_status(pid) for i in range(10)] == ['success'] * 10
+        client.get_process_properties(pid)
+        stats = client.fault_stats
+        metrics = client.metrics()
+        assert stats['injected']['error'] == metrics['get_process_status']['retries'] > 0
+        assert stats['delayed'] == metrics['get_process_status']['requests'] == stats['requests'] - 1
+        assert metrics['get_process_properties']['errors'] == {}
@@ -0,0 +1,57 @@
+import time
+import itertools
+import threading
+from pyopereto.testing import FakeOperetoServer
+from pyopereto.transport import find_transport
+from pyopereto.hedging import HedgingTransport, LatencyTracker
+
+
+class TestHedging():
+
+    def test_latency_percentile(self):
+        tracker = LatencyTracker(min_samples=10)
+        for i in range(9):
+            tracker.add(i)
+        assert tracker.percentile(90) is None
+        tracker.add(9)
+        assert tracker.percentile(90) == 9
+        assert tracker.percentile(50) == 5
+
+    def test_slow_request_is_hedged(self):
+        latencies = itertools.chain([1.0], itertools.repeat(0))
+        with FakeOperetoServer(latency=lambda: next(latencies), process_states=['in_process']) as server:
+            pid = server.add_process('my_service')
+            client = server.client(hedge_requests=True)
+            find_transport(client.transport, HedgingTransport).initial_delay = 0.05
+            start = time.time()
+            assert client.get_process_status(pid) == 'in_process'
+            assert time.time() - start < 0.9
+            stats = client.hedging_stats
+            assert stats['hedges'] == 1 and stats['hedge_wins'] == 1
+
+    def test_hedge_budget(self):
+        with FakeOperetoServer(latency=0.1, process_states=['in_process']) as server:
+            pid = server.add_process('my_service')
+            client = server.client(hedge_requests=['get_process_status'])
+            find_transport(client.transport, HedgingTransport).initial_delay = 0.01
+            for i in range(5):
+                client.get_process_status(pid)
+            stats = client.hedging_stats
+            assert stats['hedges'] == 2 and stats['budget_exhausted'] == 3
+
+    def test_requests_are_not_queued_for_a_worker(self):
+        with FakeOperetoServer(latency=0.2, process_states=['in_process']) as server:
+            pid = server.add_process('my_service')
+            client = server.client(hedge_requests=True)
+            hedging = find_transport(client.transport, HedgingTransport)
+            hedging.max_workers = 1
+            hedging.initial_delay = 5
+            threads = [threading.Thread(target=client.get_process_status, args=(pid,)) for i in range(2)]
+            start = time.time()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            # the second request is sent on its calling thread, at the same time as the first one
+            assert time.time() - start < 0.35
+            assert client.hedging_stats['saturated'] == 1
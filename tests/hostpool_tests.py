@@ -0,0 +1,87 @@
+import gc
+import time
+import threading
+import pytest
+from pyopereto.client import OperetoClient, OperetoClientError
+from pyopereto.hostpool import parse_hosts
+from pyopereto.retry import RetryPolicy
+from pyopereto.testing import FakeOperetoServer
+
+
+def pool_client(servers, basic_auth=False, **kwargs):
+    hosts = [server.url for server in servers]
+    if basic_auth:
+        return OperetoClient(opereto_host=hosts, opereto_user='admin', opereto_password='admin', **kwargs)
+    return OperetoClient(opereto_host=hosts, opereto_auth_token=servers[0].auth_token, **kwargs)
+
+
+class TestHostPool():
+
+    def test_parse_hosts(self):
+        assert parse_hosts('https://a:8080/') == ['https://a:8080']
+        assert parse_hosts('https://a, https://b') == parse_hosts(['https://a', 'https://b']) == ['https://a', 'https://b']
+
+    def test_spread_and_eject(self):
+        with FakeOperetoServer() as first, FakeOperetoServer() as second, FakeOperetoServer() as third:
+            client = pool_client([first, second, third], health_check_interval=None, host_eject_after=2,
+                                 retry_policy=RetryPolicy(max_attempts=5), retry_budget=None, circuit_breaker=None)
+            client.retry.sleep = lambda seconds: None
+            for i in range(9):
+                client.hello()
+            assert [len(server.requests) for server in (first, second, third)] == [3, 3, 3]
+            third.error_rate, third.error_code = 1, 503
+            for i in range(10):
+                client.hello()
+            stats = client.host_stats['hosts']
+            assert stats[third.url]['ejections'] == 1 and stats[third.url]['failures'] == 2
+            assert stats[third.url]['ejected_for'] > 0
+            assert len(third.requests) == 5 and len(first.requests) + len(second.requests) == 16
+
+            # the health check (unauthenticated hello) gets a response from the node: it is readmitted
+            client.transport.check_health()
+            assert client.host_stats['hosts'][third.url]['ejected_for'] == 0
+
+    def test_session_affinity(self):
+        with FakeOperetoServer() as first, FakeOperetoServer() as second:
+            client = pool_client([first, second], basic_auth=True, health_check_interval=None, host_eject_after=1,
+                                 retry_policy=RetryPolicy(max_attempts=4), retry_budget=None, circuit_breaker=None)
+            client.retry.sleep = lambda seconds: None
+            for i in range(6):
+                client.hello()
+            logged_in, other = (first, second) if ('POST', '/login') in first.requests else (second, first)
+            assert logged_in.requests == [('POST', '/login')] + [('GET', '/hello')] * 6 and other.requests == []
+
+            logged_in.error_rate, logged_in.error_code = 1, 503
+            client.hello()
+            assert other.requests == [('POST', '/login'), ('GET', '/hello')]
+            assert client.host_stats['affinity'] == other.url and client.host_stats['failovers'] == 1
+
+    def test_application_errors_do_not_eject(self):
+        with FakeOperetoServer() as first, FakeOperetoServer() as second:
+            client = pool_client([first, second], health_check_interval=None, host_eject_after=1,
+                                 retry_policy=RetryPolicy(max_attempts=1))
+            first.error_rate = second.error_rate = 1
+            for i in range(4):
+                with pytest.raises(OperetoClientError):
+                    client.hello()
+            stats = client.host_stats['hosts']
+            assert [stats[server.url]['ejections'] for server in (first, second)] == [0, 0]
+
+    def test_health_checks_stop(self):
+        def health_threads():
+            return [t for t in threading.enumerate() if t.name == 'pyopereto-health-checks']
+        with FakeOperetoServer() as first, FakeOperetoServer() as second:
+            before = len(health_threads())
+            with pool_client([first, second], health_check_interval=0.05) as client:
+                client.hello()
+                assert len(health_threads()) == before + 1
+            time.sleep(0.2)
+            assert len(health_threads()) == before
+
+            # a client dropped without being closed does not leak its health checks thread
+            client = pool_client([first, second], health_check_interval=0.05)
+            client.hello()
+            del client
+            gc.collect()
+            time.sleep(0.2)
+            assert len(health_threads()) == before
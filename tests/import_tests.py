@@ -0,0 +1,15 @@
+import os
+import sys
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+from import_time_benchmark import DEFERRED_MODULES
+
+
+class TestImports():
+
+    def test_client_import_is_lazy(self):
+        code = 'import sys; import pyopereto.client; print(",".join(m for m in %r if m in sys.modules))' % DEFERRED_MODULES
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT_DIR)
+        assert output.decode('utf-8').strip() == ''
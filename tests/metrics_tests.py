@@ -0,0 +1,50 @@
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.metrics import Histogram, ClientMetrics
+from pyopereto.retry import RetryPolicy
+from pyopereto.testing import FakeOperetoServer
+
+
+class TestMetrics():
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value)
+        assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float('inf'), 4)]
+        assert histogram.percentile(50) == 0.1 and histogram.percentile(100) == 2.0
+
+    def test_endpoint_metrics(self, fake_opereto_server):
+        samples = []
+        client = fake_opereto_server.client(metrics=True, metrics_callback=samples.append)
+        pid = fake_opereto_server.add_process()
+        for i in range(3):
+            client.get_process_status(pid)
+        client.send_process_log(pid, [{'text': 'line'}])
+        with pytest.raises(OperetoClientError):
+            client.get_process_info('unknown')
+        metrics = client.metrics()
+        assert metrics['get_process_status']['requests'] == 3
+        assert metrics['get_process_status']['latency']['count'] == 3
+        assert metrics['get_process_status']['queue_wait']['count'] == 3
+        assert metrics['get_process_status']['in_flight'] == 0
+        assert metrics['send_process_log']['request_bytes'] > 0 and metrics['send_process_log']['response_bytes'] > 0
+        assert metrics['get_process_info']['errors'] == {'404': 1}
+        assert [sample['endpoint'] for sample in samples] == ['get_process_status'] * 3 + ['send_process_log', 'get_process_info']
+
+        text = client.metrics(format='prometheus')
+        assert '# TYPE pyopereto_request_duration_seconds histogram' in text
+        assert 'pyopereto_requests_total{endpoint="get_process_status"} 3' in text
+        assert 'pyopereto_request_duration_seconds_bucket{endpoint="get_process_status",le="+Inf"} 3' in text
+        assert 'pyopereto_errors_total{endpoint="get_process_info",code="404"} 1' in text
+
+    def test_retries(self):
+        metrics = ClientMetrics()
+        with FakeOperetoServer(error_rate=1) as server:
+            client = server.client(metrics=metrics, retry_policy=RetryPolicy(max_attempts=3))
+            client.retry.sleep = lambda seconds: None
+            with pytest.raises(OperetoClientError):
+                client.get_service('my_service')
+        assert metrics.as_dict()['get_service']['requests'] == 3
+        assert metrics.as_dict()['get_service']['retries'] == 2
+        assert metrics.as_dict()['get_service']['errors'] == {'500': 3}
@@ -0,0 +1,72 @@
+import time
+import threading
+from pyopereto.concurrency import AIMDLimiter
+from pyopereto.priority import PriorityDispatcher, priority_class
+from pyopereto.testing import FakeOperetoServer
+
+
+class TestPriorityDispatcher():
+
+    def test_priority_classes(self):
+        assert priority_class('stop_process') == 'control'
+        assert priority_class('get_process_status') == 'status'
+        assert priority_class('modify_process_property') == 'properties'
+        assert priority_class('send_process_log') == 'logs'
+        assert priority_class('upload_datastore') == 'bulk'
+        assert priority_class('search_services') == 'bulk'
+        assert priority_class('send_process_log', {'status': ['send_process_log']}) == 'status'
+
+    def test_bulkheads(self):
+        dispatcher = PriorityDispatcher(max_in_flight=10, bulkheads={'bulk': 2})
+        assert dispatcher.acquire('bulk') and dispatcher.acquire('bulk')
+        assert not dispatcher.acquire('bulk', timeout=0.01)
+        assert dispatcher.acquire('status', timeout=0.01)
+
+    def test_control_calls_are_not_queued(self):
+        dispatcher = PriorityDispatcher(max_in_flight=1)
+        assert dispatcher.acquire('logs')
+        assert not dispatcher.acquire('status', timeout=0.01)
+        assert dispatcher.acquire('control', timeout=0.01)
+
+    def test_highest_priority_is_served_first(self):
+        dispatcher = PriorityDispatcher(max_in_flight=1)
+        dispatcher.acquire('bulk')
+        served = []
+
+        def call(priority):
+            dispatcher.acquire(priority)
+            served.append(priority)
+            time.sleep(0.01)
+            dispatcher.release(priority)
+
+        threads = [threading.Thread(target=call, args=(priority,)) for priority in ['logs', 'bulk', 'properties', 'status']]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        dispatcher.release('bulk')
+        for thread in threads:
+            thread.join()
+        assert served == ['status', 'properties', 'logs', 'bulk']
+        assert dispatcher.as_dict()['status']['queued'] == 1
+
+    def test_control_calls_with_adaptive_concurrency(self):
+        with FakeOperetoServer(latency=0.1) as server:
+            pid = server.add_process('flooding_service')
+            limiter = AIMDLimiter(initial_limit=1, max_limit=1, latency_factor=None)
+            client = server.client(priority_dispatcher=PriorityDispatcher(bulkheads={'logs': 8}), adaptive_concurrency=limiter)
+
+            def flood():
+                for i in range(3):
+                    client.send_process_log(pid, [{'text': 'log entry %d' % i}])
+
+            threads = [threading.Thread(target=flood) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.15)
+            start = time.time()
+            client.stop_process(pid, status='terminated')
+            elapsed = time.time() - start
+            for thread in threads:
+                thread.join()
+            # waits for the log request in flight only, not for the queued ones
+            assert elapsed < 0.35
@@ -0,0 +1,43 @@
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.ratelimit import TokenBucket, RateLimiter, endpoint_group
+from pyopereto.context import call_context
+
+
+class TestRateLimiter():
+
+    def test_endpoint_groups(self):
+        assert endpoint_group('create_process') == 'process_creation'
+        assert endpoint_group('get_process_status') == 'status'
+        assert endpoint_group('send_process_log') == 'logging'
+        assert endpoint_group('search_agents') == 'search'
+        assert endpoint_group('get_service') == 'default'
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(10, burst=2)
+        waits = []
+        bucket.sleep = waits.append
+        for i in range(4):
+            bucket.acquire()
+        assert len(waits) == 2
+        assert waits[0] == pytest.approx(0.1, abs=0.01)
+        assert waits[1] == pytest.approx(0.2, abs=0.01)
+        stats = bucket.as_dict()
+        assert stats['requests'] == 4 and stats['throttled'] == 2
+
+    def test_deadline(self):
+        limiter = RateLimiter({'create_process': (1, 1)})
+        limiter.acquire('create_process')
+        with call_context('create_process', deadline=0.1):
+            with pytest.raises(OperetoClientError) as e:
+                limiter.acquire('create_process')
+        assert e.value.code == 408
+
+    def test_shared_by_clients_of_the_same_host(self, fake_opereto_server):
+        first = fake_opereto_server.client(rate_limits={'status': 100})
+        second = fake_opereto_server.client(rate_limits={'status': 100})
+        pid = fake_opereto_server.add_process('my_service')
+        first.get_process_status(pid)
+        second.get_process_status(pid)
+        assert first.rate_limit_stats == second.rate_limit_stats
+        assert first.rate_limit_stats['status']['requests'] == 2
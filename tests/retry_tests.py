@@ -0,0 +1,107 @@
+import time
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.retry import RetryPolicy, RetryBudget, CircuitBreaker, parse_retry_after
+from pyopereto.testing import FakeOperetoServer
+
+
+@pytest.fixture
+def failing_server():
+    with FakeOperetoServer(error_rate=1) as server:
+        yield server
+
+
+def get_client(server, **kwargs):
+    client = server.client(**kwargs)
+    client.retry.sleep = lambda seconds: None
+    return client
+
+
+class TestRetryPolicy():
+
+    def test_idempotent_calls_are_retried(self, failing_server):
+        client = get_client(failing_server, retry_policy=RetryPolicy(max_attempts=4))
+        with pytest.raises(OperetoClientError):
+            client.get_service('my_service')
+        assert len(failing_server.requests) == 4
+
+    def test_endpoint_policy(self, failing_server):
+        client = get_client(failing_server, endpoint_retry_policies={'get_service': RetryPolicy(max_attempts=1)})
+        with pytest.raises(OperetoClientError):
+            client.get_service('my_service')
+        assert len(failing_server.requests) == 1
+
+    def test_non_idempotent_calls_require_safe_retry(self, failing_server):
+        client = get_client(failing_server)
+        with pytest.raises(OperetoClientError):
+            client.create_process('my_service')
+        assert len(failing_server.requests) == 1
+        client = get_client(failing_server, safe_retry=['create_process'])
+        with pytest.raises(OperetoClientError):
+            client.create_process('my_service')
+        assert len(failing_server.requests) == 4
+
+    def test_client_errors_are_not_retried(self, fake_opereto_server):
+        client = get_client(fake_opereto_server)
+        with pytest.raises(OperetoClientError) as e:
+            client.get_service('missing_service')
+        assert e.value.code == 404
+        assert len(fake_opereto_server.requests) == 1
+
+    def test_local_errors_are_not_retried(self, fake_opereto_server):
+        breaker = CircuitBreaker(failure_threshold=2)
+        client = fake_opereto_server.client(circuit_breaker=breaker)
+        for i in range(3):
+            with pytest.raises(OperetoClientError) as e:
+                client.get_process_status()
+            assert not e.value.remote
+        assert fake_opereto_server.requests == []
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert client.hello()
+        assert client.retry.circuit_breaker is breaker
+        assert fake_opereto_server.client().retry.circuit_breaker is None
+
+    def test_retry_budget(self, failing_server):
+        client = get_client(failing_server, retry_budget=RetryBudget(ratio=0, min_retries=1))
+        for i in range(2):
+            with pytest.raises(OperetoClientError):
+                client.get_service('my_service')
+        assert len(failing_server.requests) == 3
+
+    def test_circuit_breaker(self, failing_server):
+        client = get_client(failing_server, circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        with pytest.raises(OperetoClientError):
+            client.get_service('my_service')
+        with pytest.raises(OperetoClientError) as e:
+            client.get_service('my_service')
+        assert e.value.code == 503
+        assert e.value.retry_after > 0
+        assert len(failing_server.requests) == 2
+
+    def test_circuit_breaker_trial_without_outcome(self, failing_server):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        client = get_client(failing_server, circuit_breaker=breaker, retry_policy=RetryPolicy(max_attempts=1))
+        with pytest.raises(OperetoClientError):
+            client.get_service('my_service')
+        assert breaker.state == CircuitBreaker.OPEN
+        time.sleep(0.06)
+
+        # the trial call fails in the client, without an outcome of the center: it does not leave the circuit half open
+        def broken(*args, **kwargs):
+            raise KeyError('boom')
+        with pytest.raises(KeyError):
+            client.retry.call('get_service', True, broken)
+        failing_server.error_rate = 0
+        client.hello()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=10, jitter=False)
+        assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 8, 10]
+        assert policy.backoff(0, retry_after=5) == 5
+        assert 0 <= RetryPolicy(backoff_base=1).backoff(3) <= 8
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after('3') == 3
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
@@ -0,0 +1,33 @@
+import threading
+from pyopereto.testing import FakeOperetoServer
+
+
+class TestSingleFlight():
+
+    def _concurrent_status(self, client, pid, threads=10):
+        results = []
+        workers = [threading.Thread(target=lambda: results.append(client.get_process_status(pid))) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def test_concurrent_gets_are_coalesced(self):
+        with FakeOperetoServer(latency=0.3) as server:
+            client = server.client(coalesce_requests=True)
+            pid = server.add_process('my_service', states=['in_process'])
+            results = self._concurrent_status(client, pid)
+            assert results == ['in_process'] * 10
+            stats = client.coalescing_stats
+            assert stats['coalesced'] > 0
+            assert stats['requests'] + stats['coalesced'] == 10
+            assert len(server.requests) == stats['requests']
+
+    def test_sequential_gets_are_not_coalesced(self, fake_opereto_server):
+        client = fake_opereto_server.client(coalesce_requests=True)
+        pid = fake_opereto_server.add_process('my_service')
+        client.get_process_status(pid)
+        client.get_process_status(pid)
+        assert client.coalescing_stats['coalesced'] == 0
+        assert len(fake_opereto_server.requests) == 2
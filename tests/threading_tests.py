@@ -0,0 +1,68 @@
+import os
+import signal
+import threading
+import pytest
+from pyopereto.testing import FakeOperetoServer
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_in_child(f):
+    child = os.fork()
+    if child == 0:
+        signal.alarm(10)
+        try:
+            os._exit(0 if f() else 1)
+        except BaseException:
+            os._exit(2)
+    status = os.waitpid(child, 0)[1]
+    return os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+
+
+class TestThreadSafety():
+
+    @pytest.mark.parametrize('transport', ['requests', 'urllib3'])
+    def test_concurrent_first_calls_login_once(self, transport):
+        with FakeOperetoServer() as server:
+            client = server.client(basic_auth=True, transport=transport)
+            run_threads(lambda: client.get_all_agents(), 20)
+            assert server.requests.count(('POST', '/login')) == 1
+
+    def test_urllib3_cookies_are_replaced(self):
+        from urllib3._collections import HTTPHeaderDict
+        from pyopereto.transport import Urllib3Transport
+        transport = Urllib3Transport()
+        cookies = transport.cookies
+        transport._store_cookies(HTTPHeaderDict([('Set-Cookie', 'JSESSIONID=abc; Path=/')]))
+        # a request iterating the previous cookies is not affected by the update
+        assert cookies == {} and transport.cookies == {'JSESSIONID': 'abc'}
+
+    def test_log_timestamps_are_unique(self, fake_opereto_server):
+        client = fake_opereto_server.client()
+        pid = fake_opereto_server.add_process('my_service')
+        run_threads(lambda: [client.send_process_log(pid, [{'text': 'log entry'}]) for i in range(10)], 10)
+        timestamps = [entry['timestamp'] for entry in fake_opereto_server.processes[pid]['log']]
+        assert len(timestamps) == 100 and len(set(timestamps)) == 100
+
+
+@pytest.mark.skipif(not hasattr(os, 'register_at_fork'), reason='requires os.register_at_fork')
+class TestForkSafety():
+
+    def test_client_is_usable_after_fork(self):
+        with FakeOperetoServer() as server:
+            client = server.client(basic_auth=True, rate_limits={'status': 1000}, priority_dispatcher=True)
+            pid = server.add_process('my_service')
+            client.get_process_status(pid)
+            client._log_ts_lock.acquire()
+            try:
+                exit_code = run_in_child(lambda: client.get_process_status(pid) and client.send_process_log(pid, [{'text': 'child'}]) is None)
+            finally:
+                client._log_ts_lock.release()
+            assert exit_code == 0
+            assert server.requests.count(('POST', '/login')) == 1
@@ -0,0 +1,52 @@
+import time
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.context import call_context
+from pyopereto.timeouts import Timeouts
+
+
+class TestTimeouts():
+
+    def test_endpoint_timeouts(self):
+        timeouts = Timeouts(timeout=(5, 30), endpoint_timeouts={'get_process_status': 2})
+        assert timeouts.for_endpoint('get_process') == (5, 30)
+        assert timeouts.for_endpoint('get_process_status') == (2, 2)
+        assert timeouts.for_endpoint('search_process_log') == (10, 300)
+        assert timeouts.for_endpoint('upload_service_version') == (10, 600)
+
+    def test_timeouts_are_clamped_to_the_deadline(self):
+        timeouts = Timeouts()
+        with call_context('get_process', deadline=1):
+            connect, read = timeouts.for_current_call()
+            assert connect <= 1 and read <= 1
+            with call_context('get_process_log', deadline=30):
+                assert timeouts.for_current_call()[1] <= 1
+
+    def test_wait_to_end_deadline(self, fake_opereto_server):
+        client = fake_opereto_server.client()
+        pid = fake_opereto_server.add_process('my_service', states=['in_process'])
+        start = time.time()
+        with pytest.raises(OperetoClientError) as e:
+            client.wait_to_end(pids=[pid], deadline=1.5)
+        assert e.value.code == 408
+        assert time.time() - start < 6
+
+    def test_async_wait_to_end_deadline(self, fake_opereto_server):
+        import asyncio
+        from pyopereto.async_client import AsyncOperetoClient
+        pid = fake_opereto_server.add_process('my_service', states=['in_process'])
+
+        async def wait():
+            async with AsyncOperetoClient(opereto_host=fake_opereto_server.url,
+                                          opereto_auth_token=fake_opereto_server.auth_token) as client:
+                await client.wait_to_end(pids=[pid], deadline=1.5)
+        start = time.time()
+        with pytest.raises(OperetoClientError) as e:
+            asyncio.run(wait())
+        assert e.value.code == 408
+        assert time.time() - start < 3
+
+    def test_api_call_deadline(self, fake_opereto_server):
+        client = fake_opereto_server.client()
+        pid = fake_opereto_server.add_process('my_service')
+        assert client.get_process_info(pid, deadline=10)['id'] == pid
@@ -0,0 +1,34 @@
+import pytest
+from pyopereto.client import OperetoClientError
+from pyopereto.trace import TraceRecorder, read_trace, analyze_trace, format_trace_report
+
+
+class TestTrace():
+
+    def test_record(self, fake_opereto_server, tmpdir):
+        path = str(tmpdir.join('trace.jsonl'))
+        recorder = TraceRecorder(path, flush_interval=60)
+        client = fake_opereto_server.client(trace=recorder)
+        pid = fake_opereto_server.add_process(states=['success'])
+        client.get_process_status(pid)
+        client.send_process_log(pid, [{'text': 'line'}])
+        with pytest.raises(OperetoClientError):
+            client.get_process_info('unknown')
+        recorder.close()
+        entries = read_trace(path)
+        assert [entry['endpoint'] for entry in entries] == ['get_process_status', 'send_process_log', 'get_process_info']
+        assert entries[0]['pid'] == pid and entries[0]['status'] == 'success' and entries[0]['requests'] == 1
+        assert entries[1]['request_bytes'] > 0 and entries[1]['response_bytes'] > 0
+        assert entries[2]['status'] == '404' and entries[2]['target'] == 'unknown'
+
+    def test_analyze(self):
+        entries = [{'ts': 0, 'thread': 1, 'endpoint': 'search_services', 'latency': 0.2, 'status': 'success', 'results': 6}]
+        entries += [{'ts': 1 + i, 'thread': 1, 'endpoint': 'get_service', 'target': 's%d' % i, 'latency': 0.1,
+                     'status': 'success'} for i in range(6)]
+        entries += [{'ts': 10 + i * 2, 'thread': 1, 'endpoint': 'get_process_status', 'pid': 'p1', 'target': 'p1',
+                     'latency': 0.0, 'status': 'success', 'requests': 1} for i in range(31)]
+        report = analyze_trace(entries, top=2)
+        assert [s['endpoint'] for s in report['endpoints']] == ['get_service', 'search_services']
+        assert report['n_plus_one'][0]['source'] == 'search_services' and report['n_plus_one'][0]['calls'] == 6
+        assert report['polling'] == [{'pid': 'p1', 'polls': 31, 'span': 60, 'polls_per_minute': 31.0, 'mean_interval': 2.0}]
+        assert 'get_service called 6 times in 1 runs after search_services' in format_trace_report(report)
@@ -0,0 +1,38 @@
+import time
+import socket
+import pytest
+from pyopereto.transport import create_transport
+
+
+class TestTransports():
+
+    @pytest.mark.parametrize('transport', ['requests', 'urllib3'])
+    def test_gzip_compression(self, fake_opereto_server, transport):
+        client = fake_opereto_server.client(transport=transport, compress_threshold=1024)
+        pid = fake_opereto_server.add_process()
+        client.send_process_log(pid, [{'text': 'log line %d' % i} for i in range(500)])
+        client.send_process_log(pid, [{'text': 'short'}])
+        assert len(client.get_process_log(pid)) == 501
+        stats = client.compression_stats
+        assert stats['requests'] == 2
+        assert stats['compressed_requests'] == 1
+        assert stats['request_sent_bytes'] < stats['request_raw_bytes']
+        assert stats['compressed_responses'] == 1
+        assert stats['response_received_bytes'] < stats['response_raw_bytes']
+
+    def test_compression_disabled(self, fake_opereto_client):
+        assert fake_opereto_client.compression_stats is None
+
+    @pytest.mark.parametrize('transport', ['requests', 'urllib3'])
+    def test_preconnect_timeout(self, transport):
+        # a host accepting connections but never answering
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        try:
+            start = time.time()
+            create_transport(transport, host='http://127.0.0.1:%s' % server.getsockname()[1], pool_preconnect=True,
+                             pool_preconnect_timeout=0.2).close()
+            assert time.time() - start < 2
+        finally:
+            server.close()